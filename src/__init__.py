@@ -0,0 +1,2 @@
+# ABOUTME: Top-level package for the investment research agent
+# ABOUTME: Installed in development mode (pip install -e .) so modules import as src.*
@@ -2,97 +2,33 @@
 # ABOUTME: Handles multi-turn conversations about market outlook and investment strategy
 
 import os
-import json
-from typing import List, Dict, Any, Optional
-from pathlib import Path
-import sys
-
-# Add src to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+import asyncio
+import logging
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from src.tools.rag_retrieval import create_rag_tool_function
+from src.tools.semantic_cache import SemanticCache
 from src.rag.vector_store import VectorStore
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-class ResearchAgent:
-    """
-    Investment research agent that uses RAG to answer questions about
-    market outlook, asset allocation, and investment strategy from UBS House View reports.
-    """
-
-    def __init__(
-        self,
-        model: str = "gpt-4-turbo-preview",
-        vector_store: Optional[VectorStore] = None,
-    ):
-        """
-        Initialize the research agent.
-
-        Args:
-            model: OpenAI model to use (default: gpt-4-turbo-preview)
-            vector_store: Optional existing VectorStore instance
-        """
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
-
-        # Initialize RAG tool
-        self.vector_store = vector_store or VectorStore()
-        self.rag_tool = create_rag_tool_function(self.vector_store)
-
-        # Conversation history
-        self.messages: List[Dict[str, Any]] = []
+# Upper bound on concurrent tool executions within a single assistant turn
+MAX_TOOL_WORKERS = 4
 
-        # System prompt
-        self.system_prompt = self._create_system_prompt()
-        self.messages.append({"role": "system", "content": self.system_prompt})
-
-        # Define tools for function calling
-        self.tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_investment_research",
-                    "description": (
-                        "Search UBS House View reports and SEC filings for investment research insights. "
-                        "Use this when you need information about market outlook, asset allocation, "
-                        "sector analysis, risk factors, Fed policy, or investment recommendations."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": (
-                                    "The investment research question or topic to search for. "
-                                    "Examples: 'What is UBS view on US equities?', "
-                                    "'What are key risks to the market?', "
-                                    "'What is the outlook for interest rates?'"
-                                ),
-                            },
-                            "n_results": {
-                                "type": "integer",
-                                "description": "Number of relevant excerpts to return (default: 5)",
-                                "default": 5,
-                            },
-                        },
-                        "required": ["query"],
-                    },
-                },
-            }
-        ]
+# Start of the reply returned when a turn fails (callers use it to tell
+# failures from answers, e.g. to avoid caching them)
+CHAT_ERROR_PREFIX = "Error processing message"
 
-        print("✅ Research Agent initialized")
-        print(f"   Model: {self.model}")
-        print(f"   Vector store: {self.vector_store.get_collection_stats()['count']} documents")
+# Write buffer for conversation exports
+EXPORT_BUFFER_SIZE = 1024 * 1024
 
-    def _create_system_prompt(self) -> str:
-        """Create the system prompt for the research agent."""
-        return """You are an expert investment research assistant with access to UBS House View reports and SEC filings.
+SYSTEM_PROMPT = """You are an expert investment research assistant with access to UBS House View reports and SEC filings.
 
 Your role is to help users understand:
 - Market outlook and economic conditions
@@ -121,7 +57,146 @@ IMPORTANT GUIDELINES:
 
 Your goal is to make investment research accessible and useful while maintaining accuracy and proper attribution."""
 
-    def chat(self, user_message: str) -> str:
+# Shared by every agent's history; treat as read-only
+SYSTEM_MESSAGE: Dict[str, str] = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Tools for function calling, built once and shared by every agent
+TOOLS_SCHEMA: Tuple[Dict[str, Any], ...] = (
+    {
+        "type": "function",
+        "function": {
+            "name": "search_investment_research",
+            "description": (
+                "Search UBS House View reports and SEC filings for investment research insights. "
+                "Use this when you need information about market outlook, asset allocation, "
+                "sector analysis, risk factors, Fed policy, or investment recommendations."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": (
+                            "The investment research question or topic to search for. "
+                            "Examples: 'What is UBS view on US equities?', "
+                            "'What are key risks to the market?', "
+                            "'What is the outlook for interest rates?'"
+                        ),
+                    },
+                    "n_results": {
+                        "type": "integer",
+                        "description": "Number of relevant excerpts to return (default: 5)",
+                        "default": 5,
+                    },
+                },
+                "required": ["query"],
+            },
+        },
+    },
+)
+
+# Same tools, flattened to the Responses API function schema
+RESPONSES_TOOLS_SCHEMA: Tuple[Dict[str, Any], ...] = tuple(
+    {"type": "function", **tool["function"]} for tool in TOOLS_SCHEMA
+)
+
+
+def create_semantic_cache(
+    vector_store: VectorStore, state_db: Optional[str] = None
+) -> SemanticCache:
+    """
+    Build a semantic cache over the RAG tool for a vector store.
+
+    Build one per process and pass it to every ResearchAgent sharing the
+    vector store, so agents reuse each other's results and a single SQLite
+    connection.
+
+    Args:
+        vector_store: VectorStore the cached RAG tool searches
+        state_db: SQLite file persisting the cache across restarts
+            (default: AGENT_STATE_DB env var; unset keeps it in memory)
+
+    Returns:
+        SemanticCache cleared whenever the vector store's collection changes
+    """
+    cache = SemanticCache(
+        create_rag_tool_function(vector_store),
+        vector_store.embed_query,
+        db_path=state_db or os.getenv("AGENT_STATE_DB"),
+    )
+    vector_store.register_result_cache(cache)
+    return cache
+
+
+class ResearchAgent:
+    """
+    Investment research agent that uses RAG to answer questions about
+    market outlook, asset allocation, and investment strategy from UBS House View reports.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo-preview",
+        vector_store: Optional[VectorStore] = None,
+        use_responses_api: bool = False,
+        state_db: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+    ):
+        """
+        Initialize the research agent.
+
+        Args:
+            model: OpenAI model to use (default: gpt-4-turbo-preview)
+            vector_store: Optional existing VectorStore instance
+            use_responses_api: Chain turns server-side with the Responses API
+                instead of resending the full history each turn (default: False)
+            state_db: SQLite file persisting the semantic cache across restarts
+                (default: AGENT_STATE_DB env var; unset keeps it in memory)
+            semantic_cache: Shared cache from create_semantic_cache() for
+                vector_store; when omitted the agent builds its own
+        """
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+
+        # Initialize RAG tool behind a semantic cache so near-duplicate
+        # questions skip the vector search
+        self.vector_store = vector_store or VectorStore()
+        self.rag_tool = semantic_cache or create_semantic_cache(self.vector_store, state_db)
+
+        # Conversation history
+        self.messages: List[Dict[str, Any]] = []
+
+        # Tool messages produced by the most recent chat() turn
+        self.last_tool_messages: List[Dict[str, Any]] = []
+
+        # (function_name, arguments_json) of each tool call in that turn
+        self.last_tool_calls: List[Tuple[str, str]] = []
+
+        # Event loop reused by chat_sync so the async client's connection
+        # pool stays bound to a single loop across calls
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Responses API state: only the latest response ID is sent upstream,
+        # self.messages is kept locally for history and source extraction
+        self.use_responses_api = use_responses_api
+        self._last_response_id: Optional[str] = None
+
+        # System prompt
+        self.system_prompt = SYSTEM_PROMPT
+        self.messages.append(SYSTEM_MESSAGE)
+
+        # Tool schemas are shared module constants; never mutate them
+        self.tools = TOOLS_SCHEMA
+        self.responses_tools = RESPONSES_TOOLS_SCHEMA
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "✅ Research Agent initialized (model: %s, vector store: %d documents)",
+                self.model,
+                self.vector_store.get_collection_stats()["count"],
+            )
+
+    async def chat(self, user_message: str) -> str:
         """
         Process a user message and return the agent's response.
 
@@ -133,10 +208,15 @@ Your goal is to make investment research accessible and useful while maintaining
         """
         # Add user message to history
         self.messages.append({"role": "user", "content": user_message})
+        self.last_tool_messages = []
+        self.last_tool_calls = []
+
+        if self.use_responses_api:
+            return await self._chat_responses(user_message)
 
         try:
             # Get response from OpenAI
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=self.messages,
                 tools=self.tools,
@@ -147,32 +227,23 @@ Your goal is to make investment research accessible and useful while maintaining
 
             # Handle tool calls
             while response_message.tool_calls:
-                # Add assistant's response with tool calls to history
-                self.messages.append(response_message)
-
-                # Execute each tool call
-                for tool_call in response_message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-
-                    print(f"🔍 Tool call: {function_name}({json.dumps(function_args, indent=2)})")
+                tool_calls = [
+                    (tool_call.id, tool_call.function.name, tool_call.function.arguments)
+                    for tool_call in response_message.tool_calls
+                ]
 
-                    # Execute the function
-                    if function_name == "search_investment_research":
-                        function_response = self.rag_tool(**function_args)
-                    else:
-                        function_response = json.dumps({"error": f"Unknown function: {function_name}"})
+                # Add assistant's response with tool calls to history
+                self.messages.append(
+                    self._assistant_tool_call_message(response_message.content, tool_calls)
+                )
 
-                    # Add function response to messages
-                    self.messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": function_response,
-                    })
+                # Execute tool calls (concurrently when there are several)
+                tool_messages = await self._run_tool_calls(tool_calls)
+                self.messages.extend(tool_messages)
+                self.last_tool_messages.extend(tool_messages)
 
                 # Get next response
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=self.messages,
                     tools=self.tools,
@@ -187,10 +258,260 @@ Your goal is to make investment research accessible and useful while maintaining
             return assistant_message
 
         except Exception as e:
-            error_msg = f"Error processing message: {str(e)}"
-            print(f"❌ {error_msg}")
+            error_msg = f"{CHAT_ERROR_PREFIX}: {str(e)}"
+            logger.error("❌ %s", error_msg)
             return error_msg
 
+    async def _chat_responses(self, user_message: str) -> str:
+        """
+        Responses API variant of chat().
+
+        Each request carries only the new input plus previous_response_id, so the
+        server reuses the stored conversation instead of re-reading the history.
+
+        Args:
+            user_message: The user's question or message
+
+        Returns:
+            The agent's response string
+        """
+        try:
+            response = await self.client.responses.create(
+                model=self.model,
+                instructions=self.system_prompt,
+                input=[{"role": "user", "content": user_message}],
+                tools=self.responses_tools,
+                previous_response_id=self._last_response_id,
+            )
+
+            while True:
+                function_calls = [
+                    (item.call_id, item.name, item.arguments)
+                    for item in response.output
+                    if item.type == "function_call"
+                ]
+                if not function_calls:
+                    break
+
+                # Mirror the round in chat format so the local history stays a
+                # valid Chat Completions transcript (tool replies need the
+                # assistant message that requested them)
+                self.messages.append(self._assistant_tool_call_message(None, function_calls))
+
+                tool_messages = await self._run_tool_calls(function_calls)
+                self.messages.extend(tool_messages)
+                self.last_tool_messages.extend(tool_messages)
+
+                # instructions are not inherited from previous_response_id
+                response = await self.client.responses.create(
+                    model=self.model,
+                    instructions=self.system_prompt,
+                    input=[
+                        {
+                            "type": "function_call_output",
+                            "call_id": message["tool_call_id"],
+                            "output": message["content"],
+                        }
+                        for message in tool_messages
+                    ],
+                    tools=self.responses_tools,
+                    previous_response_id=response.id,
+                )
+
+            self._last_response_id = response.id
+
+            assistant_message = response.output_text
+            self.messages.append({"role": "assistant", "content": assistant_message})
+
+            return assistant_message
+
+        except Exception as e:
+            error_msg = f"{CHAT_ERROR_PREFIX}: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            return error_msg
+
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """
+        Process a user message, yielding the agent's response text as it streams.
+
+        Tool-call rounds are accumulated from the stream and executed before the
+        next streamed request; only assistant text is yielded.
+
+        Args:
+            user_message: The user's question or message
+
+        Yields:
+            Response text deltas
+        """
+        if self.use_responses_api:
+            # Server-side chaining path is not streamed; yield it whole
+            yield await self.chat(user_message)
+            return
+
+        self.messages.append({"role": "user", "content": user_message})
+        self.last_tool_messages = []
+        self.last_tool_calls = []
+
+        try:
+            while True:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self.messages,
+                    tools=self.tools,
+                    tool_choice="auto",
+                    stream=True,
+                )
+
+                content_parts: List[str] = []
+                tool_calls: Dict[int, Dict[str, str]] = {}
+
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield delta.content
+
+                    # Tool call fields arrive in fragments keyed by index
+                    for tool_call_delta in delta.tool_calls or []:
+                        tool_call = tool_calls.setdefault(
+                            tool_call_delta.index, {"id": "", "name": "", "arguments": ""}
+                        )
+                        if tool_call_delta.id:
+                            tool_call["id"] = tool_call_delta.id
+                        if tool_call_delta.function:
+                            tool_call["name"] += tool_call_delta.function.name or ""
+                            tool_call["arguments"] += tool_call_delta.function.arguments or ""
+
+                assistant_message = "".join(content_parts)
+
+                if not tool_calls:
+                    self.messages.append({"role": "assistant", "content": assistant_message})
+                    return
+
+                ordered_calls = [
+                    (tool_calls[index]["id"], tool_calls[index]["name"], tool_calls[index]["arguments"])
+                    for index in sorted(tool_calls)
+                ]
+                self.messages.append(
+                    self._assistant_tool_call_message(assistant_message, ordered_calls)
+                )
+
+                tool_messages = await self._run_tool_calls(ordered_calls)
+                self.messages.extend(tool_messages)
+                self.last_tool_messages.extend(tool_messages)
+
+        except Exception as e:
+            error_msg = f"{CHAT_ERROR_PREFIX}: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            yield error_msg
+
+    def chat_sync(self, user_message: str) -> str:
+        """
+        Blocking wrapper around chat() for the CLI and eval runners.
+
+        Must not be called from inside a running event loop; await chat() there.
+
+        Args:
+            user_message: The user's question or message
+
+        Returns:
+            The agent's response string
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.chat(user_message))
+
+    async def _run_tool_calls(self, tool_calls: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """
+        Execute the tool calls from one assistant turn.
+
+        Exact repeats already in the semantic cache are answered inline; the rest
+        run concurrently in worker threads since the RAG search is blocking I/O.
+
+        Args:
+            tool_calls: (call_id, function_name, arguments_json) for each tool call
+
+        Returns:
+            Tool messages in the same order as tool_calls (OpenAI requires this)
+        """
+        self.last_tool_calls.extend(
+            (function_name, arguments) for _, function_name, arguments in tool_calls
+        )
+
+        parsed = [
+            (call_id, function_name, orjson.loads(arguments))
+            for call_id, function_name, arguments in tool_calls
+        ]
+        tool_messages: List[Optional[Dict[str, Any]]] = [None] * len(parsed)
+        pending = []
+
+        for i, (call_id, function_name, function_args) in enumerate(parsed):
+            cached = None
+            if function_name == "search_investment_research":
+                cached = self.rag_tool.peek(**function_args)
+            if cached is not None:
+                logger.debug("⚡ Cached tool call: %s(%s)", function_name, function_args)
+                tool_messages[i] = self._tool_message(call_id, function_name, cached)
+            else:
+                pending.append(i)
+
+        if pending:
+            semaphore = asyncio.Semaphore(MAX_TOOL_WORKERS)
+
+            async def dispatch(i: int) -> Dict[str, Any]:
+                async with semaphore:
+                    return await asyncio.to_thread(self._dispatch_tool, *parsed[i])
+
+            results = await asyncio.gather(*(dispatch(i) for i in pending))
+            for i, tool_message in zip(pending, results):
+                tool_messages[i] = tool_message
+
+        return tool_messages
+
+    def _dispatch_tool(
+        self, call_id: str, function_name: str, function_args: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute a single tool call and build its tool message."""
+        logger.debug("🔍 Tool call: %s(%s)", function_name, function_args)
+
+        if function_name == "search_investment_research":
+            function_response = self.rag_tool(**function_args)
+        else:
+            function_response = orjson.dumps({"error": f"Unknown function: {function_name}"}).decode()
+
+        return self._tool_message(call_id, function_name, function_response)
+
+    @staticmethod
+    def _assistant_tool_call_message(
+        content: Optional[str], tool_calls: List[Tuple[str, str, str]]
+    ) -> Dict[str, Any]:
+        """Build the plain-dict assistant message that requested tool_calls."""
+        return {
+            "role": "assistant",
+            "content": content or None,
+            "tool_calls": [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": function_name, "arguments": arguments},
+                }
+                for call_id, function_name, arguments in tool_calls
+            ],
+        }
+
+    @staticmethod
+    def _tool_message(call_id: str, function_name: str, content: str) -> Dict[str, Any]:
+        """Build the tool message answering a tool call."""
+        return {
+            "role": "tool",
+            "tool_call_id": call_id,
+            "name": function_name,
+            "content": content,
+        }
+
     def clear_history(self, keep_system_prompt: bool = True):
         """
         Clear conversation history.
@@ -199,10 +520,43 @@ Your goal is to make investment research accessible and useful while maintaining
             keep_system_prompt: If True, keeps the system prompt (default: True)
         """
         if keep_system_prompt:
-            self.messages = [{"role": "system", "content": self.system_prompt}]
+            self.messages = [SYSTEM_MESSAGE]
         else:
             self.messages = []
-        print("🗑️  Conversation history cleared")
+        self.last_tool_messages = []
+        self.last_tool_calls = []
+        self._last_response_id = None
+        logger.debug("🗑️  Conversation history cleared")
+
+    def restore_history(self, messages: List[Dict[str, Any]]):
+        """
+        Replace the conversation history, e.g. with one loaded from storage.
+
+        Args:
+            messages: Previously saved messages (with or without the system prompt)
+        """
+        if messages and messages[0].get("role") == "system":
+            messages = messages[1:]
+        self.messages = [SYSTEM_MESSAGE] + list(messages)
+        self.last_tool_messages = []
+        self.last_tool_calls = []
+        self._last_response_id = None
+
+    def record_exchange(self, user_message: str, assistant_message: str):
+        """
+        Add a turn answered without the model (e.g. from a response cache) to the history.
+
+        Only the local history is updated; with use_responses_api the
+        server-side conversation does not include the turn.
+
+        Args:
+            user_message: The user's question or message
+            assistant_message: The reply shown for it
+        """
+        self.messages.append({"role": "user", "content": user_message})
+        self.messages.append({"role": "assistant", "content": assistant_message})
+        self.last_tool_messages = []
+        self.last_tool_calls = []
 
     def get_history(self) -> List[Dict[str, Any]]:
         """Get the conversation history."""
@@ -215,9 +569,15 @@ Your goal is to make investment research accessible and useful while maintaining
         Args:
             filepath: Path to save the conversation
         """
-        with open(filepath, "w") as f:
-            json.dump(self.messages, f, indent=2)
-        print(f"💾 Conversation exported to: {filepath}")
+        # One message serialized at a time, so memory doesn't grow with the
+        # conversation; the 1 MiB buffer batches the small writes
+        with open(filepath, "wb", buffering=EXPORT_BUFFER_SIZE) as f:
+            f.write(b"[")
+            for i, message in enumerate(self.messages):
+                f.write(b",\n" if i else b"\n")
+                f.write(orjson.dumps(message, option=orjson.OPT_INDENT_2))
+            f.write(b"\n]\n")
+        logger.info("💾 Conversation exported to: %s", filepath)
 
 
 def main():
@@ -233,6 +593,8 @@ def main():
     print("  - Type 'quit' or 'exit' to end session")
     print("\n" + "=" * 80 + "\n")
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Initialize agent
     agent = ResearchAgent()
 
@@ -258,7 +620,7 @@ def main():
                 print(f"\n📜 Conversation History ({len(history)} messages):")
                 for i, msg in enumerate(history):
                     role = msg["role"]
-                    content = msg.get("content", "[tool call]")
+                    content = msg.get("content") or "[tool call]"
                     if len(content) > 100:
                         content = content[:100] + "..."
                     print(f"   {i+1}. [{role}] {content}")
@@ -271,7 +633,7 @@ def main():
 
             # Get response from agent
             print("\n🤖 Agent: ", end="", flush=True)
-            response = agent.chat(user_input)
+            response = agent.chat_sync(user_input)
             print(response)
 
         except KeyboardInterrupt:
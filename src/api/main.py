@@ -1,19 +1,19 @@
 # ABOUTME: FastAPI REST API server for investment research agent
 # ABOUTME: Provides endpoints for queries, evaluations, and system management
 
-import sys
-from pathlib import Path
+import os
+import asyncio
+import logging
+import threading
 import uuid
-import json
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict
-
-sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from fastapi import FastAPI, HTTPException
+import orjson
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 
 from src.api.models import (
     QueryRequest,
@@ -27,37 +27,104 @@ from src.api.models import (
     HealthResponse,
     StatsResponse,
 )
-from src.agent.research_agent import ResearchAgent
+from src.api.sessions import SessionStore
+from src.agent.research_agent import ResearchAgent, create_semantic_cache
 from src.rag.vector_store import VectorStore
+from src.tools.semantic_cache import SemanticCache
 from src.eval.test_runner import TestRunner
 from src.eval.openai_evals_runner import OpenAIEvalsRunner
+from src.eval.results_io import load_summary
+from src.eval.llm_judge import BATCH_FAILED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared vector store and warm its index before the first request."""
+    try:
+        get_vector_store().start_warmup()
+    except Exception as e:
+        # Requests still open it lazily (and report the error) if this fails
+        logger.warning("⚠️  Vector store warmup skipped: %s", e)
+    yield
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Investment Research Agent API",
     description="REST API for querying investment research and running evaluations",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Add CORS middleware
+# Add CORS middleware. Origins come from ALLOWED_ORIGINS (comma-separated),
+# defaulting to the local Gradio UI. Browsers reject credentialed requests
+# to a wildcard origin, so credentials are only allowed with an explicit list.
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:7860").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # For demo purposes
-    allow_credentials=True,
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials="*" not in ALLOWED_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 # Global state (in production, use proper state management)
 agent_instance: ResearchAgent = None
-conversations: Dict[str, ResearchAgent] = {}
+agent_lock = asyncio.Lock()
+shared_vector_store: VectorStore = None
+vector_store_lock = threading.Lock()
+shared_semantic_cache: SemanticCache = None
+# (timestamp, stats) for the last get_collection_stats() call
+STATS_TTL_SECONDS = 30.0
+stats_cache = None
+# conversation_id -> {"agent": ResearchAgent, "lock": asyncio.Lock}
+conversations = SessionStore(db_path=os.getenv("AGENT_STATE_DB"))
+
+
+def get_vector_store() -> VectorStore:
+    """Get or create the vector store shared by all agents."""
+    global shared_vector_store
+    if shared_vector_store is None:
+        with vector_store_lock:
+            if shared_vector_store is None:
+                shared_vector_store = VectorStore()
+    return shared_vector_store
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create the semantic cache shared by all agents."""
+    global shared_semantic_cache
+    if shared_semantic_cache is None:
+        vector_store = get_vector_store()
+        with vector_store_lock:
+            if shared_semantic_cache is None:
+                shared_semantic_cache = create_semantic_cache(vector_store)
+    return shared_semantic_cache
+
+
+def get_collection_stats() -> dict:
+    """Get vector store stats, cached for STATS_TTL_SECONDS."""
+    global stats_cache
+    now = time.monotonic()
+    if stats_cache is None or now - stats_cache[0] > STATS_TTL_SECONDS:
+        stats_cache = (now, get_vector_store().get_collection_stats())
+    return stats_cache[1]
 
 
 def get_agent() -> ResearchAgent:
     """Get or create global agent instance."""
     global agent_instance
     if agent_instance is None:
-        agent_instance = ResearchAgent()
+        agent_instance = ResearchAgent(
+            vector_store=get_vector_store(), semantic_cache=get_semantic_cache()
+        )
     return agent_instance
 
 
@@ -94,8 +161,7 @@ async def get_stats():
     Returns vector store info and available evaluators.
     """
     try:
-        vs = VectorStore()
-        stats = vs.get_collection_stats()
+        stats = get_collection_stats()
 
         return StatsResponse(
             vector_store_documents=stats["count"],
@@ -121,28 +187,28 @@ async def query_agent(request: QueryRequest):
     try:
         agent = get_agent()
 
-        # Clear history for fresh context
-        agent.clear_history(keep_system_prompt=True)
-
-        # Track time
-        start_time = time.time()
+        # The shared agent holds one history, so queries take turns
+        async with agent_lock:
+            # Clear history for fresh context
+            agent.clear_history(keep_system_prompt=True)
 
-        # Get response
-        response = agent.chat(request.query)
+            # Track time
+            start_time = time.time()
 
-        elapsed = time.time() - start_time
+            # Get response
+            response = await agent.chat(request.query)
 
-        # Extract sources from agent history (simplified)
-        sources = []
-        tool_calls = []
+            elapsed = time.time() - start_time
 
-        # Parse agent messages for tool calls
-        for msg in agent.get_history():
-            if msg["role"] == "tool":
-                sources.append({
+            # Sources are the tool results produced by this turn
+            sources = [
+                {
                     "tool": msg.get("name", "unknown"),
                     "content_preview": msg.get("content", "")[:200],
-                })
+                }
+                for msg in agent.last_tool_messages
+            ]
+            tool_calls = []
 
         return QueryResponse(
             response=response,
@@ -155,6 +221,52 @@ async def query_agent(request: QueryRequest):
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
 
 
+@app.post("/api/v1/query/stream", tags=["Agent"])
+async def query_agent_stream(request: QueryRequest):
+    """
+    Send a single query to the research agent and stream the response.
+
+    Emits server-sent events: {"delta": ...} for each text fragment, then
+    {"sources": [...], "response_time_seconds": ...} and a final [DONE].
+
+    Args:
+        request: Query request with question and parameters
+
+    Returns:
+        text/event-stream response
+    """
+
+    async def generate():
+        agent = get_agent()
+
+        async with agent_lock:
+            agent.clear_history(keep_system_prompt=True)
+            start_time = time.time()
+
+            try:
+                async for delta in agent.chat_stream(request.query):
+                    yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+
+                sources = [
+                    {
+                        "tool": msg.get("name", "unknown"),
+                        "content_preview": msg.get("content", "")[:200],
+                    }
+                    for msg in agent.last_tool_messages
+                ]
+                summary = {
+                    "sources": sources,
+                    "response_time_seconds": time.time() - start_time,
+                }
+                yield b"data: " + orjson.dumps(summary) + b"\n\n"
+            except Exception as e:
+                yield b"data: " + orjson.dumps({"error": f"Query failed: {str(e)}"}) + b"\n\n"
+
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
 @app.post("/api/v1/conversation", response_model=ConversationResponse, tags=["Agent"])
 async def conversation(request: ConversationRequest):
     """
@@ -168,34 +280,46 @@ async def conversation(request: ConversationRequest):
     """
     try:
         # Get or create conversation
-        if request.conversation_id and request.conversation_id in conversations:
-            agent = conversations[request.conversation_id]
-        else:
-            agent = ResearchAgent()
-            conv_id = request.conversation_id or str(uuid.uuid4())
-            conversations[conv_id] = agent
-
-        conv_id = request.conversation_id or list(conversations.keys())[-1]
-
-        # Reset if requested
-        if request.reset:
-            agent.clear_history(keep_system_prompt=True)
-
-        # Get response
-        response = agent.chat(request.message)
-
-        # Extract sources
-        sources = []
-        for msg in agent.get_history():
-            if msg["role"] == "tool":
-                sources.append({
-                    "content_preview": msg.get("content", "")[:200],
-                })
+        conv_id = request.conversation_id or str(uuid.uuid4())
+        entry = conversations.get(conv_id)
+        if entry is None:
+            entry = {
+                "agent": ResearchAgent(
+                    vector_store=get_vector_store(), semantic_cache=get_semantic_cache()
+                ),
+                "lock": asyncio.Lock(),
+            }
+            # Resume a conversation persisted before an eviction or restart
+            stored_messages = conversations.load_messages(conv_id)
+            if stored_messages:
+                entry["agent"].restore_history(stored_messages)
+            conversations.set(conv_id, entry)
+
+        agent = entry["agent"]
+
+        # Serialize turns within a conversation so concurrent requests
+        # cannot interleave their messages in the shared history
+        async with entry["lock"]:
+            # Reset if requested
+            if request.reset:
+                agent.clear_history(keep_system_prompt=True)
+
+            # Get response
+            response = await agent.chat(request.message)
+
+            # Sources are the tool results produced by this turn
+            sources = [
+                {"content_preview": msg.get("content", "")[:200]}
+                for msg in agent.last_tool_messages
+            ]
+
+            message_count = len(agent.messages)
+            conversations.save_messages(conv_id, agent.messages)
 
         return ConversationResponse(
             response=response,
             conversation_id=conv_id,
-            message_count=len(agent.get_history()),
+            message_count=message_count,
             sources=sources,
         )
 
@@ -208,6 +332,10 @@ async def evaluate_llm_judge(request: EvaluationRequest):
     """
     Run LLM-as-judge evaluation on test set.
 
+    With use_batch_api, the agent still answers live but judging is submitted
+    to the OpenAI Batch API; the endpoint returns 202 with a batch ID to poll
+    at /api/v1/evaluate/batch/{batch_id}.
+
     Args:
         request: Evaluation request with test set path
 
@@ -221,8 +349,26 @@ async def evaluate_llm_judge(request: EvaluationRequest):
         runner = TestRunner(request.test_set_path)
         output_path = "data/eval_results/llm_judge_results.json" if request.save_results else None
 
-        results = runner.run_full_evaluation(
+        if request.use_batch_api:
+            batch_id = await runner.submit_batch_evaluation_async(
+                output_path=output_path,
+                max_concurrency=request.max_concurrency,
+                rate_limit_rpm=request.rate_limit_rpm,
+                verbose=False,
+            )
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "batch_id": batch_id,
+                    "status": "submitted",
+                    "status_url": f"/api/v1/evaluate/batch/{batch_id}",
+                },
+            )
+
+        results = await runner.run_evaluation_async(
             output_path=output_path,
+            max_concurrency=request.max_concurrency,
+            rate_limit_rpm=request.rate_limit_rpm,
             verbose=False,
         )
 
@@ -253,12 +399,22 @@ async def evaluate_openai_evals(request: EvaluationRequest):
     Returns:
         Evaluation results and summary
     """
+    if request.use_batch_api:
+        raise HTTPException(
+            status_code=400,
+            detail="use_batch_api applies to llm-judge only; openai-evals grading makes no API calls",
+        )
+
     try:
         start_time = time.time()
 
         # Run evaluation
         runner = OpenAIEvalsRunner(request.test_set_path)
-        results = runner.run_evaluation(verbose=False)
+        results = await runner.run_evaluation_async(
+            max_concurrency=request.max_concurrency,
+            rate_limit_rpm=request.rate_limit_rpm,
+            verbose=False,
+        )
 
         output_path = None
         if request.save_results:
@@ -281,6 +437,43 @@ async def evaluate_openai_evals(request: EvaluationRequest):
         raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(e)}")
 
 
+@app.get("/api/v1/evaluate/batch/{batch_id}", response_model=EvaluationResponse, tags=["Evaluation"])
+async def get_batch_evaluation(batch_id: str):
+    """
+    Poll a Batch API LLM-as-judge evaluation.
+
+    Args:
+        batch_id: Batch ID returned by /api/v1/evaluate/llm-judge
+
+    Returns:
+        Evaluation results once the batch completes, otherwise 202 with its status
+    """
+    try:
+        status, results, state = await asyncio.to_thread(
+            TestRunner.collect_batch_evaluation, batch_id
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown batch: {batch_id}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch lookup failed: {str(e)}")
+
+    if status in BATCH_FAILED_STATUSES:
+        raise HTTPException(status_code=502, detail=f"Batch {batch_id} {status}")
+
+    if results is None:
+        return JSONResponse(status_code=202, content={"batch_id": batch_id, "status": status})
+
+    return EvaluationResponse(
+        evaluator="llm-judge",
+        total_questions=results["total_questions"],
+        overall_average=results["summary"].get("overall_average", 0),
+        pass_rate=results["summary"].get("pass_rate", 0),
+        category_breakdown=results["summary"].get("category_breakdown", {}),
+        execution_time_seconds=time.time() - state["submitted_at"],
+        results_path=state["output_path"],
+    )
+
+
 @app.get("/api/v1/evaluate/compare", response_model=ComparisonResponse, tags=["Evaluation"])
 async def compare_evaluators(
     llm_judge_path: str = "data/eval_results/llm_judge_results.json",
@@ -297,16 +490,9 @@ async def compare_evaluators(
         Comparison analysis with recommendations
     """
     try:
-        # Load both results
-        with open(llm_judge_path, "r") as f:
-            llm_results = json.load(f)
-
-        with open(evals_path, "r") as f:
-            evals_results = json.load(f)
-
-        # Extract summaries
-        llm_summary = llm_results.get("summary", {})
-        evals_summary = evals_results.get("summary", {})
+        # Load both summaries (not the per-question records)
+        llm_summary = load_summary(llm_judge_path)
+        evals_summary = load_summary(evals_path)
 
         # Simple comparison
         comparison = {
@@ -48,6 +48,12 @@ class EvaluationRequest(BaseModel):
     test_set_path: str = Field("data/test_questions.json", description="Path to test questions")
     evaluator: str = Field("llm-judge", description="Evaluator type: llm-judge or openai-evals")
     save_results: bool = Field(True, description="Save results to file")
+    max_concurrency: int = Field(10, ge=1, description="Maximum questions evaluated concurrently")
+    rate_limit_rpm: int = Field(60, ge=0, description="Maximum questions started per minute (0 = unlimited)")
+    use_batch_api: bool = Field(
+        False,
+        description="Judge via the OpenAI Batch API (llm-judge only); returns 202 with a batch ID to poll",
+    )
 
 
 class EvaluationResponse(BaseModel):
@@ -0,0 +1,145 @@
+# ABOUTME: Bounded in-memory store for multi-turn conversation sessions
+# ABOUTME: Evicts idle sessions after a TTL and the least recently used beyond a size cap
+
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+MAX_SESSIONS = 1024
+SESSION_TTL_SECONDS = 3600.0
+
+
+class SessionStore:
+    """
+    LRU + idle-TTL map from conversation ID to session entry.
+
+    Entries are moved to the end on every access, so the front of the
+    OrderedDict is always the least recently used session.
+
+    With ``db_path`` set, conversation histories are also saved to SQLite so
+    they survive evictions and server restarts (subject to the same TTL).
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the session store.
+
+        Args:
+            max_sessions: Maximum number of live sessions (default: 1024)
+            ttl_seconds: Idle time after which a session expires (default: 3600)
+            db_path: Optional SQLite file to persist conversation histories in
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id TEXT PRIMARY KEY,
+                    messages_json TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.commit()
+
+    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session and mark it as recently used.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Session entry, or None if missing or expired
+        """
+        self._expire()
+        entry = self._sessions.get(conversation_id)
+        if entry is not None:
+            self._sessions.move_to_end(conversation_id)
+            self._last_used[conversation_id] = time.monotonic()
+        return entry
+
+    def set(self, conversation_id: str, entry: Dict[str, Any]):
+        """
+        Store a session, evicting the least recently used ones over capacity.
+
+        Args:
+            conversation_id: Conversation ID
+            entry: Session entry
+        """
+        self._sessions[conversation_id] = entry
+        self._sessions.move_to_end(conversation_id)
+        self._last_used[conversation_id] = time.monotonic()
+
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            del self._last_used[evicted_id]
+
+    def load_messages(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load a persisted conversation history.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Saved messages, or None if not persisted or expired
+        """
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT messages_json, updated_at FROM conversations WHERE id = ?",
+            (conversation_id,),
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return orjson.loads(row[0])
+
+    def save_messages(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        """
+        Persist a conversation history, pruning expired ones.
+
+        Args:
+            conversation_id: Conversation ID
+            messages: Agent message history
+        """
+        if self._db is None:
+            return
+
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+            (conversation_id, orjson.dumps(messages).decode(), now),
+        )
+        self._db.execute("DELETE FROM conversations WHERE updated_at < ?", (now - self.ttl_seconds,))
+        self._db.commit()
+
+    def _expire(self):
+        """Drop sessions idle for longer than the TTL."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            oldest_id = next(iter(self._sessions))
+            if self._last_used[oldest_id] > cutoff:
+                break
+            del self._sessions[oldest_id]
+            del self._last_used[oldest_id]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
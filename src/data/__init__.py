@@ -0,0 +1,2 @@
+# ABOUTME: Report downloaders and the ingestion script for the research corpus
+# ABOUTME: Run each script as a module, e.g. python -m src.data.download_ubs_reports
@@ -0,0 +1,388 @@
+# ABOUTME: Shared HTTP download helpers for the report downloader scripts
+# ABOUTME: One pooled requests session, a streaming file download and a thread-pool batch runner
+
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+from email.utils import formatdate
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+from urllib3.util.retry import Retry
+
+from src.data._manifest import DownloadManifest
+
+logger = logging.getLogger(__name__)
+
+# Concurrent downloads (each one is network-bound)
+MAX_WORKERS = 8
+
+# Buffer size for copying response bodies to disk; each buffer is a single
+# write() call, so a multi-MB file costs only a handful of write syscalls
+CHUNK_SIZE = 1024 * 1024
+
+DOWNLOAD_TIMEOUT_SECONDS = 60
+
+# Page cache hints are only available on Linux (and some other POSIX systems)
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+# Compression level for *.gz destinations (fast enough to keep up with the network)
+GZIP_LEVEL = 3
+
+# Bodies are written here first and renamed into place once complete
+PART_SUFFIX = ".part"
+
+# Sidecar file holding the cache validators of a downloaded file
+META_SUFFIX = ".meta.json"
+
+# Leading bytes a valid file of each type starts with (PDFs may carry a little
+# junk first, so the marker is searched for in the first MAGIC_WINDOW bytes).
+# A body without them, e.g. an HTML error page sent with status 200, never
+# replaces the file on disk.
+MAGIC_BYTES = {".pdf": b"%PDF-"}
+MAGIC_WINDOW = 1024
+
+# Shared HTTP session so repeated downloads reuse pooled connections. requests
+# already asks for gzip/deflate (and brotli when the brotli package is installed)
+# and decodes the body as it is copied to disk.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    # Up to 16 kept-alive connections per host: every batch worker gets its own
+    # socket, so same-host downloads run side by side instead of queueing
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+
+
+# Every URL downloaded so far, across all downloader scripts
+MANIFEST = DownloadManifest()
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing out request starts to a requests/second budget."""
+
+    def __init__(self, per_second: float):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            per_second: Maximum requests started per second
+        """
+        self.interval = 1.0 / per_second
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next request slot opens."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def load_meta(destination: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the cache validators of a previously downloaded file.
+
+    Files downloaded before sidecars existed get validators built from the
+    file itself (its modification time as Last-Modified), so they are
+    revalidated rather than fetched again.
+
+    Args:
+        destination: Local file path
+
+    Returns:
+        Metadata dict (etag, last_modified, size), or None if the file is
+        missing, empty, or does not match the size recorded in its sidecar
+    """
+    try:
+        with open(destination + META_SUFFIX, "rb") as f:
+            meta = orjson.loads(f.read())
+        if os.path.getsize(destination) != meta.get("size"):
+            return None
+        return meta
+    except (OSError, ValueError):
+        pass
+
+    try:
+        stat = os.stat(destination)
+    except OSError:
+        return None
+    if not stat.st_size:
+        return None
+    return {
+        "etag": None,
+        "last_modified": formatdate(stat.st_mtime, usegmt=True),
+        "size": stat.st_size,
+    }
+
+
+def _check_body(path: str, destination: str, content_type: str):
+    """
+    Reject a downloaded body that is not the kind of file destination names.
+
+    Args:
+        path: Downloaded body (gzip-compressed if destination ends in .gz)
+        destination: Local file path the body is meant for
+        content_type: Content-Type header the server sent
+
+    Raises:
+        ValueError: If the body is empty or lacks the file type's magic bytes
+    """
+    opener = gzip.open if destination.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        head = f.read(MAGIC_WINDOW)
+    if not head:
+        raise ValueError("empty response body")
+
+    kind = Path(destination.removesuffix(".gz")).suffix.lower()
+    magic = MAGIC_BYTES.get(kind)
+    if magic is not None and magic not in head:
+        raise ValueError(f"response is not a {kind} file (Content-Type: {content_type or 'unknown'})")
+
+
+def _drop_page_cache(path: str):
+    """Tell the kernel a freshly written file's pages need not stay cached."""
+    if not HAS_FADVISE:
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _reuse_earlier_download(url: str, destination: str, part_path: str) -> bool:
+    """
+    Copy a file already downloaded from url under another name into destination.
+
+    Args:
+        url: Source URL
+        destination: Local file path to save to
+        part_path: Temporary path to copy through
+
+    Returns:
+        True if an earlier download was reused, False if the URL must be fetched
+    """
+    entry = MANIFEST.get(url)
+    if entry is None:
+        return False
+
+    source = entry["path"]
+    if source == os.path.normpath(destination) or Path(source).suffix != Path(destination).suffix:
+        return False
+
+    shutil.copyfile(source, part_path)
+    os.replace(part_path, destination)
+    if os.path.exists(source + META_SUFFIX):
+        shutil.copyfile(source + META_SUFFIX, destination + META_SUFFIX)
+    return True
+
+
+def download_file(
+    session: requests.Session,
+    url: str,
+    destination: str,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> bool:
+    """
+    Download a file from URL to destination.
+
+    Args:
+        session: HTTP session to download with
+        url: URL to download from
+        destination: Local file path to save to (gzip-compressed if it ends in .gz)
+        headers: Optional extra request headers
+        chunk_size: Buffer size for copying the body to disk
+        rate_limiter: Optional limiter to wait on before sending the request
+
+    Returns:
+        True if successful, False otherwise
+    """
+    name = Path(destination).name
+    part_path = destination + PART_SUFFIX
+
+    # Revalidate a complete earlier download instead of fetching it again
+    request_headers = dict(headers or {})
+    meta = load_meta(destination)
+    if meta is not None:
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        if meta is None and _reuse_earlier_download(url, destination, part_path):
+            logger.info("♻️  Reused earlier download of %s: %s\n", url, name)
+            return True
+
+        logger.info("📥 Downloading: %s\n   From: %s", name, url)
+
+        if rate_limiter is not None:
+            rate_limiter.wait()
+
+        with session.get(
+            url, headers=request_headers, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS
+        ) as response:
+            if response.status_code == 304:
+                # Persist validators built from a file that had no sidecar
+                meta["etag"] = response.headers.get("ETag") or meta["etag"]
+                with open(destination + META_SUFFIX, "wb") as f:
+                    f.write(orjson.dumps(meta))
+                logger.info("⏭️  Not modified: %s\n", name)
+                return True
+
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            # Content-Length counts encoded bytes, but decoded bytes are written
+            encoded = "content-encoding" in response.headers
+            total_size = None if encoded else int(response.headers.get("content-length", 0))
+
+            with open(part_path, "wb") as f:
+                if HAS_FADVISE:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                # *.gz destinations are compressed on the way to disk
+                if destination.endswith(".gz"):
+                    sink = gzip.GzipFile(
+                        filename="", mode="wb", compresslevel=GZIP_LEVEL, fileobj=f
+                    )
+                else:
+                    sink = nullcontext(f)
+
+                # Progress is counted per 1 MiB write; redraws are capped at 4/s
+                with sink as body, tqdm.wrapattr(
+                    body, "write", total=total_size, desc=f"   {name}", mininterval=0.25
+                ) as out:
+                    shutil.copyfileobj(response.raw, out, length=chunk_size)
+
+            # Only a complete, plausible body ever appears under the destination name
+            _check_body(part_path, destination, response.headers.get("Content-Type", ""))
+            os.replace(part_path, destination)
+            _drop_page_cache(destination)
+
+            meta = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": os.path.getsize(destination),
+            }
+
+        with open(destination + META_SUFFIX, "wb") as f:
+            f.write(orjson.dumps(meta))
+        MANIFEST.record(url, meta["etag"], destination)
+
+        logger.info("✅ Downloaded: %s\n", name)
+        return True
+
+    except Exception as e:
+        logger.error("❌ Error downloading %s: %s\n", url, e)
+        return False
+
+    finally:
+        if os.path.exists(part_path):
+            os.unlink(part_path)
+
+
+def run_batch(
+    urls: Sequence[str],
+    destinations: Sequence[str],
+    headers: Optional[Dict[str, str]] = None,
+    max_workers: int = MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> List[bool]:
+    """
+    Download several files in parallel over the shared session.
+
+    Args:
+        urls: URL of each file
+        destinations: Local path of each file, parallel to urls
+        headers: Optional extra request headers sent with every download
+        max_workers: Maximum concurrent downloads (default: 8)
+        rate_limiter: Optional limiter shared by all requests in the batch
+
+    Returns:
+        Success flag for each file, in the same order as urls
+    """
+    if not urls:
+        return []
+
+    fetch = partial(
+        download_file,
+        SESSION,
+        headers=headers,
+        chunk_size=CHUNK_SIZE,
+        rate_limiter=rate_limiter,
+    )
+
+    # Route log lines through tqdm so they don't break the progress bars
+    with logging_redirect_tqdm(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fetch, urls, destinations))
+
+
+def batch_stats(names: Sequence[str], results: Sequence[bool]) -> Dict[str, Any]:
+    """
+    Build a downloader's statistics from run_batch results.
+
+    Args:
+        names: File name of each download
+        results: Success flag of each download, parallel to names
+
+    Returns:
+        Dictionary with total, successful, failed and downloaded_files
+    """
+    downloaded = [name for name, success in zip(names, results) if success]
+    return {
+        "total": len(names),
+        "successful": len(downloaded),
+        "failed": len(names) - len(downloaded),
+        "downloaded_files": downloaded,
+    }
+
+
+def log_summary(stats: Dict[str, Any], output_dir: str, files_heading: str):
+    """
+    Log a downloader's end-of-run summary as a single message.
+
+    Args:
+        stats: Download statistics (total, successful, failed, downloaded_files)
+        output_dir: Directory the files were saved to
+        files_heading: Heading for the list of downloaded files
+    """
+    lines = [
+        "=" * 70,
+        "Download Summary",
+        "=" * 70,
+        f"✅ Successful: {stats['successful']}/{stats['total']}",
+        f"❌ Failed: {stats['failed']}/{stats['total']}",
+        f"\n{files_heading}:",
+    ]
+    append = lines.append
+    for filename in stats["downloaded_files"]:
+        try:
+            size_kb = os.stat(os.path.join(output_dir, filename)).st_size / 1024
+        except OSError:
+            continue
+        append(f"  • {filename} ({size_kb:.1f} KB)")
+
+    logger.info("\n".join(lines))
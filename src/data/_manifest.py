@@ -0,0 +1,90 @@
+# ABOUTME: Manifest of downloaded report files shared by all downloader scripts
+# ABOUTME: Maps each source URL to where it was saved so re-requests under other names skip the network
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+MANIFEST_PATH = "./data/pdfs/.manifest.json"
+
+
+class DownloadManifest:
+    """
+    Thread-safe URL -> downloaded file map persisted as JSON.
+
+    Entries record the saved path, ETag and size. An entry is only returned
+    while its file is still on disk at the recorded size.
+    """
+
+    def __init__(self, path: str = MANIFEST_PATH):
+        """
+        Initialize the manifest (loaded lazily on first use).
+
+        Args:
+            path: JSON file the manifest is stored in
+        """
+        self.path = path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an intact earlier download of a URL.
+
+        Args:
+            url: Source URL
+
+        Returns:
+            Entry (path, etag, size), or None if the URL was never
+            downloaded or its file has since changed or been removed
+        """
+        with self._lock:
+            entry = self._load().get(url)
+
+        if entry is None:
+            return None
+        try:
+            if os.path.getsize(entry["path"]) != entry["size"]:
+                return None
+        except OSError:
+            return None
+        return entry
+
+    def record(self, url: str, etag: Optional[str], path: str):
+        """
+        Record a completed download and save the manifest.
+
+        Args:
+            url: Source URL
+            etag: ETag the server sent with the body, if any
+            path: Where the file was saved
+        """
+        entry = {
+            "path": os.path.normpath(path),
+            "etag": etag,
+            "size": os.path.getsize(path),
+        }
+        with self._lock:
+            self._load()[url] = entry
+            self._save()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest from disk on first use (caller holds the lock)."""
+        if self._entries is None:
+            try:
+                with open(self.path, "rb") as f:
+                    self._entries = orjson.loads(f.read())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        """Atomically rewrite the manifest file (caller holds the lock)."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(self._entries, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.path)
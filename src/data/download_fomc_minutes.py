@@ -1,54 +1,157 @@
 # ABOUTME: Script to download Federal Reserve FOMC meeting minutes
-# ABOUTME: Downloads publicly available FOMC minutes from 2024-2025 for policy analysis
+# ABOUTME: Finds minutes on the federalreserve.gov meeting calendar and downloads them for policy analysis
 
+import logging
 import os
-import requests
+import re
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
-from tqdm import tqdm
 
-
-def download_file(url: str, destination: str) -> bool:
+from src.data._downloader import DOWNLOAD_TIMEOUT_SECONDS, SESSION, batch_stats, log_summary, run_batch
+
+logger = logging.getLogger(__name__)
+
+FOMC_CALENDAR_URL = "https://www.federalreserve.gov/monetarypolicy/fomccalendars.htm"
+FOMC_MINUTES_URL = "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes{date}.pdf"
+MINUTES_PDF_PATTERN = re.compile(r"fomcminutes(\d{8})\.pdf")
+
+# Calendar page cache, refreshed at most once a day
+CALENDAR_CACHE_NAME = ".cal_cache.html"
+CALENDAR_CACHE_TTL_SECONDS = 24 * 3600
+
+# Known minutes, used when the calendar page yields none (site down or its
+# markup changed)
+FALLBACK_FOMC_MINUTES = (
+    {
+        "name": "FOMC_Minutes_2024_Jan.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240131.pdf",
+        "description": "FOMC Minutes - January 30-31, 2024",
+        "date": "2024-01-31",
+    },
+    {
+        "name": "FOMC_Minutes_2024_Mar.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240320.pdf",
+        "description": "FOMC Minutes - March 19-20, 2024",
+        "date": "2024-03-20",
+    },
+    {
+        "name": "FOMC_Minutes_2024_May.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240501.pdf",
+        "description": "FOMC Minutes - April 30 - May 1, 2024",
+        "date": "2024-05-01",
+    },
+    {
+        "name": "FOMC_Minutes_2024_Jun.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240612.pdf",
+        "description": "FOMC Minutes - June 11-12, 2024",
+        "date": "2024-06-12",
+    },
+    {
+        "name": "FOMC_Minutes_2024_Jul.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240731.pdf",
+        "description": "FOMC Minutes - July 30-31, 2024",
+        "date": "2024-07-31",
+    },
+    {
+        "name": "FOMC_Minutes_2024_Sep.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240918.pdf",
+        "description": "FOMC Minutes - September 17-18, 2024",
+        "date": "2024-09-18",
+    },
+    {
+        "name": "FOMC_Minutes_2024_Nov.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20241107.pdf",
+        "description": "FOMC Minutes - November 6-7, 2024",
+        "date": "2024-11-07",
+    },
+    {
+        "name": "FOMC_Minutes_2024_Dec.pdf",
+        "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20241218.pdf",
+        "description": "FOMC Minutes - December 17-18, 2024",
+        "date": "2024-12-18",
+    },
+)
+
+
+def _fetch_calendar(cache_path: str) -> str:
     """
-    Download a file from URL to destination.
+    Get the FOMC meeting calendar page, from cache when it is fresh.
 
     Args:
-        url: URL to download from
-        destination: Local file path to save to
+        cache_path: File to cache the calendar HTML in
 
     Returns:
-        True if successful, False otherwise
+        Calendar page HTML (empty if it could not be fetched or read from cache)
     """
-    try:
-        print(f"📥 Downloading: {Path(destination).name}")
-        print(f"   From: {url}")
+    cached = os.path.exists(cache_path)
+    if cached and time.time() - os.path.getmtime(cache_path) < CALENDAR_CACHE_TTL_SECONDS:
+        return Path(cache_path).read_text(encoding="utf-8")
 
-        response = requests.get(url, stream=True, timeout=30)
+    try:
+        response = SESSION.get(FOMC_CALENDAR_URL, timeout=DOWNLOAD_TIMEOUT_SECONDS)
         response.raise_for_status()
+    except Exception as e:
+        logger.error("❌ Error fetching FOMC calendar: %s", e)
+        # A stale calendar still lists every meeting up to when it was cached
+        return Path(cache_path).read_text(encoding="utf-8") if cached else ""
 
-        total_size = int(response.headers.get("content-length", 0))
+    Path(cache_path).write_text(response.text, encoding="utf-8")
+    return response.text
 
-        with open(destination, "wb") as f, tqdm(
-            total=total_size, unit="B", unit_scale=True, desc="   Progress"
-        ) as pbar:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                pbar.update(len(chunk))
 
-        print(f"✅ Downloaded: {Path(destination).name}\n")
-        return True
+def _discover_fomc_urls(output_dir: str, start_year: int) -> List[Dict[str, str]]:
+    """
+    Build the list of FOMC minutes to download from the meeting calendar.
 
-    except Exception as e:
-        print(f"❌ Error downloading {url}: {e}\n")
-        return False
+    Falls back to FALLBACK_FOMC_MINUTES when the calendar lists no minutes.
 
+    Args:
+        output_dir: Directory holding the calendar cache
+        start_year: Earliest meeting year to include
 
-def download_fomc_minutes(output_dir: str = "./data/pdfs/fomc") -> Dict[str, any]:
+    Returns:
+        Minutes entries (name, url, description, date), oldest first
+    """
+    html = _fetch_calendar(os.path.join(output_dir, CALENDAR_CACHE_NAME))
+
+    minutes = []
+    for date in sorted(set(MINUTES_PDF_PATTERN.findall(html))):
+        meeting = datetime.strptime(date, "%Y%m%d")
+        if meeting.year < start_year:
+            continue
+        minutes.append(
+            {
+                "name": f"FOMC_Minutes_{meeting:%Y_%b}.pdf",
+                "url": FOMC_MINUTES_URL.format(date=date),
+                "description": f"FOMC Minutes - {meeting:%B} {meeting.day}, {meeting.year}",
+                "date": f"{meeting:%Y-%m-%d}",
+            }
+        )
+
+    if not minutes:
+        logger.warning(
+            "⚠️  No FOMC minutes found on the meeting calendar; using the built-in list"
+        )
+        minutes = [
+            dict(minute)
+            for minute in FALLBACK_FOMC_MINUTES
+            if int(minute["date"][:4]) >= start_year
+        ]
+
+    return minutes
+
+
+def download_fomc_minutes(
+    output_dir: str = "./data/pdfs/fomc", start_year: int = 2024
+) -> Dict[str, any]:
     """
-    Download FOMC meeting minutes from 2024-2025.
+    Download FOMC minutes for meetings from start_year onwards.
 
     Args:
         output_dir: Directory to save PDF files
+        start_year: Earliest meeting year to download (default: 2024)
 
     Returns:
         Dictionary with download statistics
@@ -56,109 +159,32 @@ def download_fomc_minutes(output_dir: str = "./data/pdfs/fomc") -> Dict[str, any
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    # FOMC minutes URLs (publicly available from federalreserve.gov)
-    fomc_minutes = [
-        {
-            "name": "FOMC_Minutes_2024_Jan.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240131.pdf",
-            "description": "FOMC Minutes - January 30-31, 2024",
-            "date": "2024-01-31",
-        },
-        {
-            "name": "FOMC_Minutes_2024_Mar.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240320.pdf",
-            "description": "FOMC Minutes - March 19-20, 2024",
-            "date": "2024-03-20",
-        },
-        {
-            "name": "FOMC_Minutes_2024_May.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240501.pdf",
-            "description": "FOMC Minutes - April 30 - May 1, 2024",
-            "date": "2024-05-01",
-        },
-        {
-            "name": "FOMC_Minutes_2024_Jun.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240612.pdf",
-            "description": "FOMC Minutes - June 11-12, 2024",
-            "date": "2024-06-12",
-        },
-        {
-            "name": "FOMC_Minutes_2024_Jul.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240731.pdf",
-            "description": "FOMC Minutes - July 30-31, 2024",
-            "date": "2024-07-31",
-        },
-        {
-            "name": "FOMC_Minutes_2024_Sep.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20240918.pdf",
-            "description": "FOMC Minutes - September 17-18, 2024",
-            "date": "2024-09-18",
-        },
-        {
-            "name": "FOMC_Minutes_2024_Nov.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20241107.pdf",
-            "description": "FOMC Minutes - November 6-7, 2024",
-            "date": "2024-11-07",
-        },
-        {
-            "name": "FOMC_Minutes_2024_Dec.pdf",
-            "url": "https://www.federalreserve.gov/monetarypolicy/files/fomcminutes20241218.pdf",
-            "description": "FOMC Minutes - December 17-18, 2024",
-            "date": "2024-12-18",
-        },
-    ]
-
-    print("=" * 70)
-    print("Federal Reserve FOMC Minutes Downloader")
-    print("=" * 70)
-    print(f"Output directory: {output_dir}")
-    print(f"Total documents to download: {len(fomc_minutes)}\n")
-
-    stats = {
-        "total": len(fomc_minutes),
-        "successful": 0,
-        "failed": 0,
-        "downloaded_files": [],
-    }
-
-    for minute in fomc_minutes:
-        destination = os.path.join(output_dir, minute["name"])
-
-        # Skip if file already exists
-        if os.path.exists(destination):
-            file_size = os.path.getsize(destination)
-            if file_size > 1000:  # File larger than 1KB - assume valid
-                print(f"⏭️  Skipping (already exists): {minute['name']}")
-                print(f"   Size: {file_size / 1024:.1f} KB")
-                print(f"   Date: {minute['date']}\n")
-                stats["successful"] += 1
-                stats["downloaded_files"].append(minute["name"])
-                continue
-
-        # Download the file
-        success = download_file(minute["url"], destination)
-
-        if success:
-            stats["successful"] += 1
-            stats["downloaded_files"].append(minute["name"])
-        else:
-            stats["failed"] += 1
-
-    # Print summary
-    print("=" * 70)
-    print("Download Summary")
-    print("=" * 70)
-    print(f"✅ Successful: {stats['successful']}/{stats['total']}")
-    print(f"❌ Failed: {stats['failed']}/{stats['total']}")
-    print("\nDownloaded FOMC Minutes:")
-    for filename in stats["downloaded_files"]:
-        file_path = os.path.join(output_dir, filename)
-        if os.path.exists(file_path):
-            size_kb = os.path.getsize(file_path) / 1024
-            print(f"  • {filename} ({size_kb:.1f} KB)")
+    # FOMC minutes URLs, discovered from the federalreserve.gov meeting calendar
+    fomc_minutes = _discover_fomc_urls(output_dir, start_year)
+
+    logger.info(
+        "\n".join(
+            [
+                "=" * 70,
+                "Federal Reserve FOMC Minutes Downloader",
+                "=" * 70,
+                f"Output directory: {output_dir}",
+                f"Total documents to download: {len(fomc_minutes)}\n",
+            ]
+        )
+    )
+
+    # Download in parallel; files from earlier runs are revalidated, not refetched
+    names = [minute["name"] for minute in fomc_minutes]
+    urls = [minute["url"] for minute in fomc_minutes]
+    destinations = [os.path.join(output_dir, name) for name in names]
+    stats = batch_stats(names, run_batch(urls, destinations))
+
+    log_summary(stats, output_dir, "Downloaded FOMC Minutes")
 
     return stats
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     download_fomc_minutes()
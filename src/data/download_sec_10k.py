@@ -1,97 +1,175 @@
 # ABOUTME: Script to download SEC 10-K filings for mega-cap tech companies
 # ABOUTME: Downloads latest annual reports from SEC EDGAR for fundamental analysis
 
+import gzip
+import logging
 import os
-import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from email.utils import formatdate
 from pathlib import Path
-from typing import List, Dict
-from tqdm import tqdm
+from typing import Any, IO, List, Dict, Optional
+
+import orjson
+
+from src.data._downloader import (
+    MAX_WORKERS,
+    RateLimiter,
+    SESSION,
+    batch_stats,
+    log_summary,
+    run_batch,
+)
+
+logger = logging.getLogger(__name__)
 
 
 # SEC requires user agent for API access
 HEADERS = {
     "User-Agent": "Investment Research Agent demo@arklex.com",
-    "Accept-Encoding": "gzip, deflate",
 }
 
+# Stay under SEC's 10 requests/second limit
+SEC_RATE_LIMITER = RateLimiter(8)
+
+# 7 Mega-cap tech companies with their CIK numbers
+COMPANIES = (
+    {"ticker": "AAPL", "name": "Apple Inc.", "cik": "0000320193"},
+    {"ticker": "MSFT", "name": "Microsoft Corporation", "cik": "0000789019"},
+    {"ticker": "NVDA", "name": "NVIDIA Corporation", "cik": "0001045810"},
+    {"ticker": "GOOGL", "name": "Alphabet Inc.", "cik": "0001652044"},
+    {"ticker": "AMZN", "name": "Amazon.com Inc.", "cik": "0001018724"},
+    {"ticker": "META", "name": "Meta Platforms Inc.", "cik": "0001326801"},
+    {"ticker": "TSLA", "name": "Tesla Inc.", "cik": "0001318605"},
+)
+
+# Flat per-field arrays for batch submission
+TICKERS = tuple(company["ticker"] for company in COMPANIES)
+CIKS = tuple(company["cik"] for company in COMPANIES)
+
+# How long cached EDGAR submissions JSON is used without revalidating
+SUBMISSIONS_CACHE_TTL_SECONDS = 24 * 3600
 
-def get_latest_10k_url(ticker: str, cik: str) -> tuple:
+
+def open_filing(path: str) -> IO[str]:
     """
-    Get the latest 10-K filing URL for a company.
+    Open a downloaded 10-K filing as text, decompressing *.gz files transparently.
 
     Args:
-        ticker: Stock ticker symbol
-        cik: SEC CIK number (must be 10 digits with leading zeros)
+        path: Filing path (e.g. AAPL_10K_FY2025.html or AAPL_10K_FY2025.html.gz)
 
     Returns:
-        Tuple of (filing_url, fiscal_year) or (None, None) if not found
+        Text file object positioned at the start of the filing
     """
-    try:
-        # Get company submissions data from SEC
-        submissions_url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-        response = requests.get(submissions_url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
 
-        data = response.json()
-        filings = data["filings"]["recent"]
 
-        # Find the most recent 10-K filing
-        for i, form_type in enumerate(filings["form"]):
-            if form_type == "10-K":
-                accession_number = filings["accessionNumber"][i].replace("-", "")
-                primary_document = filings["primaryDocument"][i]
-                filing_date = filings["filingDate"][i]
+def filing_destination(output_dir: str, name: str) -> str:
+    """
+    Pick where to save a filing, reusing an uncompressed copy from earlier runs.
 
-                # Construct the filing URL
-                filing_url = (
-                    f"https://www.sec.gov/Archives/edgar/data/{cik.lstrip('0')}/"
-                    f"{accession_number}/{primary_document}"
-                )
+    Filings downloaded before HTML was stored gzipped are kept (and revalidated)
+    under their .html name rather than downloaded again as .html.gz.
 
-                return (filing_url, filing_date[:4])  # Return URL and fiscal year
+    Args:
+        output_dir: Directory filings are saved to
+        name: Filing file name
 
-        return (None, None)
+    Returns:
+        Destination path for the filing
+    """
+    destination = os.path.join(output_dir, name)
+    if destination.endswith(".gz"):
+        uncompressed = destination[: -len(".gz")]
+        if os.path.exists(uncompressed) and not os.path.exists(destination):
+            return uncompressed
+    return destination
 
-    except Exception as e:
-        print(f"❌ Error fetching 10-K URL for {ticker}: {e}")
-        return (None, None)
 
+def load_submissions(cik: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load a company's EDGAR submissions JSON, using a local cache when possible.
+
+    Cached files younger than the TTL are used as-is; older ones are
+    revalidated with If-Modified-Since and only rewritten on a 200.
 
-def download_file(url: str, destination: str, desc: str = "") -> bool:
+    Args:
+        cik: SEC CIK number (10 digits with leading zeros)
+        cache_dir: Directory to cache submissions JSON in (None disables caching)
+
+    Returns:
+        Parsed submissions data
+    """
+    cache_path = os.path.join(cache_dir, f"{cik}.json") if cache_dir else None
+    headers = dict(HEADERS)
+
+    if cache_path and os.path.exists(cache_path):
+        cached_at = os.path.getmtime(cache_path)
+        if time.time() - cached_at < SUBMISSIONS_CACHE_TTL_SECONDS:
+            with open(cache_path, "rb") as f:
+                return orjson.loads(f.read())
+        headers["If-Modified-Since"] = formatdate(cached_at, usegmt=True)
+
+    submissions_url = f"https://data.sec.gov/submissions/CIK{cik}.json"
+    SEC_RATE_LIMITER.wait()
+    response = SESSION.get(submissions_url, headers=headers, timeout=10)
+
+    if response.status_code == 304:
+        os.utime(cache_path)  # Restart the TTL
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    response.raise_for_status()
+    if cache_path:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            f.write(response.content)
+
+    return orjson.loads(response.content)
+
+
+def get_latest_10k_url(ticker: str, cik: str, cache_dir: Optional[str] = None) -> tuple:
     """
-    Download a file from URL to destination.
+    Get the latest 10-K filing URL for a company.
 
     Args:
-        url: URL to download from
-        destination: Local file path to save to
-        desc: Description for progress bar
+        ticker: Stock ticker symbol
+        cik: SEC CIK number (must be 10 digits with leading zeros)
+        cache_dir: Optional directory to cache EDGAR submissions JSON in
 
     Returns:
-        True if successful, False otherwise
+        Tuple of (filing_url, fiscal_year) or (None, None) if not found
     """
     try:
-        print(f"📥 Downloading: {Path(destination).name}")
-        print(f"   From: {url}")
+        # Get company submissions data from SEC
+        data = load_submissions(cik, cache_dir)
+        filings = data["filings"]["recent"]
 
-        response = requests.get(url, headers=HEADERS, stream=True, timeout=60)
-        response.raise_for_status()
+        # Find the most recent 10-K filing (filings are newest first);
+        # list.index stops at the first match in a single C-level scan
+        try:
+            i = filings["form"].index("10-K")
+        except ValueError:
+            return (None, None)
 
-        total_size = int(response.headers.get("content-length", 0))
+        accession_number = filings["accessionNumber"][i].replace("-", "")
+        primary_document = filings["primaryDocument"][i]
+        filing_date = filings["filingDate"][i]
 
-        with open(destination, "wb") as f, tqdm(
-            total=total_size, unit="B", unit_scale=True, desc=f"   {desc}"
-        ) as pbar:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                pbar.update(len(chunk))
+        # Construct the filing URL
+        filing_url = (
+            f"https://www.sec.gov/Archives/edgar/data/{cik.lstrip('0')}/"
+            f"{accession_number}/{primary_document}"
+        )
 
-        print(f"✅ Downloaded: {Path(destination).name}\n")
-        return True
+        return (filing_url, filing_date[:4])  # Return URL and fiscal year
 
     except Exception as e:
-        print(f"❌ Error downloading {url}: {e}\n")
-        return False
+        logger.error("❌ Error fetching 10-K URL for %s: %s", ticker, e)
+        return (None, None)
 
 
 def download_sec_10k_filings(output_dir: str = "./data/pdfs/sec_10k") -> Dict[str, any]:
@@ -107,93 +185,56 @@ def download_sec_10k_filings(output_dir: str = "./data/pdfs/sec_10k") -> Dict[st
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    # 7 Mega-cap tech companies with their CIK numbers
-    companies = [
-        {"ticker": "AAPL", "name": "Apple Inc.", "cik": "0000320193"},
-        {"ticker": "MSFT", "name": "Microsoft Corporation", "cik": "0000789019"},
-        {"ticker": "NVDA", "name": "NVIDIA Corporation", "cik": "0001045810"},
-        {"ticker": "GOOGL", "name": "Alphabet Inc.", "cik": "0001652044"},
-        {"ticker": "AMZN", "name": "Amazon.com Inc.", "cik": "0001018724"},
-        {"ticker": "META", "name": "Meta Platforms Inc.", "cik": "0001326801"},
-        {"ticker": "TSLA", "name": "Tesla Inc.", "cik": "0001318605"},
-    ]
-
-    print("=" * 70)
-    print("SEC 10-K Filings Downloader - Mega-Cap Tech")
-    print("=" * 70)
-    print(f"Output directory: {output_dir}")
-    print(f"Total companies: {len(companies)}\n")
-
-    stats = {
-        "total": len(companies),
-        "successful": 0,
-        "failed": 0,
-        "downloaded_files": [],
-    }
-
-    for company in companies:
+    logger.info(
+        "\n".join(
+            [
+                "=" * 70,
+                "SEC 10-K Filings Downloader - Mega-Cap Tech",
+                "=" * 70,
+                f"Output directory: {output_dir}",
+                f"Total companies: {len(COMPANIES)}\n",
+            ]
+        )
+    )
+
+    # Stage 1: look up the latest 10-K for every company in parallel
+    cache_dir = os.path.join(output_dir, ".edgar_cache")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        filings = list(executor.map(get_latest_10k_url, TICKERS, CIKS, repeat(cache_dir)))
+
+    names, urls = [], []
+    for company, (filing_url, fiscal_year) in zip(COMPANIES, filings):
         ticker = company["ticker"]
-        name = company["name"]
-        cik = company["cik"]
-
-        print(f"🔍 Processing {ticker} ({name})...")
-
-        # Get the latest 10-K URL
-        filing_url, fiscal_year = get_latest_10k_url(ticker, cik)
 
         if not filing_url:
-            print(f"❌ Could not find 10-K for {ticker}\n")
-            stats["failed"] += 1
+            logger.warning("❌ Could not find 10-K for %s (%s)\n", ticker, company["name"])
             continue
 
-        # Determine file extension from URL
+        # Determine file extension from URL; HTML filings are stored gzipped
+        # (they compress ~7x) and are read back with open_filing
         if filing_url.endswith(".htm") or filing_url.endswith(".html"):
-            file_ext = ".html"
+            file_ext = ".html.gz"
         else:
             file_ext = ".txt"
 
-        filename = f"{ticker}_10K_FY{fiscal_year}{file_ext}"
-        destination = os.path.join(output_dir, filename)
-
-        # Skip if file already exists
-        if os.path.exists(destination):
-            file_size = os.path.getsize(destination)
-            if file_size > 1000:  # File larger than 1KB - assume valid
-                print(f"⏭️  Skipping (already exists): {filename}")
-                print(f"   Size: {file_size / 1024:.1f} KB")
-                print(f"   Fiscal Year: {fiscal_year}\n")
-                stats["successful"] += 1
-                stats["downloaded_files"].append(filename)
-                time.sleep(0.1)  # SEC rate limiting - be polite
-                continue
-
-        # Download the file
-        success = download_file(filing_url, destination, desc=f"{ticker} 10-K")
-
-        if success:
-            stats["successful"] += 1
-            stats["downloaded_files"].append(filename)
-        else:
-            stats["failed"] += 1
-
-        # SEC rate limiting - be respectful (10 requests/second limit)
-        time.sleep(0.15)
-
-    # Print summary
-    print("=" * 70)
-    print("Download Summary")
-    print("=" * 70)
-    print(f"✅ Successful: {stats['successful']}/{stats['total']}")
-    print(f"❌ Failed: {stats['failed']}/{stats['total']}")
-    print("\nDownloaded 10-K Filings:")
-    for filename in stats["downloaded_files"]:
-        file_path = os.path.join(output_dir, filename)
-        if os.path.exists(file_path):
-            size_kb = os.path.getsize(file_path) / 1024
-            print(f"  • {filename} ({size_kb:.1f} KB)")
+        names.append(f"{ticker}_10K_FY{fiscal_year}{file_ext}")
+        urls.append(filing_url)
+
+    # Stage 2: download the filings in parallel (earlier downloads are revalidated)
+    destinations = [filing_destination(output_dir, name) for name in names]
+    names = [os.path.basename(destination) for destination in destinations]
+    results = run_batch(urls, destinations, headers=HEADERS, rate_limiter=SEC_RATE_LIMITER)
+
+    # Companies without a 10-K count as failures too
+    stats = batch_stats(names, results)
+    stats["failed"] += len(COMPANIES) - len(names)
+    stats["total"] = len(COMPANIES)
+
+    log_summary(stats, output_dir, "Downloaded 10-K Filings")
 
     return stats
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     download_sec_10k_filings()
@@ -1,29 +1,58 @@
 # ABOUTME: Script to ingest UBS House View reports into ChromaDB
 # ABOUTME: Processes PDFs, creates embeddings, and loads into vector store
 
+import argparse
 import sys
-from pathlib import Path
+import logging
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from rag.vector_store import VectorStore, DocumentProcessor, ingest_pdfs_to_vectorstore
+from src.rag.vector_store import (
+    VectorStore,
+    DocumentProcessor,
+    ingest_pdfs_to_vectorstore,
+    reset_and_reingest,
+)
 
 
 def main():
     """Main ingestion workflow."""
+    parser = argparse.ArgumentParser(description="Ingest report PDFs into the vector store")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help=(
+            "Delete the collection and rebuild it from ./data/pdfs/*.pdf with the "
+            "configured embedding model. Chunks ingested from other sources are lost."
+        ),
+    )
+    args = parser.parse_args()
+
     print("\n" + "=" * 70)
     print("UBS House View Reports - Vector Store Ingestion")
     print("=" * 70 + "\n")
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Initialize components
     print("🔧 Initializing components...")
     vector_store = VectorStore()
-    processor = DocumentProcessor(chunk_size=1000, chunk_overlap=200)
+    processor = DocumentProcessor(chunk_size=256, chunk_overlap=50)
 
     # Ingest PDFs
     pdf_directory = "./data/pdfs"
-    stats = ingest_pdfs_to_vectorstore(pdf_directory, vector_store, processor)
+    if args.rebuild:
+        # Only on request: this drops every existing chunk, not just these PDFs
+        print("🔄 Rebuilding collection...")
+        stats = reset_and_reingest(pdf_directory, vector_store, processor)
+    elif vector_store.embedding_mismatch:
+        # Never mix encoders in one collection, and never rebuild unasked
+        print(
+            "❌ The collection was built with a different embedding model. Set "
+            "OPENAI_EMBEDDING_MODEL / OPENAI_EMBEDDING_DIMS to match it, or re-run "
+            "with --rebuild to replace it."
+        )
+        sys.exit(1)
+    else:
+        stats = ingest_pdfs_to_vectorstore(pdf_directory, vector_store, processor)
 
     # Display final statistics
     print("\n" + "=" * 70)
@@ -1,14 +1,87 @@
 # ABOUTME: Comparison tool for analyzing LLM-as-judge vs OpenAI Evals results
 # ABOUTME: Generates detailed recommendation report on which evaluator is better for what
 
+import functools
+import io
 import sys
 from pathlib import Path
 import argparse
-import json
-from typing import Dict, Any
+from typing import IO, Dict, Any, Callable, List, Tuple
 from datetime import datetime
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+import orjson
+
+# Run as a script (python src/eval/...): make the repo root importable. Imported
+# as part of the src package (or installed with pip install -e .), it already is.
+if not __package__:
+    sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.eval import results_io
+
+# Write buffer for the report file
+REPORT_BUFFER_SIZE = 1024 * 1024
+
+
+def _single_pass_stats(evaluations: List[Dict[str, Any]], pass_key: str) -> Dict[str, Any]:
+    """
+    Collect the per-evaluation statistics comparisons need in one pass.
+
+    Overall score mean and variance use Welford's algorithm; edge-case
+    evaluations are counted along the way.
+
+    Args:
+        evaluations: Evaluation records; those without an overall_score are
+            left out of the mean and variance
+        pass_key: Field holding the pass flag ("pass" or "passed")
+
+    Returns:
+        Dictionary with overall_mean, overall_variance and edge_pass_rate
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    edge_count = 0
+    edge_passed = 0
+    for e in evaluations:
+        if e.get("category") == "edge_cases":
+            edge_count += 1
+            if e.get(pass_key, False):
+                edge_passed += 1
+
+        x = e.get("overall_score")
+        if x is None:
+            continue
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+
+    return {
+        "overall_mean": mean,
+        "overall_variance": m2 / n if n else 0,
+        "edge_pass_rate": edge_passed / edge_count if edge_count else 0,
+    }
+
+
+def _memoized(method: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Run an analysis method once per comparison and reuse its result.
+
+    Args:
+        method: Zero-argument method of EvaluatorComparison
+
+    Returns:
+        Wrapped method reading from the instance's analysis cache
+    """
+
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self._analysis_cache
+        if method.__name__ not in cache:
+            cache[method.__name__] = method(self)
+        return cache[method.__name__]
+
+    return wrapper
 
 
 class EvaluatorComparison:
@@ -24,12 +97,23 @@ class EvaluatorComparison:
             llm_judge_path: Path to LLM judge results JSON
             evals_path: Path to OpenAI Evals results JSON
         """
-        with open(llm_judge_path, "r") as f:
-            self.llm_results = json.load(f)
+        # Compact views: summaries plus per-evaluation scores, not full responses
+        self.llm_results = results_io.load_compact_results(llm_judge_path)
+        self.evals_results = results_io.load_compact_results(evals_path)
 
-        with open(evals_path, "r") as f:
-            self.evals_results = json.load(f)
+        # Analysis results by method name (generate_report and
+        # generate_recommendations share them)
+        self._analysis_cache: Dict[str, Any] = {}
 
+    @_memoized
+    def _evaluation_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Single-pass statistics of each evaluator's evaluations."""
+        return {
+            "llm_judge": _single_pass_stats(self.llm_results["evaluations"], "pass"),
+            "openai_evals": _single_pass_stats(self.evals_results["evaluations"], "passed"),
+        }
+
+    @_memoized
     def compare_overall_scores(self) -> Dict[str, Any]:
         """Compare overall evaluation scores."""
         llm_avg = self.llm_results["summary"]["overall_average"]
@@ -43,13 +127,14 @@ class EvaluatorComparison:
             "notes": "LLM judge uses 1-5 scale; OpenAI Evals uses 0-1 scale (normalized)",
         }
 
+    @_memoized
     def compare_by_category(self) -> Dict[str, Any]:
         """Compare performance across question categories."""
         llm_categories = self.llm_results["summary"]["category_breakdown"]
         evals_categories = self.evals_results["summary"]["category_breakdown"]
 
         comparison = {}
-        for category in set(list(llm_categories.keys()) + list(evals_categories.keys())):
+        for category in llm_categories.keys() | evals_categories.keys():
             llm_score = llm_categories.get(category, {}).get("avg_score", 0)
             evals_score = evals_categories.get(category, {}).get("avg_score", 0)
 
@@ -64,6 +149,7 @@ class EvaluatorComparison:
 
         return comparison
 
+    @_memoized
     def analyze_consistency(self) -> Dict[str, Any]:
         """
         Analyze consistency of evaluations.
@@ -71,21 +157,10 @@ class EvaluatorComparison:
         Note: True consistency testing requires multiple runs.
         This provides a proxy by looking at score variance.
         """
-        # LLM judge variance (higher = less consistent)
-        llm_evals = self.llm_results["evaluations"]
-        llm_scores = [e["overall_score"] for e in llm_evals if "overall_score" in e]
-
-        evals_evals = self.evals_results["evaluations"]
-        evals_scores = [e["overall_score"] for e in evals_evals if "overall_score" in e]
-
-        def calculate_variance(scores):
-            if not scores:
-                return 0
-            mean = sum(scores) / len(scores)
-            return sum((x - mean) ** 2 for x in scores) / len(scores)
-
-        llm_variance = calculate_variance(llm_scores)
-        evals_variance = calculate_variance(evals_scores)
+        # Score variance (higher = less consistent)
+        stats = self._evaluation_stats()
+        llm_variance = stats["llm_judge"]["overall_variance"]
+        evals_variance = stats["openai_evals"]["overall_variance"]
 
         return {
             "llm_judge_variance": llm_variance,
@@ -94,21 +169,12 @@ class EvaluatorComparison:
             "note": "Lower variance suggests more consistent scoring. OpenAI Evals is expected to be more deterministic.",
         }
 
+    @_memoized
     def analyze_edge_cases(self) -> Dict[str, Any]:
         """Analyze how each evaluator handles edge cases."""
-        # Get edge case evaluations
-        llm_edge = [
-            e for e in self.llm_results["evaluations"]
-            if e.get("category") == "edge_cases"
-        ]
-
-        evals_edge = [
-            e for e in self.evals_results["evaluations"]
-            if e.get("category") == "edge_cases"
-        ]
-
-        llm_pass_rate = sum(1 for e in llm_edge if e.get("pass", False)) / len(llm_edge) if llm_edge else 0
-        evals_pass_rate = sum(1 for e in evals_edge if e.get("passed", False)) / len(evals_edge) if evals_edge else 0
+        stats = self._evaluation_stats()
+        llm_pass_rate = stats["llm_judge"]["edge_pass_rate"]
+        evals_pass_rate = stats["openai_evals"]["edge_pass_rate"]
 
         return {
             "llm_judge_edge_pass_rate": llm_pass_rate,
@@ -117,48 +183,47 @@ class EvaluatorComparison:
             "interpretation": "Edge cases test out-of-scope handling and disclaimer compliance",
         }
 
-    def generate_recommendations(self) -> Dict[str, str]:
+    def generate_recommendations(self) -> List[Tuple[str, str, str]]:
         """
         Generate specific recommendations for when to use each evaluator.
 
         Returns:
-            Dictionary mapping use cases to recommended evaluator
+            List of (use case, recommended evaluator, reasoning) tuples
         """
-        overall = self.compare_overall_scores()
         consistency = self.analyze_consistency()
         edge_cases = self.analyze_edge_cases()
 
-        recommendations = {
-            "factual_accuracy_testing": "openai-evals",
-            "reasoning": "OpenAI Evals uses deterministic keyword matching for facts, reducing false positives",
-
-            "citation_validation": "openai-evals",
-            "reasoning": "Deterministic regex-based citation checking is more reliable than LLM judgment",
-
-            "nuanced_evaluation": "llm-judge",
-            "reasoning": "LLM judge can understand context and provide detailed reasoning for complex responses",
-
-            "regression_testing": "openai-evals",
-            "reasoning": f"More consistent (variance: {consistency['openai_evals_variance']:.3f} vs {consistency['llm_judge_variance']:.3f})",
-
-            "edge_case_detection": edge_cases["better_at_edges"],
-            "reasoning": f"Better pass rate on edge cases: {max(edge_cases['llm_judge_edge_pass_rate'], edge_cases['openai_evals_edge_pass_rate'])*100:.1f}%",
-
-            "cost_efficiency": "openai-evals",
-            "reasoning": "Single LLM call vs two calls (agent + judge) for LLM-as-judge",
-
-            "debugging_failures": "llm-judge",
-            "reasoning": "Provides detailed reasoning for each score, easier to understand why tests fail",
-
-            "production_monitoring": "openai-evals",
-            "reasoning": "Deterministic scoring better for tracking metrics over time",
-        }
+        variance_note = (
+            f"More consistent (variance: {consistency['openai_evals_variance']:.3f} "
+            f"vs {consistency['llm_judge_variance']:.3f})"
+        )
+        best_edge_pass_rate = max(
+            edge_cases["llm_judge_edge_pass_rate"], edge_cases["openai_evals_edge_pass_rate"]
+        )
+        edge_note = f"Better pass rate on edge cases: {best_edge_pass_rate*100:.1f}%"
+
+        recommendations = [
+            ("factual_accuracy_testing", "openai-evals",
+             "OpenAI Evals uses deterministic keyword matching for facts, reducing false positives"),
+            ("citation_validation", "openai-evals",
+             "Deterministic regex-based citation checking is more reliable than LLM judgment"),
+            ("nuanced_evaluation", "llm-judge",
+             "LLM judge can understand context and provide detailed reasoning for complex responses"),
+            ("regression_testing", "openai-evals", variance_note),
+            ("edge_case_detection", edge_cases["better_at_edges"], edge_note),
+            ("cost_efficiency", "openai-evals",
+             "Single LLM call vs two calls (agent + judge) for LLM-as-judge"),
+            ("debugging_failures", "llm-judge",
+             "Provides detailed reasoning for each score, easier to understand why tests fail"),
+            ("production_monitoring", "openai-evals",
+             "Deterministic scoring better for tracking metrics over time"),
+        ]
 
         return recommendations
 
     def generate_report(self, output_format: str = "markdown") -> str:
         """
-        Generate comprehensive comparison report.
+        Generate comprehensive comparison report as a string.
 
         Args:
             output_format: Format for report (markdown or json)
@@ -166,6 +231,18 @@ class EvaluatorComparison:
         Returns:
             Formatted report string
         """
+        out = io.StringIO()
+        self.write_report(out, output_format)
+        return out.getvalue()
+
+    def write_report(self, out: IO[str], output_format: str = "markdown"):
+        """
+        Write comprehensive comparison report section by section.
+
+        Args:
+            out: Text stream to write the report to
+            output_format: Format for report (markdown or json)
+        """
         overall = self.compare_overall_scores()
         by_category = self.compare_by_category()
         consistency = self.analyze_consistency()
@@ -178,13 +255,18 @@ class EvaluatorComparison:
                 "category_comparison": by_category,
                 "consistency_analysis": consistency,
                 "edge_case_analysis": edge_cases,
-                "recommendations": recommendations,
+                "recommendations": [
+                    {"use_case": use_case, "evaluator": evaluator, "reasoning": reason}
+                    for use_case, evaluator, reason in recommendations
+                ],
                 "generated_at": datetime.now().isoformat(),
             }
-            return json.dumps(report, indent=2)
+            out.write(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+            return
 
-        # Markdown format
-        report = f"""# Evaluator Comparison Report
+        # Markdown format, written out as each section is produced
+        write = out.write
+        write(f"""# Evaluator Comparison Report
 
 **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -207,12 +289,14 @@ This report compares LLM-as-judge and OpenAI Evals-style evaluation approaches f
 
 | Category | LLM Judge | OpenAI Evals | Better |
 |----------|-----------|--------------|--------|
-"""
+""")
 
-        for cat, scores in by_category.items():
-            report += f"| {cat} | {scores['llm_judge']:.2f} | {scores['openai_evals']:.2f} | {scores['better_evaluator']} |\n"
+        out.writelines(
+            f"| {cat} | {scores['llm_judge']:.2f} | {scores['openai_evals']:.2f} | {scores['better_evaluator']} |\n"
+            for cat, scores in by_category.items()
+        )
 
-        report += f"""
+        write(f"""
 ---
 
 ## Consistency Analysis
@@ -241,30 +325,25 @@ This report compares LLM-as-judge and OpenAI Evals-style evaluation approaches f
 
 ## Recommendations: Which Evaluator for What?
 
-"""
+""")
 
         # Group recommendations by evaluator
         llm_judge_use_cases = []
         evals_use_cases = []
 
-        for use_case, evaluator in recommendations.items():
-            if use_case == "reasoning":
-                continue
-            reason = recommendations.get("reasoning", "")
+        for use_case, evaluator, reason in recommendations:
             if evaluator == "llm-judge":
                 llm_judge_use_cases.append((use_case.replace("_", " ").title(), reason))
             else:
                 evals_use_cases.append((use_case.replace("_", " ").title(), reason))
 
-        report += "### Use LLM-as-Judge For:\n\n"
-        for use_case, reason in llm_judge_use_cases:
-            report += f"- **{use_case}**: {reason}\n"
+        write("### Use LLM-as-Judge For:\n\n")
+        out.writelines(f"- **{use_case}**: {reason}\n" for use_case, reason in llm_judge_use_cases)
 
-        report += "\n### Use OpenAI Evals For:\n\n"
-        for use_case, reason in evals_use_cases:
-            report += f"- **{use_case}**: {reason}\n"
+        write("\n### Use OpenAI Evals For:\n\n")
+        out.writelines(f"- **{use_case}**: {reason}\n" for use_case, reason in evals_use_cases)
 
-        report += """
+        write("""
 ---
 
 ## Conclusion
@@ -299,9 +378,7 @@ Both evaluators have limitations:
 ---
 
 *This report was generated automatically. For questions, consult the evaluation documentation.*
-"""
-
-        return report
+""")
 
 
 def main():
@@ -347,16 +424,18 @@ def main():
 
     try:
         comparison = EvaluatorComparison(args.llm_judge, args.evals)
-        report = comparison.generate_report(output_format=args.format)
 
-        # Save report
-        with open(args.output, "w") as f:
-            f.write(report)
+        # Write the report straight to disk through a 1 MiB buffer
+        with open(args.output, "w", buffering=REPORT_BUFFER_SIZE) as f:
+            comparison.write_report(f, output_format=args.format)
+
+        with open(args.output) as f:
+            preview = f.read(1001)
 
         print(f"\n✅ Comparison report saved to: {args.output}")
         print("\nPreview:")
         print("=" * 80)
-        print(report[:1000] + "..." if len(report) > 1000 else report)
+        print(preview[:1000] + "..." if len(preview) > 1000 else preview)
 
     except FileNotFoundError as e:
         print(f"\n❌ Error: Results file not found: {e}")
@@ -0,0 +1,88 @@
+# ABOUTME: Bounded-concurrency helpers for running evaluations against the OpenAI API
+# ABOUTME: Caps in-flight requests with a semaphore and paces request starts to an RPM budget
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from tqdm import tqdm
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_RATE_LIMIT_RPM = 60
+
+# Progress bars redraw at most once a second; each item is a slow API call,
+# so finer updates would only add terminal writes
+PROGRESS_MININTERVAL = 1.0
+
+
+class RateLimiter:
+    """Spaces out request starts so no more than rpm begin per minute."""
+
+    def __init__(self, rpm: int):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rpm: Maximum requests per minute (<= 0 disables limiting)
+        """
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Block until the next request slot opens."""
+        if not self.interval:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def gather_bounded(
+    items: Sequence[Any],
+    worker: Callable[[Any], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    rate_limit_rpm: int = DEFAULT_RATE_LIMIT_RPM,
+    progress_desc: Optional[str] = None,
+) -> List[Any]:
+    """
+    Run worker over items concurrently, bounded by a semaphore and an RPM budget.
+
+    Args:
+        items: Inputs to process
+        worker: Coroutine function applied to each item
+        max_concurrency: Maximum workers in flight (default: 10)
+        rate_limit_rpm: Maximum worker starts per minute (default: 60)
+        progress_desc: If set, show a progress bar with this label, advanced
+            as each worker finishes
+
+    Returns:
+        Worker results in the same order as items
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    limiter = RateLimiter(rate_limit_rpm)
+
+    progress = (
+        tqdm(total=len(items), desc=progress_desc, mininterval=PROGRESS_MININTERVAL, smoothing=0)
+        if progress_desc
+        else None
+    )
+
+    async def bound(item: Any) -> Any:
+        async with semaphore:
+            await limiter.wait()
+            result = await worker(item)
+        if progress is not None:
+            progress.update(1)
+        return result
+
+    try:
+        return await asyncio.gather(*(bound(item) for item in items))
+    finally:
+        if progress is not None:
+            progress.close()
@@ -0,0 +1,108 @@
+# ABOUTME: Persistent cache of LLM judge verdicts keyed by judge model and judged inputs
+# ABOUTME: Lets evaluation re-runs over unchanged responses skip the judge API calls
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+JUDGE_CACHE_PATH = "data/eval_results/.judge_cache.db"
+
+
+def judge_cache_key(
+    model: str,
+    question: str,
+    agent_response: str,
+    ground_truth: str,
+    source_docs: List[str],
+    category: str,
+) -> str:
+    """
+    Build the cache key for one judgement.
+
+    Covers everything the judge prompt is built from, so a verdict is only
+    reused for an identical request.
+
+    Args:
+        model: Judge model
+        question: Original question
+        agent_response: Agent's response being judged
+        ground_truth: Expected answer
+        source_docs: List of source documents
+        category: Question category
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = orjson.dumps([model, question, agent_response, ground_truth, source_docs, category])
+    return hashlib.sha256(payload).hexdigest()
+
+
+class JudgeCache:
+    """SQLite-backed verdict cache, safe to share across threads."""
+
+    def __init__(self, db_path: str = JUDGE_CACHE_PATH):
+        """
+        Initialize the judge cache.
+
+        Args:
+            db_path: SQLite file to store verdicts in
+        """
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                evaluation_json BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached verdict.
+
+        Args:
+            key: Key from judge_cache_key
+
+        Returns:
+            Evaluation dictionary, or None on a miss
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT evaluation_json FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            self.stats["hits" if row else "misses"] += 1
+
+        return orjson.loads(row[0]) if row else None
+
+    def set(self, key: str, evaluation: Dict[str, Any]):
+        """
+        Store a verdict.
+
+        Args:
+            key: Key from judge_cache_key
+            evaluation: Evaluation dictionary (failed evaluations should not be cached)
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)",
+                (key, orjson.dumps(evaluation), time.time()),
+            )
+            self._db.commit()
+
+    def clear(self):
+        """Drop all cached verdicts."""
+        with self._lock:
+            self._db.execute("DELETE FROM verdicts")
+            self._db.commit()
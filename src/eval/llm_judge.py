@@ -1,20 +1,183 @@
 # ABOUTME: LLM-as-judge evaluation implementation
 # ABOUTME: Uses GPT-4 to evaluate agent responses against ground truth
 
+import asyncio
 import os
-import json
-from typing import Dict, Any, List
+import textwrap
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import sys
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Run as a script (python src/eval/...): make the repo root importable. Imported
+# as part of the src package (or installed with pip install -e .), it already is.
+if not __package__:
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import httpx
+import numpy as np
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from src.eval.judge_cache import JudgeCache, judge_cache_key
 
 load_dotenv()
 
+JUDGE_SYSTEM_PROMPT = (
+    "You are an expert evaluator of AI agent responses. Provide objective, detailed evaluations."
+)
+
+# Scoring rubric shared by single-question and batched judge prompts
+JUDGE_RUBRIC = """Please evaluate the agent's response on the following criteria using a 1-5 scale:
+
+1. **Factual Accuracy** (1-5):
+   - Does the response contain correct information matching the ground truth?
+   - Are any facts incorrect or misleading?
+   - Score: 5 = Perfect accuracy, 1 = Completely incorrect
+
+2. **Source Attribution** (1-5):
+   - Does the response properly cite sources (document names, page numbers)?
+   - Are citations accurate and specific?
+   - Score: 5 = Excellent citations, 1 = No citations or wrong citations
+
+3. **Completeness** (1-5):
+   - Does the response fully answer the question?
+   - Is any important information missing?
+   - Score: 5 = Completely answers question, 1 = Barely addresses question
+
+4. **Hallucination Detection** (1-5):
+   - Does the response contain any fabricated information not in source documents?
+   - Are there any invented facts, numbers, or claims?
+   - Score: 5 = No hallucinations, 1 = Major hallucinations
+
+5. **Compliance** (1-5):
+   - For investment advice: Does it include appropriate disclaimers?
+   - For out-of-scope questions: Does it acknowledge limitations?
+   - Score: 5 = Excellent compliance, 1 = Missing critical disclaimers"""
+
+# Fields of one verdict in the judge's JSON response
+JUDGE_VERDICT_FIELDS = """  "factual_accuracy": {"score": <1-5>, "reasoning": "<explanation>"},
+  "source_attribution": {"score": <1-5>, "reasoning": "<explanation>"},
+  "completeness": {"score": <1-5>, "reasoning": "<explanation>"},
+  "hallucination_detection": {"score": <1-5>, "reasoning": "<explanation>"},
+  "compliance": {"score": <1-5>, "reasoning": "<explanation>"},
+  "overall_score": <average of all scores>,
+  "pass": <true if overall_score >= 3.5, false otherwise>,
+  "summary": "<2-3 sentence summary of evaluation>"
+"""
+
+# Judge requests in flight at once when evaluating a test set
+DEFAULT_JUDGE_CONCURRENCY = 8
+
+# Connection pool for judge requests: keep-alive connections are reused so
+# concurrent judge calls skip repeated TCP/TLS handshakes
+JUDGE_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=128)
+JUDGE_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Questions judged per request (the rubric is sent once per batch)
+DEFAULT_JUDGE_BATCH_SIZE = 5
+
+# Criterion fields every verdict must carry
+VERDICT_CRITERIA = (
+    "factual_accuracy",
+    "source_attribution",
+    "completeness",
+    "hallucination_detection",
+    "compliance",
+)
+
+# Models that accept strict JSON-schema structured outputs together with the
+# system prompt and temperature the judge sends: the gpt-4o alias, the gpt-4o
+# snapshots from 2024-08-06 on, gpt-4o-mini and gpt-4.1. Everything else
+# (gpt-4-turbo, gpt-4o-2024-05-13, ...) falls back to plain JSON mode; o-series
+# and gpt-5 reasoning models are left out as they reject temperature
+STRUCTURED_OUTPUT_MODELS = ("gpt-4o",)
+STRUCTURED_OUTPUT_MODEL_PREFIXES = (
+    "gpt-4o-mini",
+    "gpt-4o-2024-08-06",
+    "gpt-4o-2024-11-20",
+    "gpt-4.1",
+)
+
+# JSON-mode prompts end with this reminder; schema-constrained replies need not
+JSON_ONLY_INSTRUCTION = "\n\nIMPORTANT: Return ONLY the JSON object, no other text."
+
+# Static part of the single-question prompt, following the per-question details
+JUDGE_PROMPT_TAIL = f"""---
+
+{JUDGE_RUBRIC}
+
+---
+
+Return your evaluation as a JSON object with this exact structure:
+{{
+{JUDGE_VERDICT_FIELDS}}}"""
+
+CRITERION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "enum": [1, 2, 3, 4, 5]},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["score", "reasoning"],
+    "additionalProperties": False,
+}
+
+# Schema of one verdict (mirrors JUDGE_VERDICT_FIELDS)
+VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{criterion: CRITERION_SCHEMA for criterion in VERDICT_CRITERIA},
+        "overall_score": {"type": "number"},
+        "pass": {"type": "boolean"},
+        "summary": {"type": "string"},
+    },
+    "required": [*VERDICT_CRITERIA, "overall_score", "pass", "summary"],
+    "additionalProperties": False,
+}
+
+# Schema of a multi-question reply: one index-tagged verdict per question
+BATCH_VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                **VERDICT_SCHEMA,
+                "properties": {"idx": {"type": "integer"}, **VERDICT_SCHEMA["properties"]},
+                "required": ["idx", *VERDICT_SCHEMA["required"]],
+            },
+        },
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
+
+# Batch states after which no output will arrive
+BATCH_FAILED_STATUSES = ("failed", "expired", "cancelled")
+
+
+def _criterion_score(value: Any) -> int:
+    """
+    Read a criterion's rubric score from a verdict.
+
+    Malformed or fallback verdicts may hold a string, number or None instead
+    of a {"score": ...} dict, or a non-numeric score.
+
+    Args:
+        value: The verdict's entry for one criterion
+
+    Returns:
+        Rounded score, or 0 (missing) if the entry has no numeric score
+    """
+    if not isinstance(value, dict):
+        return 0
+    score = value.get("score")
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or score != score:
+        return 0
+    return round(score)
+
 
 class LLMJudge:
     """
@@ -24,15 +187,40 @@ class LLMJudge:
     approach of using an LLM to evaluate another LLM's outputs.
     """
 
-    def __init__(self, model: str = "gpt-4-turbo-preview"):
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo-preview",
+        max_concurrency: int = DEFAULT_JUDGE_CONCURRENCY,
+        batch_size: int = DEFAULT_JUDGE_BATCH_SIZE,
+        use_cache: bool = True,
+    ):
         """
         Initialize the LLM judge.
 
         Args:
             model: OpenAI model to use for judging (default: gpt-4-turbo-preview)
+            max_concurrency: Maximum judge requests in flight (default: 8)
+            batch_size: Questions judged per request; 1 sends one request per
+                question (default: 5)
+            use_cache: If True, reuse verdicts cached on disk for identical
+                judge inputs (default: True)
         """
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.Client(limits=JUDGE_HTTP_LIMITS, timeout=JUDGE_HTTP_TIMEOUT),
+        )
+        self.aclient = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(limits=JUDGE_HTTP_LIMITS, timeout=JUDGE_HTTP_TIMEOUT),
+        )
         self.model = model
+        self.structured_outputs = model in STRUCTURED_OUTPUT_MODELS or model.startswith(
+            STRUCTURED_OUTPUT_MODEL_PREFIXES
+        )
+        self._prompt_tail = JUDGE_PROMPT_TAIL + self._json_only_instruction()
+        self.max_concurrency = max_concurrency
+        self.batch_size = max(1, batch_size)
+        self.cache = JudgeCache() if use_cache else None
         self.evaluation_criteria = [
             "factual_accuracy",
             "source_attribution",
@@ -41,6 +229,12 @@ class LLMJudge:
             "compliance",
         ]
 
+        # Row layout of the packed scores _calculate_summary reduces over
+        self._score_dtype = np.dtype(
+            [(criterion, np.uint8) for criterion in self.evaluation_criteria]
+            + [("overall", np.float64), ("passed", np.bool_), ("category", np.uint16)]
+        )
+
     def create_judge_prompt(
         self,
         question: str,
@@ -77,50 +271,62 @@ class LLMJudge:
 
 **QUESTION CATEGORY**: {category}
 
----
+"""
 
-Please evaluate the agent's response on the following criteria using a 1-5 scale:
+        return prompt + self._prompt_tail
 
-1. **Factual Accuracy** (1-5):
-   - Does the response contain correct information matching the ground truth?
-   - Are any facts incorrect or misleading?
-   - Score: 5 = Perfect accuracy, 1 = Completely incorrect
+    def create_batch_judge_prompt(self, cases: List[Dict[str, Any]]) -> str:
+        """
+        Create one judge prompt covering several questions.
 
-2. **Source Attribution** (1-5):
-   - Does the response properly cite sources (document names, page numbers)?
-   - Are citations accurate and specific?
-   - Score: 5 = Excellent citations, 1 = No citations or wrong citations
+        The rubric is printed once and the judge returns one verdict per
+        question, tagged with the question's 1-based index.
 
-3. **Completeness** (1-5):
-   - Does the response fully answer the question?
-   - Is any important information missing?
-   - Score: 5 = Completely answers question, 1 = Barely addresses question
+        Args:
+            cases: Test question dictionaries, each with an "agent_response"
 
-4. **Hallucination Detection** (1-5):
-   - Does the response contain any fabricated information not in source documents?
-   - Are there any invented facts, numbers, or claims?
-   - Score: 5 = No hallucinations, 1 = Major hallucinations
+        Returns:
+            Formatted batch judge prompt
+        """
+        sections = []
+        for idx, case in enumerate(cases, 1):
+            source_docs = case.get("source_documents", [])
+            sections.append(f"""### QUESTION {idx}
 
-5. **Compliance** (1-5):
-   - For investment advice: Does it include appropriate disclaimers?
-   - For out-of-scope questions: Does it acknowledge limitations?
-   - Score: 5 = Excellent compliance, 1 = Missing critical disclaimers
+**QUESTION**: {case["question"]}
+
+**AGENT'S RESPONSE**:
+{case["agent_response"]}
+
+**GROUND TRUTH** (Expected Answer):
+{case["ground_truth"]}
+
+**SOURCE DOCUMENTS AVAILABLE**:
+{', '.join(source_docs) if source_docs else 'None specified'}
+
+**QUESTION CATEGORY**: {case.get("category", "general")}
+""")
+
+        verdict_fields = textwrap.indent(JUDGE_VERDICT_FIELDS, "    ")
+        prompt = f"""You are evaluating a financial research agent's responses to {len(cases)} questions about investment research. Evaluate each response independently.
 
+{chr(10).join(sections)}
 ---
 
-Return your evaluation as a JSON object with this exact structure:
-{{
-  "factual_accuracy": {{"score": <1-5>, "reasoning": "<explanation>"}},
-  "source_attribution": {{"score": <1-5>, "reasoning": "<explanation>"}},
-  "completeness": {{"score": <1-5>, "reasoning": "<explanation>"}},
-  "hallucination_detection": {{"score": <1-5>, "reasoning": "<explanation>"}},
-  "compliance": {{"score": <1-5>, "reasoning": "<explanation>"}},
-  "overall_score": <average of all scores>,
-  "pass": <true if overall_score >= 3.5, false otherwise>,
-  "summary": "<2-3 sentence summary of evaluation>"
-}}
+{JUDGE_RUBRIC}
+
+Apply these criteria to every question above.
+
+---
 
-IMPORTANT: Return ONLY the JSON object, no other text."""
+Return your evaluations as a JSON object with this exact structure, with one entry per question in question order:
+{{
+  "results": [
+    {{
+      "idx": <question number>,
+{verdict_fields}    }}
+  ]
+}}{self._json_only_instruction()}"""
 
         return prompt
 
@@ -131,6 +337,7 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
         ground_truth: str,
         source_docs: List[str],
         category: str = "general",
+        timestamp: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Evaluate a single agent response.
@@ -141,49 +348,298 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
             ground_truth: Expected answer
             source_docs: List of source documents
             category: Question category
+            timestamp: Timestamp to record on the evaluation (default: now)
 
         Returns:
             Evaluation results dictionary
         """
-        try:
-            # Create judge prompt
-            judge_prompt = self.create_judge_prompt(
-                question, agent_response, ground_truth, source_docs, category
-            )
+        key, cached = self._cache_lookup(question, agent_response, ground_truth, source_docs, category)
+        if cached is not None:
+            return cached
 
+        try:
             # Get evaluation from judge
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert evaluator of AI agent responses. Provide objective, detailed evaluations.",
-                    },
-                    {"role": "user", "content": judge_prompt},
-                ],
-                temperature=0.1,  # Low temperature for consistency
-                response_format={"type": "json_object"},
+                **self._judge_request_body(
+                    question, agent_response, ground_truth, source_docs, category
+                )
             )
 
-            # Parse evaluation
-            evaluation = json.loads(response.choices[0].message.content)
+            evaluation = self._parse_evaluation(
+                response.choices[0].message.content, question, category, timestamp
+            )
+            self._cache_store(key, evaluation)
+            return evaluation
 
-            # Add metadata
-            evaluation["question"] = question
-            evaluation["category"] = category
-            evaluation["timestamp"] = datetime.now().isoformat()
-            evaluation["judge_model"] = self.model
+        except Exception as e:
+            print(f"❌ Evaluation error: {e}")
+            return self._error_evaluation(e, question)
 
-            return evaluation
+    async def evaluate_response_async(
+        self,
+        question: str,
+        agent_response: str,
+        ground_truth: str,
+        source_docs: List[str],
+        category: str = "general",
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a single agent response without blocking the event loop.
+
+        Args:
+            question: Original question
+            agent_response: Agent's response to evaluate
+            ground_truth: Expected answer
+            source_docs: List of source documents
+            category: Question category
+            timestamp: Timestamp to record on the evaluation (default: now)
+
+        Returns:
+            Evaluation results dictionary
+        """
+        key, cached = self._cache_lookup(question, agent_response, ground_truth, source_docs, category)
+        if cached is not None:
+            return cached
+
+        evaluation = await self._judge_async(
+            question, agent_response, ground_truth, source_docs, category, timestamp
+        )
+        self._cache_store(key, evaluation)
+        return evaluation
+
+    async def _judge_async(
+        self,
+        question: str,
+        agent_response: str,
+        ground_truth: str,
+        source_docs: List[str],
+        category: str,
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send one judge request, bypassing the cache."""
+        try:
+            response = await self.aclient.chat.completions.create(
+                **self._judge_request_body(
+                    question, agent_response, ground_truth, source_docs, category
+                )
+            )
+
+            return self._parse_evaluation(
+                response.choices[0].message.content, question, category, timestamp
+            )
+
+        except Exception as e:
+            print(f"❌ Evaluation error: {e}")
+            return self._error_evaluation(e, question)
+
+    async def evaluate_batch_async(
+        self,
+        cases: List[Dict[str, Any]],
+        timestamp: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate several agent responses with a single judge request.
+
+        Cached verdicts are reused and only the remaining questions are sent.
+        Falls back to one request per question if the judge's reply does not
+        match the expected schema.
+
+        Args:
+            cases: Test question dictionaries, each with an "agent_response"
+            timestamp: Timestamp to record on new evaluations (default: now)
+
+        Returns:
+            Evaluation results dictionaries, in the same order as cases
+        """
+        lookups = [self._cache_lookup(*self._case_inputs(case)) for case in cases]
+        pending = [case for case, (_, cached) in zip(cases, lookups) if cached is None]
+        judged = iter(await self._judge_cases_async(pending, timestamp) if pending else [])
+
+        evaluations = []
+        for key, cached in lookups:
+            if cached is None:
+                cached = next(judged)
+                self._cache_store(key, cached)
+            evaluations.append(cached)
+
+        return evaluations
 
+    async def _judge_cases_async(
+        self,
+        cases: List[Dict[str, Any]],
+        timestamp: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Judge cases in one batch request (or one request per case on a bad reply)."""
+        if len(cases) == 1:
+            return [await self._judge_async(*self._case_inputs(cases[0]), timestamp)]
+
+        try:
+            response = await self.aclient.chat.completions.create(
+                **self._request_body(
+                    self.create_batch_judge_prompt(cases), "judge_verdicts", BATCH_VERDICT_SCHEMA
+                )
+            )
+            content = response.choices[0].message.content
         except Exception as e:
             print(f"❌ Evaluation error: {e}")
-            return {
-                "error": str(e),
-                "question": question,
-                "overall_score": 0,
-                "pass": False,
+            return [self._error_evaluation(e, case["question"]) for case in cases]
+
+        try:
+            verdicts = self._split_batch_verdicts(content, len(cases))
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            print(f"⚠️  Batch verdict mismatch ({e}); judging {len(cases)} questions one by one")
+            return list(
+                await asyncio.gather(
+                    *(self._judge_async(*self._case_inputs(case), timestamp) for case in cases)
+                )
+            )
+
+        return [
+            self._add_metadata(verdict, case["question"], case.get("category", "general"), timestamp)
+            for verdict, case in zip(verdicts, cases)
+        ]
+
+    @staticmethod
+    def _case_inputs(case: Dict[str, Any]) -> Tuple[str, str, str, List[str], str]:
+        """Judge inputs of a test question dictionary carrying its agent_response."""
+        return (
+            case["question"],
+            case["agent_response"],
+            case["ground_truth"],
+            case.get("source_documents", []),
+            case.get("category", "general"),
+        )
+
+    def _cache_lookup(
+        self,
+        question: str,
+        agent_response: str,
+        ground_truth: str,
+        source_docs: List[str],
+        category: str,
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up a cached verdict for these judge inputs.
+
+        Returns:
+            (cache key, cached evaluation or None); the key is None when caching is off
+        """
+        if self.cache is None:
+            return None, None
+        key = judge_cache_key(self.model, question, agent_response, ground_truth, source_docs, category)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: Optional[str], evaluation: Dict[str, Any]):
+        """Cache a successful verdict under key (no-op when caching is off)."""
+        if key is not None and "error" not in evaluation:
+            self.cache.set(key, evaluation)
+
+    def clear_cache(self):
+        """Drop all cached judge verdicts."""
+        if self.cache is not None:
+            self.cache.clear()
+
+    @staticmethod
+    def _split_batch_verdicts(content: str, count: int) -> List[Dict[str, Any]]:
+        """
+        Split a batch judge reply into per-question verdicts.
+
+        Args:
+            content: Judge reply ({"results": [{"idx": ..., ...}, ...]})
+            count: Number of questions in the batch
+
+        Returns:
+            Verdicts ordered by question index
+
+        Raises:
+            ValueError: If the reply is not valid JSON or does not hold exactly
+                one complete verdict per question
+        """
+        results = orjson.loads(content)["results"]
+        by_idx = {int(verdict.pop("idx")): verdict for verdict in results}
+        if sorted(by_idx) != list(range(1, count + 1)):
+            raise ValueError(f"expected verdicts 1..{count}, got {sorted(by_idx)}")
+
+        for verdict in by_idx.values():
+            missing = [c for c in VERDICT_CRITERIA if c not in verdict]
+            if missing or "overall_score" not in verdict:
+                raise ValueError(f"incomplete verdict (missing {missing or ['overall_score']})")
+
+        return [by_idx[idx] for idx in range(1, count + 1)]
+
+    def _judge_request_body(
+        self,
+        question: str,
+        agent_response: str,
+        ground_truth: str,
+        source_docs: List[str],
+        category: str,
+    ) -> Dict[str, Any]:
+        """Build the chat completion request body for judging one response."""
+        return self._request_body(
+            self.create_judge_prompt(question, agent_response, ground_truth, source_docs, category),
+            "judge_verdict",
+            VERDICT_SCHEMA,
+        )
+
+    def _request_body(
+        self, judge_prompt: str, schema_name: str, schema: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the chat completion request body for a judge prompt and its reply schema."""
+        if self.structured_outputs:
+            # Decoding is constrained to the schema, so replies always parse
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {"name": schema_name, "schema": schema, "strict": True},
             }
+        else:
+            response_format = {"type": "json_object"}
+
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": JUDGE_SYSTEM_PROMPT},
+                {"role": "user", "content": judge_prompt},
+            ],
+            "temperature": 0.1,  # Low temperature for consistency
+            "response_format": response_format,
+        }
+
+    def _json_only_instruction(self) -> str:
+        """Closing prompt reminder to reply with bare JSON (JSON mode only)."""
+        return "" if self.structured_outputs else JSON_ONLY_INSTRUCTION
+
+    def _parse_evaluation(
+        self, content: str, question: str, category: str, timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Parse the judge's JSON verdict and add metadata."""
+        return self._add_metadata(orjson.loads(content), question, category, timestamp)
+
+    def _add_metadata(
+        self,
+        evaluation: Dict[str, Any],
+        question: str,
+        category: str,
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Tag a verdict with its question, category, time (default: now) and judge model."""
+        evaluation["question"] = question
+        evaluation["category"] = category
+        evaluation["timestamp"] = timestamp or datetime.now().isoformat()
+        evaluation["judge_model"] = self.model
+
+        return evaluation
+
+    @staticmethod
+    def _error_evaluation(error: Any, question: str) -> Dict[str, Any]:
+        """Build the placeholder evaluation for a failed judgement."""
+        return {
+            "error": str(error),
+            "question": question,
+            "overall_score": 0,
+            "pass": False,
+        }
 
     def evaluate_test_set(
         self,
@@ -191,7 +647,28 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
         agent_responses: List[str],
     ) -> Dict[str, Any]:
         """
-        Evaluate multiple test cases.
+        Evaluate multiple test cases (blocking wrapper around evaluate_test_set_async).
+
+        Args:
+            test_questions: List of test question dictionaries
+            agent_responses: List of agent responses (same order as questions)
+
+        Returns:
+            Comprehensive evaluation results
+        """
+        return asyncio.run(self.evaluate_test_set_async(test_questions, agent_responses))
+
+    async def evaluate_test_set_async(
+        self,
+        test_questions: List[Dict[str, Any]],
+        agent_responses: List[str],
+    ) -> Dict[str, Any]:
+        """
+        Evaluate multiple test cases concurrently.
+
+        Questions are judged batch_size at a time per request, with up to
+        max_concurrency requests in flight; results keep the order of
+        test_questions.
 
         Args:
             test_questions: List of test question dictionaries
@@ -203,34 +680,186 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
         if len(test_questions) != len(agent_responses):
             raise ValueError("Number of questions must match number of responses")
 
-        results = {
+        queue: "asyncio.Queue[Tuple[int, Dict[str, Any]]]" = asyncio.Queue()
+        for i, (test_q, response) in enumerate(zip(test_questions, agent_responses)):
+            queue.put_nowait((i, {**test_q, "agent_response": response}))
+
+        return await self.evaluate_stream_async(queue, len(test_questions))
+
+    async def evaluate_stream_async(
+        self,
+        queue: "asyncio.Queue[Tuple[int, Dict[str, Any]]]",
+        total: int,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate test cases as they arrive on a queue.
+
+        Cases are collected into batches of batch_size, and each batch is sent
+        to the judge as soon as it fills, so judging overlaps with whatever is
+        still producing cases. Up to max_concurrency judge requests are in
+        flight at once.
+
+        Args:
+            queue: (question index, test question dictionary with its
+                "agent_response") pairs, in any order
+            total: Number of cases that will arrive
+
+        Returns:
+            Comprehensive evaluation results, in question index order
+        """
+        results = self._new_results(total)
+
+        # Every evaluation in this run is stamped with the run's start time
+        run_timestamp = results["timestamp"]
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        evaluations: List[Optional[Dict[str, Any]]] = [None] * total
+        judged = 0
+
+        async def judge(batch: List[Tuple[int, Dict[str, Any]]]):
+            nonlocal judged
+            async with semaphore:
+                batch_evaluations = await self.evaluate_batch_async(
+                    [case for _, case in batch], run_timestamp
+                )
+
+            for (i, case), evaluation in zip(batch, batch_evaluations):
+                evaluation["question_id"] = case["id"]
+                evaluations[i] = evaluation
+
+            judged += len(batch)
+            ids = ", ".join(case["id"] for _, case in batch)
+            print(f"📊 Evaluated {judged}/{total} questions: {ids}")
+
+        tasks = []
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        for _ in range(total):
+            batch.append(await queue.get())
+            if len(batch) == self.batch_size:
+                tasks.append(asyncio.create_task(judge(batch)))
+                batch = []
+        if batch:
+            tasks.append(asyncio.create_task(judge(batch)))
+
+        await asyncio.gather(*tasks)
+        results["evaluations"] = evaluations
+
+        # Calculate summary statistics
+        results["summary"] = self._calculate_summary(results["evaluations"])
+
+        return results
+
+    def _new_results(self, total_questions: int) -> Dict[str, Any]:
+        """Create an empty results dictionary."""
+        return {
             "evaluator": "llm_judge",
             "judge_model": self.model,
             "timestamp": datetime.now().isoformat(),
-            "total_questions": len(test_questions),
+            "total_questions": total_questions,
             "evaluations": [],
             "summary": {},
         }
 
-        # Evaluate each question
+    def submit_batch(
+        self,
+        test_questions: List[Dict[str, Any]],
+        agent_responses: List[str],
+    ) -> str:
+        """
+        Submit all judgements as one OpenAI Batch API job (half the price, 24h window).
+
+        Args:
+            test_questions: List of test question dictionaries
+            agent_responses: List of agent responses (same order as questions)
+
+        Returns:
+            Batch ID to pass to collect_batch()
+        """
+        if len(test_questions) != len(agent_responses):
+            raise ValueError("Number of questions must match number of responses")
+
+        lines = []
         for i, (test_q, response) in enumerate(zip(test_questions, agent_responses)):
-            print(f"📊 Evaluating question {i+1}/{len(test_questions)}: {test_q['id']}")
-
-            evaluation = self.evaluate_response(
-                question=test_q["question"],
-                agent_response=response,
-                ground_truth=test_q["ground_truth"],
-                source_docs=test_q.get("source_documents", []),
-                category=test_q.get("category", "general"),
+            body = self._judge_request_body(
+                test_q["question"],
+                response,
+                test_q["ground_truth"],
+                test_q.get("source_documents", []),
+                test_q.get("category", "general"),
             )
+            lines.append(orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+
+        batch_file = self.client.files.create(
+            file=("llm_judge_batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"evaluator": "llm_judge"},
+        )
+
+        print(f"📦 Submitted judge batch {batch.id} ({len(lines)} requests)")
+        return batch.id
+
+    def collect_batch(
+        self,
+        batch_id: str,
+        test_questions: List[Dict[str, Any]],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch a submitted batch and score it once complete.
+
+        Args:
+            batch_id: ID returned by submit_batch()
+            test_questions: The test questions the batch was built from (same order)
+
+        Returns:
+            (batch status, evaluation results or None if not completed)
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return batch.status, None
+
+        outputs: Dict[str, Dict[str, Any]] = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                if line.strip():
+                    record = orjson.loads(line)
+                    outputs[record["custom_id"]] = record
+
+        results = self._new_results(len(test_questions))
+
+        for i, test_q in enumerate(test_questions):
+            category = test_q.get("category", "general")
+            record = outputs.get(str(i))
+
+            try:
+                if record is None:
+                    raise ValueError("No batch output for this request")
+                if record.get("error"):
+                    raise ValueError(record["error"])
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+                evaluation = self._parse_evaluation(
+                    content, test_q["question"], category, results["timestamp"]
+                )
+            except Exception as e:
+                print(f"❌ Evaluation error: {e}")
+                evaluation = self._error_evaluation(e, test_q["question"])
 
             evaluation["question_id"] = test_q["id"]
             results["evaluations"].append(evaluation)
 
-        # Calculate summary statistics
         results["summary"] = self._calculate_summary(results["evaluations"])
+        results["batch_id"] = batch_id
 
-        return results
+        return batch.status, results
 
     def _calculate_summary(self, evaluations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -251,49 +880,59 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
         if not valid_evals:
             return {"error": "All evaluations failed"}
 
-        # Calculate average scores
+        # Pack every evaluation into one structured array row in a single pass:
+        # criterion scores as uint8 (rubric scores are integers 1-5, 0 marks a
+        # missing score), overall score as float64 (NaN if missing) and the
+        # category as an integer code
+        categories: Dict[str, int] = {}
+        rows = []
+        for e in valid_evals:
+            rows.append((
+                *(_criterion_score(e.get(criterion)) for criterion in self.evaluation_criteria),
+                e.get("overall_score", np.nan),
+                bool(e.get("pass", False)),
+                categories.setdefault(e.get("category", "unknown"), len(categories)),
+            ))
+        packed = np.array(rows, dtype=self._score_dtype)
+
+        # Reduce each criterion column, skipping criteria with no scores
         criteria_scores = {}
         for criterion in self.evaluation_criteria:
-            scores = [
-                e[criterion]["score"]
-                for e in valid_evals
-                if criterion in e and "score" in e[criterion]
-            ]
-            if scores:
+            column = packed[criterion]
+            column = column[column > 0]
+            if column.size:
                 criteria_scores[criterion] = {
-                    "average": sum(scores) / len(scores),
-                    "min": min(scores),
-                    "max": max(scores),
+                    "average": float(column.mean()),
+                    "min": float(column.min()),
+                    "max": float(column.max()),
                 }
 
         # Overall statistics
-        overall_scores = [e["overall_score"] for e in valid_evals if "overall_score" in e]
-        pass_count = sum(1 for e in valid_evals if e.get("pass", False))
-
-        # Category breakdown
-        category_stats = {}
-        for eval in valid_evals:
-            cat = eval.get("category", "unknown")
-            if cat not in category_stats:
-                category_stats[cat] = {"count": 0, "passed": 0, "avg_score": []}
-
-            category_stats[cat]["count"] += 1
-            if eval.get("pass", False):
-                category_stats[cat]["passed"] += 1
-            if "overall_score" in eval:
-                category_stats[cat]["avg_score"].append(eval["overall_score"])
-
-        # Calculate category averages
-        for cat in category_stats:
-            scores = category_stats[cat]["avg_score"]
-            if scores:
-                category_stats[cat]["avg_score"] = sum(scores) / len(scores)
-            else:
-                category_stats[cat]["avg_score"] = 0
+        overall = packed["overall"]
+        has_overall = ~np.isnan(overall)
+        overall_scores = overall[has_overall]
+        pass_count = int(packed["passed"].sum())
+
+        # Category breakdown: per-category counts and score sums by category code
+        codes = packed["category"]
+        n_categories = len(categories)
+        counts = np.bincount(codes, minlength=n_categories)
+        passed = np.bincount(codes, weights=packed["passed"], minlength=n_categories)
+        score_sum = np.bincount(codes[has_overall], weights=overall_scores, minlength=n_categories)
+        score_n = np.bincount(codes[has_overall], minlength=n_categories)
+
+        category_stats = {
+            cat: {
+                "count": int(counts[code]),
+                "passed": int(passed[code]),
+                "avg_score": float(score_sum[code] / score_n[code]) if score_n[code] else 0,
+            }
+            for cat, code in categories.items()
+        }
 
         return {
             "criteria_scores": criteria_scores,
-            "overall_average": sum(overall_scores) / len(overall_scores) if overall_scores else 0,
+            "overall_average": float(overall_scores.mean()) if overall_scores.size else 0,
             "pass_rate": pass_count / len(valid_evals) if valid_evals else 0,
             "total_evaluated": len(valid_evals),
             "total_failed": len(evaluations) - len(valid_evals),
@@ -327,7 +966,7 @@ def main():
     print(f"\n{'='*80}")
     print("Evaluation Results:")
     print(f"{'='*80}")
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
 
 if __name__ == "__main__":
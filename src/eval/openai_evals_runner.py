@@ -1,19 +1,120 @@
 # ABOUTME: OpenAI Evals-style evaluation implementation for research agent
 # ABOUTME: Uses deterministic matching and custom graders for more consistent evaluation
 
-import json
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Pattern, Tuple
 from datetime import datetime
 import time
 import re
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Run as a script (python src/eval/...): make the repo root importable. Imported
+# as part of the src package (or installed with pip install -e .), it already is.
+if not __package__:
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.agent.research_agent import ResearchAgent
+from src.eval import results_io
+from src.eval.concurrency import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_RATE_LIMIT_RPM,
+    PROGRESS_MININTERVAL,
+    gather_bounded,
+)
+import numpy as np
 from tqdm import tqdm
 
+# Any of these phrases counts as a citation (one combined, precompiled pattern)
+CITATION_RE = re.compile(
+    r"according to|UBS House View|Page \d+|March 2025|June 2024|June 2025|November 2024",
+    re.IGNORECASE,
+)
+
+# Lowercase substrings at least one of which is in every CITATION_RE match
+CITATION_MARKERS = ("according to", "ubs house view", "page", "2024", "2025")
+
+# Report month in a source file name (e.g. "March" from "UBS_House_View_March_2025.pdf")
+SOURCE_DATE_RE = re.compile(r"(March|June|November|April)\s*\d{4}")
+
+# Phrases showing a disclaimer or an acknowledged limitation
+COMPLIANCE_KEYWORDS = (
+    "investment advice",
+    "financial advisor",
+    "licensed advisor",
+    "consult",
+    "personalized advice",
+    "not covered",
+    "not found",
+    "not available",
+    "cannot",
+    "unable to",
+)
+
+# All compliance keywords in one pattern, found in a single scan of the response
+COMPLIANCE_RE = re.compile("|".join(re.escape(kw) for kw in COMPLIANCE_KEYWORDS), re.IGNORECASE)
+
+# Overall score weights for each grader
+KEYWORD_WEIGHT = 0.5  # Most important: factual accuracy
+CITATION_WEIGHT = 0.3  # Important: source attribution
+COMPLIANCE_WEIGHT = 0.2  # Important: disclaimers
+
+# Overall score needed to pass (70%)
+PASS_THRESHOLD = 0.7
+
+# One row per evaluation in _calculate_summary (scores are NaN when skipped)
+SUMMARY_DTYPE = np.dtype([
+    ("overall", np.float64),
+    ("keyword", np.float64),
+    ("citation", np.float64),
+    ("compliance", np.float64),
+    ("passed", np.bool_),
+    ("category", np.uint16),
+])
+
+
+def _nan_mean(column: np.ndarray) -> float:
+    """Mean of the non-NaN values in a score column (0 if there are none)."""
+    scores = column[~np.isnan(column)]
+    return float(scores.mean()) if scores.size else 0
+
+
+@lru_cache(maxsize=256)
+def _keyword_patterns(required_keywords: Tuple[str, ...]) -> List[Tuple[Pattern[str], Dict[str, str]]]:
+    """
+    Compile one case-insensitive pattern per required keyword.
+
+    Each keyword's "|"-separated alternatives become a single alternation
+    (longest first), so a keyword is checked with one regex search.
+
+    Args:
+        required_keywords: Keywords from a test question's must_include list
+
+    Returns:
+        (pattern, lowercased alternative -> alternative) pair per keyword
+    """
+    compiled = []
+    for keyword in required_keywords:
+        alternatives = [alt.strip() for alt in keyword.split("|")]
+        ordered = sorted(alternatives, key=len, reverse=True)
+        pattern = re.compile("|".join(re.escape(alt) for alt in ordered), re.IGNORECASE)
+        compiled.append((pattern, {alt.lower(): alt for alt in reversed(alternatives)}))
+    return compiled
+
+
+@lru_cache(maxsize=256)
+def _source_key_parts(source: str) -> Tuple[str, ...]:
+    """
+    Extract the lowercased parts of a source document name that a response must mention.
+
+    Args:
+        source: Expected source document name
+
+    Returns:
+        Lowercased SOURCE_DATE_RE matches of the name
+    """
+    return tuple(part.lower() for part in SOURCE_DATE_RE.findall(source))
+
 
 class OpenAIEvalsRunner:
     """
@@ -28,21 +129,21 @@ class OpenAIEvalsRunner:
     Falls back to semantic similarity for complex cases.
     """
 
-    def __init__(self, test_questions_path: str):
+    def __init__(self, test_questions_path: str, agent: Optional[ResearchAgent] = None):
         """
         Initialize evals runner.
 
         Args:
             test_questions_path: Path to test questions JSON
+            agent: Optional already-built agent to test (created on first use otherwise)
         """
         self.test_questions_path = test_questions_path
         self.test_data = self._load_test_questions()
-        self.agent = None
+        self.agent = agent
 
     def _load_test_questions(self) -> Dict[str, Any]:
         """Load test questions from JSON."""
-        with open(self.test_questions_path, "r") as f:
-            return json.load(f)
+        return results_io.load_test_questions(self.test_questions_path)
 
     def grade_exact_match(self, response: str, expected: List[str]) -> Dict[str, Any]:
         """
@@ -78,6 +179,7 @@ class OpenAIEvalsRunner:
         response: str,
         required_keywords: List[str],
         partial_credit: bool = True,
+        response_lower: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Grade based on keyword inclusion.
@@ -86,25 +188,24 @@ class OpenAIEvalsRunner:
             response: Agent response
             required_keywords: List of keywords that must appear
             partial_credit: If True, give partial score for some keywords
+            response_lower: response.lower(), if the caller already computed it
 
         Returns:
             Grading result
         """
-        response_lower = response.lower()
+        if response_lower is None:
+            response_lower = response.lower()
         found_keywords = []
         missing_keywords = []
 
-        for keyword in required_keywords:
+        for keyword, (pattern, alternatives) in zip(
+            required_keywords, _keyword_patterns(tuple(required_keywords))
+        ):
             # Handle multi-word keywords and alternatives (separated by |)
-            alternatives = keyword.split("|")
-            found = False
-            for alt in alternatives:
-                if alt.strip().lower() in response_lower:
-                    found = True
-                    found_keywords.append(alt.strip())
-                    break
-
-            if not found:
+            match = pattern.search(response_lower)
+            if match:
+                found_keywords.append(alternatives.get(match.group(0), match.group(0)))
+            else:
                 missing_keywords.append(keyword)
 
         if partial_credit:
@@ -120,35 +221,38 @@ class OpenAIEvalsRunner:
             "grader": "keyword_inclusion",
         }
 
-    def grade_citation_quality(self, response: str, expected_sources: List[str]) -> Dict[str, Any]:
+    def grade_citation_quality(
+        self,
+        response: str,
+        expected_sources: List[str],
+        response_lower: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Grade quality of source citations.
 
         Args:
             response: Agent response
             expected_sources: List of expected source document names
+            response_lower: response.lower(), if the caller already computed it
 
         Returns:
             Grading result
         """
-        # Check for citation patterns
-        citation_patterns = [
-            r"according to",
-            r"UBS House View",
-            r"Page \d+",
-            r"\(Page \d+\)",
-            r"March 2025|June 2024|June 2025|November 2024",
-        ]
-
-        has_citations = any(re.search(pattern, response, re.IGNORECASE) for pattern in citation_patterns)
+        if response_lower is None:
+            response_lower = response.lower()
+
+        # Check for citation patterns ("(Page N)" is covered by "Page N"); the
+        # regex only runs if a substring every citation contains is present
+        has_citations = (
+            any(marker in response_lower for marker in CITATION_MARKERS)
+            and CITATION_RE.search(response) is not None
+        )
 
         # Check if expected sources are mentioned
         sources_mentioned = []
         for source in expected_sources:
-            # Extract key parts (e.g., "March 2025" from "UBS_House_View_March_2025.pdf")
-            key_parts = re.findall(r"(March|June|November|April)\s*\d{4}", source)
-            for part in key_parts:
-                if part.lower() in response.lower():
+            for part in _source_key_parts(source):
+                if part in response_lower:
                     sources_mentioned.append(source)
                     break
 
@@ -186,27 +290,14 @@ class OpenAIEvalsRunner:
         Returns:
             Grading result
         """
-        # Check for compliance keywords
-        compliance_keywords = [
-            "investment advice",
-            "financial advisor",
-            "licensed advisor",
-            "consult",
-            "personalized advice",
-            "not covered",
-            "not found",
-            "not available",
-            "cannot",
-            "unable to",
-        ]
-
-        response_lower = response.lower()
-        compliance_found = [kw for kw in compliance_keywords if kw in response_lower]
+        # Check for compliance keywords (reported in COMPLIANCE_KEYWORDS order)
+        found = {match.group(0).lower() for match in COMPLIANCE_RE.finditer(response)}
+        compliance_found = [kw for kw in COMPLIANCE_KEYWORDS if kw in found]
 
         # Expectations by category
         if question_category in ["comparative", "edge_cases"]:
             # These should have disclaimers or limitations
-            required = any(kw in response_lower for kw in compliance_keywords)
+            required = bool(found)
             score = 1.0 if required else 0.5
         else:
             # For factual questions, compliance is good but not always required
@@ -228,6 +319,7 @@ class OpenAIEvalsRunner:
         evaluation_criteria: Dict[str, Any],
         source_docs: List[str],
         category: str,
+        timestamp: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Evaluate a single response using multiple graders.
@@ -240,6 +332,7 @@ class OpenAIEvalsRunner:
             evaluation_criteria: Criteria from test question
             source_docs: Expected source documents
             category: Question category
+            timestamp: Timestamp to record on the result (default: now)
 
         Returns:
             Evaluation result
@@ -248,53 +341,57 @@ class OpenAIEvalsRunner:
             "question_id": question_id,
             "question": question,
             "category": category,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
         }
 
+        # Lowercased once and shared by the case-insensitive graders
+        response_lower = response.lower()
+
         # 1. Keyword inclusion (factual accuracy proxy)
         must_include = evaluation_criteria.get("must_include", [])
         if must_include:
-            keyword_result = self.grade_keyword_inclusion(response, must_include)
-            results["keyword_check"] = keyword_result
+            keyword_result = self.grade_keyword_inclusion(
+                response, must_include, response_lower=response_lower
+            )
         else:
-            results["keyword_check"] = {"score": 1.0, "passed": True, "grader": "skipped"}
+            keyword_result = {"score": 1.0, "passed": True, "grader": "skipped"}
+        results["keyword_check"] = keyword_result
 
         # 2. Citation quality
         should_cite = evaluation_criteria.get("should_cite", True)
         if should_cite and source_docs:
-            citation_result = self.grade_citation_quality(response, source_docs)
-            results["citation_check"] = citation_result
+            citation_result = self.grade_citation_quality(
+                response, source_docs, response_lower=response_lower
+            )
         else:
-            results["citation_check"] = {"score": 1.0, "passed": True, "grader": "skipped"}
+            citation_result = {"score": 1.0, "passed": True, "grader": "skipped"}
+        results["citation_check"] = citation_result
 
         # 3. Compliance
         compliance_result = self.grade_compliance(response, category)
         results["compliance_check"] = compliance_result
 
-        # Calculate overall score (weighted average)
-        weights = {
-            "keyword_check": 0.5,  # Most important: factual accuracy
-            "citation_check": 0.3,  # Important: source attribution
-            "compliance_check": 0.2,  # Important: disclaimers
-        }
-
-        overall_score = sum(
-            results[check]["score"] * weights[check]
-            for check in weights
-            if check in results
+        # Calculate overall score (weighted average; every check is always present)
+        overall_score = (
+            keyword_result["score"] * KEYWORD_WEIGHT
+            + citation_result["score"] * CITATION_WEIGHT
+            + compliance_result["score"] * COMPLIANCE_WEIGHT
         )
 
         results["overall_score"] = overall_score
-        results["passed"] = overall_score >= 0.7  # 70% threshold
+        results["passed"] = overall_score >= PASS_THRESHOLD
 
         return results
 
-    def run_evaluation(self, verbose: bool = True) -> Dict[str, Any]:
+    def run_evaluation(self, verbose: bool = True, progress_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Run evaluation on all test questions.
 
         Args:
             verbose: If True, show progress
+            progress_path: Optional JSONL file each evaluation is appended to as
+                soon as it is graded; questions already in it (from a crashed
+                run) are not asked again
 
         Returns:
             Complete evaluation results
@@ -308,116 +405,227 @@ class OpenAIEvalsRunner:
         if not self.agent:
             self.agent = ResearchAgent()
 
+        # One timestamp for the run, shared by every evaluation in it
+        run_timestamp = datetime.now().isoformat()
+
         results = {
             "evaluator": "openai_evals",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": run_timestamp,
             "total_questions": self.test_data["total_questions"],
             "evaluations": [],
             "summary": {},
         }
 
         questions = self.test_data["questions"]
-        iterator = tqdm(questions, desc="Evaluating") if verbose else questions
+        iterator = (
+            tqdm(questions, desc="Evaluating", mininterval=PROGRESS_MININTERVAL, smoothing=0)
+            if verbose
+            else questions
+        )
 
-        for test_q in iterator:
-            # Clear agent history
-            self.agent.clear_history(keep_system_prompt=True)
+        completed = results_io.load_progress(progress_path)
+        if verbose and completed:
+            print(f"   Resuming: {len(completed)} questions already graded")
+
+        with results_io.open_progress_log(progress_path) as log:
+            for test_q in iterator:
+                if test_q["id"] in completed:
+                    results["evaluations"].append(completed[test_q["id"]])
+                    continue
+
+                # Clear agent history
+                self.agent.clear_history(keep_system_prompt=True)
+
+                # Get agent response
+                start_time = time.time()
+                try:
+                    response = self.agent.chat_sync(test_q["question"])
+                    elapsed = time.time() - start_time
+                except Exception as e:
+                    response = f"ERROR: {e}"
+                    elapsed = 0
+
+                # Evaluate
+                eval_result = self._grade_test_question(test_q, response, elapsed, run_timestamp)
+                results["evaluations"].append(eval_result)
+                results_io.log_progress(log, eval_result)
 
-            # Get agent response
+        # Calculate summary
+        results["summary"] = self._calculate_summary(results["evaluations"])
+
+        if verbose:
+            self._print_summary(results["summary"])
+
+        return results
+
+    async def run_evaluation_async(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit_rpm: int = DEFAULT_RATE_LIMIT_RPM,
+        verbose: bool = True,
+        progress_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run evaluation on all test questions with concurrent agent calls.
+
+        Each question gets its own agent (histories must not mix); all agents
+        share one vector store.
+
+        Args:
+            max_concurrency: Maximum questions in flight (default: 10)
+            rate_limit_rpm: Maximum questions started per minute (default: 60)
+            verbose: If True, show progress
+            progress_path: Optional JSONL file each evaluation is appended to as
+                soon as it is graded (in completion order); questions already
+                in it (from a crashed run) are not asked again
+
+        Returns:
+            Complete evaluation results
+        """
+        if verbose:
+            print(f"\n🧪 Running OpenAI Evals-style evaluation...")
+            print(f"   Test questions: {self.test_data['total_questions']}")
+            print(f"   Concurrency: {max_concurrency} (rpm={rate_limit_rpm})")
+            print("=" * 80)
+
+        if not self.agent:
+            self.agent = ResearchAgent()
+
+        # One timestamp for the run, shared by every evaluation in it
+        run_timestamp = datetime.now().isoformat()
+
+        completed = results_io.load_progress(progress_path)
+        if verbose and completed:
+            print(f"   Resuming: {len(completed)} questions already graded")
+
+        async def run_question(test_q: Dict[str, Any]) -> Dict[str, Any]:
             start_time = time.time()
             try:
-                response = self.agent.chat(test_q["question"])
+                agent = ResearchAgent(
+                    model=self.agent.model,
+                    vector_store=self.agent.vector_store,
+                    semantic_cache=self.agent.rag_tool,
+                )
+                response = await agent.chat(test_q["question"])
                 elapsed = time.time() - start_time
             except Exception as e:
                 response = f"ERROR: {e}"
                 elapsed = 0
+            eval_result = self._grade_test_question(test_q, response, elapsed, run_timestamp)
+            results_io.log_progress(log, eval_result)
+            return eval_result
 
-            # Evaluate
-            eval_result = self.evaluate_response(
-                question_id=test_q["id"],
-                question=test_q["question"],
-                response=response,
-                ground_truth=test_q["ground_truth"],
-                evaluation_criteria=test_q.get("evaluation_criteria", {}),
-                source_docs=test_q.get("source_documents", []),
-                category=test_q["category"],
+        questions = self.test_data["questions"]
+        pending = [test_q for test_q in questions if test_q["id"] not in completed]
+
+        with results_io.open_progress_log(progress_path) as log:
+            graded = await gather_bounded(
+                pending,
+                run_question,
+                max_concurrency,
+                rate_limit_rpm,
+                progress_desc="Evaluating" if verbose else None,
             )
 
-            eval_result["agent_response"] = response
-            eval_result["response_time_seconds"] = elapsed
-
-            results["evaluations"].append(eval_result)
+        # Back in test-set order, logged and fresh evaluations together
+        completed.update((e["question_id"], e) for e in graded)
+        evaluations = [completed[test_q["id"]] for test_q in questions]
 
-        # Calculate summary
-        results["summary"] = self._calculate_summary(results["evaluations"])
+        results = {
+            "evaluator": "openai_evals",
+            "timestamp": run_timestamp,
+            "total_questions": self.test_data["total_questions"],
+            "evaluations": evaluations,
+            "summary": self._calculate_summary(evaluations),
+        }
 
         if verbose:
-            print("\n" + "=" * 80)
-            print("📊 Evaluation Summary:")
-            print(f"   Overall Average: {results['summary']['overall_average']:.2f}")
-            print(f"   Pass Rate: {results['summary']['pass_rate']*100:.1f}%")
-            print(f"   Keyword Accuracy: {results['summary']['avg_keyword_score']:.2f}")
-            print(f"   Citation Quality: {results['summary']['avg_citation_score']:.2f}")
-            print(f"   Compliance Score: {results['summary']['avg_compliance_score']:.2f}")
+            self._print_summary(results["summary"])
 
         return results
 
+    def _grade_test_question(
+        self, test_q: Dict[str, Any], response: str, elapsed: float, timestamp: str
+    ) -> Dict[str, Any]:
+        """Grade the agent's response to one test question."""
+        eval_result = self.evaluate_response(
+            question_id=test_q["id"],
+            question=test_q["question"],
+            response=response,
+            ground_truth=test_q["ground_truth"],
+            evaluation_criteria=test_q.get("evaluation_criteria", {}),
+            source_docs=test_q.get("source_documents", []),
+            category=test_q["category"],
+            timestamp=timestamp,
+        )
+
+        eval_result["agent_response"] = response
+        eval_result["response_time_seconds"] = elapsed
+
+        return eval_result
+
+    def _print_summary(self, summary: Dict[str, Any]):
+        """Print evaluation summary."""
+        print("\n" + "=" * 80)
+        print("📊 Evaluation Summary:")
+        print(f"   Overall Average: {summary['overall_average']:.2f}")
+        print(f"   Pass Rate: {summary['pass_rate']*100:.1f}%")
+        print(f"   Keyword Accuracy: {summary['avg_keyword_score']:.2f}")
+        print(f"   Citation Quality: {summary['avg_citation_score']:.2f}")
+        print(f"   Compliance Score: {summary['avg_compliance_score']:.2f}")
+
     def _calculate_summary(self, evaluations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate summary statistics."""
         if not evaluations:
             return {}
 
-        # Overall scores
-        overall_scores = [e["overall_score"] for e in evaluations]
-        pass_count = sum(1 for e in evaluations if e.get("passed", False))
-
-        # Component scores
-        keyword_scores = [
-            e["keyword_check"]["score"]
-            for e in evaluations
-            if "keyword_check" in e and e["keyword_check"]["grader"] != "skipped"
-        ]
-        citation_scores = [
-            e["citation_check"]["score"]
-            for e in evaluations
-            if "citation_check" in e and e["citation_check"]["grader"] != "skipped"
-        ]
-        compliance_scores = [e["compliance_check"]["score"] for e in evaluations if "compliance_check" in e]
-
-        # Category breakdown
-        category_stats = {}
-        for eval in evaluations:
-            cat = eval["category"]
-            if cat not in category_stats:
-                category_stats[cat] = {"count": 0, "passed": 0, "scores": []}
-
-            category_stats[cat]["count"] += 1
-            if eval.get("passed", False):
-                category_stats[cat]["passed"] += 1
-            category_stats[cat]["scores"].append(eval["overall_score"])
-
-        for cat in category_stats:
-            scores = category_stats[cat]["scores"]
-            category_stats[cat]["avg_score"] = sum(scores) / len(scores) if scores else 0
+        # Pack every evaluation into one structured array row in a single pass;
+        # skipped or missing component checks are NaN and excluded from averages
+        categories: Dict[str, int] = {}
+        rows = []
+        for e in evaluations:
+            keyword = e.get("keyword_check")
+            citation = e.get("citation_check")
+            compliance = e.get("compliance_check")
+            rows.append((
+                e["overall_score"],
+                keyword["score"] if keyword and keyword["grader"] != "skipped" else np.nan,
+                citation["score"] if citation and citation["grader"] != "skipped" else np.nan,
+                compliance["score"] if compliance else np.nan,
+                bool(e.get("passed", False)),
+                categories.setdefault(e["category"], len(categories)),
+            ))
+        packed = np.array(rows, dtype=SUMMARY_DTYPE)
+
+        # Category breakdown: per-category counts and score sums by category code
+        codes = packed["category"]
+        n_categories = len(categories)
+        counts = np.bincount(codes, minlength=n_categories)
+        passed = np.bincount(codes, weights=packed["passed"], minlength=n_categories)
+        score_sum = np.bincount(codes, weights=packed["overall"], minlength=n_categories)
+
+        category_stats = {
+            cat: {
+                "count": int(counts[code]),
+                "passed": int(passed[code]),
+                "avg_score": float(score_sum[code] / counts[code]),
+            }
+            for cat, code in categories.items()
+        }
 
         return {
-            "overall_average": sum(overall_scores) / len(overall_scores) if overall_scores else 0,
-            "pass_rate": pass_count / len(evaluations) if evaluations else 0,
-            "avg_keyword_score": sum(keyword_scores) / len(keyword_scores) if keyword_scores else 0,
-            "avg_citation_score": sum(citation_scores) / len(citation_scores) if citation_scores else 0,
-            "avg_compliance_score": sum(compliance_scores) / len(compliance_scores) if compliance_scores else 0,
+            "overall_average": float(packed["overall"].mean()),
+            "pass_rate": int(np.count_nonzero(packed["passed"])) / len(evaluations),
+            "avg_keyword_score": _nan_mean(packed["keyword"]),
+            "avg_citation_score": _nan_mean(packed["citation"]),
+            "avg_compliance_score": _nan_mean(packed["compliance"]),
             "total_evaluated": len(evaluations),
             "category_breakdown": category_stats,
         }
 
     def save_results(self, results: Dict[str, Any], output_path: str):
-        """Save results to JSON."""
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
-
-        print(f"\n💾 Results saved to: {output_path}")
+        """Save results to JSON (plus a *.summary.json companion)."""
+        results_io.save_results(results, output_path)
 
 
 def main():
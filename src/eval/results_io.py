@@ -0,0 +1,270 @@
+# ABOUTME: Reading and writing evaluation result files
+# ABOUTME: Writes a compact *.summary.json next to each full results file for cheap comparisons
+
+import mmap
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, BinaryIO, ContextManager, Dict, Optional, Union
+
+import orjson
+
+# Top-level keys copied into the summary file
+SUMMARY_KEYS = ("evaluator", "timestamp", "total_questions", "summary")
+
+# Per-evaluation fields copied into the summary file (all that comparisons read)
+EVALUATION_KEYS = ("category", "overall_score", "pass", "passed")
+
+# Fields every test question must carry (the rest are optional)
+TEST_QUESTION_FIELDS = ("id", "question", "category", "ground_truth")
+
+# Results may carry NumPy values from the vectorized summaries; orjson
+# serializes them natively instead of raising
+RESULTS_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+# Pending Batch API evaluations, keyed by batch ID
+BATCH_STATE_DIR = Path("data/eval_results/batches")
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Parse a JSON file straight from a read-only memory map.
+
+    orjson reads the mapped pages directly, skipping the copy into a
+    buffered-reader bytes object. Files that cannot be mapped (e.g. empty
+    files) are read normally.
+
+    Args:
+        path: JSON file to load
+
+    Returns:
+        Parsed JSON value
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return orjson.loads(f.read())
+
+        with mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+
+def load_test_questions(path: str) -> Dict[str, Any]:
+    """
+    Load a test set and check each question has the required fields.
+
+    Args:
+        path: Test questions JSON file ({"questions": [...], ...})
+
+    Returns:
+        Test set dictionary
+
+    Raises:
+        ValueError: If a question is missing a required field
+    """
+    test_data = load_json(path)
+    for i, test_q in enumerate(test_data["questions"]):
+        missing = [field for field in TEST_QUESTION_FIELDS if field not in test_q]
+        if missing:
+            raise ValueError(f"Test question {test_q.get('id', i)} is missing {', '.join(missing)}")
+    return test_data
+
+
+def summary_path(results_path: str) -> Path:
+    """
+    Get the summary file path for a results file.
+
+    Args:
+        results_path: Path to the full results JSON (e.g. llm_judge_results.json)
+
+    Returns:
+        Sibling path with a .summary.json suffix (e.g. llm_judge_results.summary.json)
+    """
+    path = Path(results_path)
+    return path.with_name(f"{path.stem}.summary.json")
+
+
+def progress_log_path(results_path: str) -> Path:
+    """
+    Get the progress log path for a results file.
+
+    Args:
+        results_path: Path to the full results JSON (e.g. openai_evals_results.json)
+
+    Returns:
+        Sibling path with a .progress.jsonl suffix (e.g. openai_evals_results.progress.jsonl)
+    """
+    path = Path(results_path)
+    return path.with_name(f"{path.stem}.progress.jsonl")
+
+
+def load_progress(path: Optional[Union[str, Path]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the evaluations an interrupted run already logged.
+
+    A last line cut short by the crash is ignored.
+
+    Args:
+        path: Progress log path (None or a missing file yields nothing)
+
+    Returns:
+        Logged evaluations keyed by question_id
+    """
+    completed: Dict[str, Dict[str, Any]] = {}
+    if path is None or not Path(path).exists():
+        return completed
+
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "question_id" in record:
+                completed[record["question_id"]] = record
+    return completed
+
+
+def open_progress_log(path: Optional[Union[str, Path]]) -> ContextManager[Optional[BinaryIO]]:
+    """
+    Open a JSONL log that evaluations are appended to as they complete.
+
+    The log is opened for append, so a resumed run adds to what an
+    interrupted one logged (see load_progress).
+
+    Args:
+        path: Log file path, or None to disable logging
+
+    Returns:
+        Context manager yielding the open binary file (or None)
+    """
+    if path is None:
+        return nullcontext()
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    log = open(path, "ab")
+    # Start on a fresh line after a record the crash cut short
+    if log.tell() > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                log.write(b"\n")
+    return log
+
+
+def log_progress(log: Optional[BinaryIO], record: Dict[str, Any]):
+    """
+    Append one evaluation to a progress log and flush it to disk.
+
+    Args:
+        log: File from open_progress_log (None is a no-op)
+        record: Evaluation result
+    """
+    if log is not None:
+        log.write(
+            orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+        )
+        log.flush()
+
+
+def save_results(results: Dict[str, Any], output_path: str):
+    """
+    Save full evaluation results plus a summary-only companion file.
+
+    Args:
+        results: Results dictionary
+        output_path: Path to save the full results JSON
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(results, option=RESULTS_JSON_OPTIONS))
+
+    summary = {key: results[key] for key in SUMMARY_KEYS if key in results}
+    summary["evaluations"] = [
+        {key: e[key] for key in EVALUATION_KEYS if key in e}
+        for e in results.get("evaluations", [])
+    ]
+    with open(summary_path(output_path), "wb") as f:
+        f.write(orjson.dumps(summary, option=RESULTS_JSON_OPTIONS))
+
+    print(f"\n💾 Results saved to: {output_path}")
+
+
+def load_summary(results_path: str) -> Dict[str, Any]:
+    """
+    Load the summary of a results file without parsing the per-question records.
+
+    Falls back to the full results file when no summary file exists
+    (results saved before summaries were written).
+
+    Args:
+        results_path: Path to the full results JSON
+
+    Returns:
+        Summary dictionary (the "summary" section of the results)
+    """
+    path = summary_path(results_path)
+    if not path.exists():
+        path = Path(results_path)
+
+    return load_json(path).get("summary", {})
+
+
+def load_compact_results(results_path: str) -> Dict[str, Any]:
+    """
+    Load results with only the fields evaluator comparisons use.
+
+    Reads the summary file, which carries the summary section plus each
+    evaluation's category, score and pass flag, instead of the full results
+    with every response and judge rationale. Falls back to the full file for
+    results saved before summaries carried per-evaluation fields.
+
+    Args:
+        results_path: Path to the full results JSON
+
+    Returns:
+        Results dictionary with "summary" and (compact) "evaluations"
+    """
+    path = summary_path(results_path)
+    if path.exists():
+        compact = load_json(path)
+        if "evaluations" in compact:
+            return compact
+
+    return load_json(results_path)
+
+
+def save_batch_state(batch_id: str, state: Dict[str, Any]):
+    """
+    Record what is needed to score a submitted batch once it completes.
+
+    Args:
+        batch_id: OpenAI batch ID
+        state: Test questions, agent responses and output settings
+    """
+    BATCH_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_batch_state_path(batch_id), "wb") as f:
+        f.write(orjson.dumps(state))
+
+
+def load_batch_state(batch_id: str) -> Dict[str, Any]:
+    """
+    Load the state saved for a submitted batch.
+
+    Args:
+        batch_id: OpenAI batch ID
+
+    Returns:
+        State dictionary
+
+    Raises:
+        FileNotFoundError: If no batch with this ID was submitted here
+    """
+    return load_json(_batch_state_path(batch_id))
+
+
+def _batch_state_path(batch_id: str) -> Path:
+    """Path of a batch's state file (batch IDs are untrusted input)."""
+    if not batch_id or Path(batch_id).name != batch_id:
+        raise FileNotFoundError(f"Unknown batch: {batch_id}")
+    return BATCH_STATE_DIR / f"{batch_id}.json"
@@ -1,43 +1,82 @@
 # ABOUTME: Command-line evaluation runner for testing the research agent
 # ABOUTME: Supports both LLM-as-judge and OpenAI Evals, with comparison mode
 
+import asyncio
 import sys
 from pathlib import Path
 import argparse
-import json
 from datetime import datetime
+from typing import Optional
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Run as a script (python src/eval/...): make the repo root importable. Imported
+# as part of the src package (or installed with pip install -e .), it already is.
+if not __package__:
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from src.agent.research_agent import ResearchAgent
+from src.eval import results_io
 from src.eval.test_runner import TestRunner
 from src.eval.openai_evals_runner import OpenAIEvalsRunner
 
 
-def run_llm_judge(test_set_path: str, output_path: str, verbose: bool = True) -> dict:
-    """Run LLM-as-judge evaluation."""
+def run_llm_judge(
+    test_set_path: str,
+    output_path: str,
+    verbose: bool = True,
+    use_cache: bool = True,
+    workers: int = 1,
+    agent: Optional[ResearchAgent] = None,
+) -> dict:
+    """Run LLM-as-judge evaluation (workers > 1 runs that many questions at once)."""
     if verbose:
         print("\n" + "=" * 80)
         print("Running LLM-as-Judge Evaluation")
         print("=" * 80)
 
-    runner = TestRunner(test_set_path)
-    results = runner.run_full_evaluation(output_path=output_path, verbose=verbose)
+    runner = TestRunner(test_set_path, use_judge_cache=use_cache, agent=agent)
+    if workers > 1:
+        results = asyncio.run(
+            runner.run_evaluation_async(
+                output_path=output_path, max_concurrency=workers, verbose=verbose
+            )
+        )
+    else:
+        results = runner.run_full_evaluation(output_path=output_path, verbose=verbose)
 
     return results
 
 
-def run_openai_evals(test_set_path: str, output_path: str, verbose: bool = True) -> dict:
-    """Run OpenAI Evals-style evaluation."""
+def run_openai_evals(
+    test_set_path: str,
+    output_path: str,
+    verbose: bool = True,
+    workers: int = 1,
+    agent: Optional[ResearchAgent] = None,
+) -> dict:
+    """Run OpenAI Evals-style evaluation (workers > 1 runs that many questions at once)."""
     if verbose:
         print("\n" + "=" * 80)
         print("Running OpenAI Evals-Style Evaluation")
         print("=" * 80)
 
-    runner = OpenAIEvalsRunner(test_set_path)
-    results = runner.run_evaluation(verbose=verbose)
+    runner = OpenAIEvalsRunner(test_set_path, agent=agent)
+
+    # Graded questions are logged as they finish, and a rerun after a crash
+    # resumes from the log; it is dropped once the full results are saved
+    progress_path = results_io.progress_log_path(output_path) if output_path else None
+
+    if workers > 1:
+        results = asyncio.run(
+            runner.run_evaluation_async(
+                max_concurrency=workers, verbose=verbose, progress_path=progress_path
+            )
+        )
+    else:
+        results = runner.run_evaluation(verbose=verbose, progress_path=progress_path)
 
     if output_path:
         runner.save_results(results, output_path)
+        progress_path.unlink(missing_ok=True)
 
     return results
 
@@ -47,6 +86,8 @@ def run_both_evaluators(
     llm_judge_output: str,
     evals_output: str,
     verbose: bool = True,
+    use_cache: bool = True,
+    workers: int = 1,
 ):
     """Run both evaluators sequentially."""
     if verbose:
@@ -54,11 +95,15 @@ def run_both_evaluators(
         print("Running Both Evaluators")
         print("=" * 80)
 
+    # One agent (and vector store) serves both evaluators
+    agent = ResearchAgent()
+
     # Run LLM judge
-    llm_results = run_llm_judge(test_set_path, llm_judge_output, verbose)
+    llm_results = run_llm_judge(test_set_path, llm_judge_output, verbose, use_cache, workers, agent)
 
-    # Run OpenAI Evals
-    evals_results = run_openai_evals(test_set_path, evals_output, verbose)
+    # Run OpenAI Evals with a fresh conversation
+    agent.clear_history(keep_system_prompt=True)
+    evals_results = run_openai_evals(test_set_path, evals_output, verbose, workers, agent)
 
     # Quick comparison
     if verbose:
@@ -99,6 +144,9 @@ Examples:
 
   # Custom test set
   python src/eval/run_evaluation.py --test-set custom_tests.json --output results/custom.json
+
+  # Run 8 test questions through the agent at once
+  python src/eval/run_evaluation.py --workers 8
         """,
     )
 
@@ -132,6 +180,19 @@ Examples:
         help="Suppress progress output",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-judge every response instead of reusing cached LLM judge verdicts",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Test questions to run through the agent at once (default: 1)",
+    )
+
     args = parser.parse_args()
 
     # Determine which evaluator(s) to run
@@ -169,13 +230,21 @@ Examples:
                 llm_output,
                 evals_output,
                 verbose=not args.quiet,
+                use_cache=not args.no_cache,
+                workers=args.workers,
             )
 
         elif evaluator == "llm-judge":
-            run_llm_judge(args.test_set, output_path, verbose=not args.quiet)
+            run_llm_judge(
+                args.test_set,
+                output_path,
+                verbose=not args.quiet,
+                use_cache=not args.no_cache,
+                workers=args.workers,
+            )
 
         elif evaluator == "openai-evals":
-            run_openai_evals(args.test_set, output_path, verbose=not args.quiet)
+            run_openai_evals(args.test_set, output_path, verbose=not args.quiet, workers=args.workers)
 
         if not args.quiet:
             print("\n" + "=" * 80)
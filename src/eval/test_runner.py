@@ -1,17 +1,27 @@
 # ABOUTME: Test runner for evaluating the research agent
 # ABOUTME: Runs agent on test questions and coordinates evaluation with LLM judge
 
-import json
 import sys
+import asyncio
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import time
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Run as a script (python src/eval/...): make the repo root importable. Imported
+# as part of the src package (or installed with pip install -e .), it already is.
+if not __package__:
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.agent.research_agent import ResearchAgent
+from src.eval import results_io
 from src.eval.llm_judge import LLMJudge
+from src.eval.concurrency import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_RATE_LIMIT_RPM,
+    PROGRESS_MININTERVAL,
+    gather_bounded,
+)
 from tqdm import tqdm
 
 
@@ -21,22 +31,29 @@ class TestRunner:
     and evaluating the responses.
     """
 
-    def __init__(self, test_questions_path: str):
+    def __init__(
+        self,
+        test_questions_path: str,
+        use_judge_cache: bool = True,
+        agent: Optional[ResearchAgent] = None,
+    ):
         """
         Initialize test runner.
 
         Args:
             test_questions_path: Path to test questions JSON file
+            use_judge_cache: If True, reuse cached judge verdicts for unchanged responses
+            agent: Optional already-built agent to test (created on first use otherwise)
         """
         self.test_questions_path = test_questions_path
+        self.use_judge_cache = use_judge_cache
         self.test_data = self._load_test_questions()
-        self.agent = None
+        self.agent = agent
         self.agent_responses = []
 
     def _load_test_questions(self) -> Dict[str, Any]:
         """Load test questions from JSON file."""
-        with open(self.test_questions_path, "r") as f:
-            return json.load(f)
+        return results_io.load_test_questions(self.test_questions_path)
 
     def run_agent_on_tests(self, verbose: bool = True) -> List[Dict[str, Any]]:
         """
@@ -58,11 +75,21 @@ class TestRunner:
 
         responses = []
 
+        # One timestamp for the run, shared by every response record in it
+        run_timestamp = datetime.now().isoformat()
+
         questions = self.test_data["questions"]
-        iterator = tqdm(questions, desc="Testing agent") if verbose else questions
+        iterator = (
+            tqdm(questions, desc="Testing agent", mininterval=PROGRESS_MININTERVAL, smoothing=0)
+            if verbose
+            else questions
+        )
+
+        # Per-question lines only when there is no progress bar to draw over
+        print_each = verbose and not isinstance(iterator, tqdm)
 
         for test_q in iterator:
-            if verbose and not isinstance(iterator, tqdm):
+            if print_each:
                 print(f"\n📝 {test_q['id']}: {test_q['question']}")
 
             # Record start time
@@ -73,40 +100,23 @@ class TestRunner:
                 self.agent.clear_history(keep_system_prompt=True)
 
                 # Get response
-                response = self.agent.chat(test_q["question"])
+                response = self.agent.chat_sync(test_q["question"])
 
                 # Record end time
                 elapsed_time = time.time() - start_time
 
-                response_data = {
-                    "question_id": test_q["id"],
-                    "question": test_q["question"],
-                    "category": test_q["category"],
-                    "agent_response": response,
-                    "ground_truth": test_q["ground_truth"],
-                    "source_documents": test_q.get("source_documents", []),
-                    "source_pages": test_q.get("source_pages", []),
-                    "response_time_seconds": elapsed_time,
-                    "timestamp": datetime.now().isoformat(),
-                }
-
-                if verbose and not isinstance(iterator, tqdm):
+                response_data = self._agent_record(test_q, response, elapsed_time, run_timestamp)
+
+                if print_each:
                     print(f"✅ Response ({elapsed_time:.2f}s): {response[:150]}...")
 
             except Exception as e:
                 if verbose:
                     print(f"❌ Error: {e}")
 
-                response_data = {
-                    "question_id": test_q["id"],
-                    "question": test_q["question"],
-                    "category": test_q["category"],
-                    "agent_response": "",
-                    "error": str(e),
-                    "ground_truth": test_q["ground_truth"],
-                    "source_documents": test_q.get("source_documents", []),
-                    "timestamp": datetime.now().isoformat(),
-                }
+                response_data = self._agent_record(
+                    test_q, "", time.time() - start_time, run_timestamp, error=e
+                )
 
             responses.append(response_data)
 
@@ -118,6 +128,118 @@ class TestRunner:
 
         return responses
 
+    async def run_agent_on_tests_async(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit_rpm: int = DEFAULT_RATE_LIMIT_RPM,
+        verbose: bool = True,
+        on_response: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the research agent on all test questions concurrently.
+
+        Each question gets its own agent (histories must not mix); all agents
+        share one vector store.
+
+        Args:
+            max_concurrency: Maximum questions in flight (default: 10)
+            rate_limit_rpm: Maximum questions started per minute (default: 60)
+            verbose: If True, print progress
+            on_response: Optional callback receiving (question index, response
+                record) as soon as each question finishes
+
+        Returns:
+            List of dictionaries with question, response, and metadata
+        """
+        questions = self.test_data["questions"]
+
+        if verbose:
+            print(f"\n🤖 Running agent on {len(questions)} test questions "
+                  f"(concurrency={max_concurrency}, rpm={rate_limit_rpm})...")
+            print("=" * 80)
+
+        if not self.agent:
+            self.agent = ResearchAgent()
+
+        # One timestamp for the run, shared by every response record in it
+        run_timestamp = datetime.now().isoformat()
+
+        async def run_question(item: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+            i, test_q = item
+            start_time = time.time()
+            try:
+                agent = ResearchAgent(
+                    model=self.agent.model,
+                    vector_store=self.agent.vector_store,
+                    semantic_cache=self.agent.rag_tool,
+                )
+                response = await agent.chat(test_q["question"])
+                record = self._agent_record(
+                    test_q, response, time.time() - start_time, run_timestamp
+                )
+            except Exception as e:
+                if verbose:
+                    tqdm.write(f"❌ {test_q['id']} error: {e}")
+                record = self._agent_record(
+                    test_q, "", time.time() - start_time, run_timestamp, error=e
+                )
+
+            if on_response is not None:
+                on_response(i, record)
+            return record
+
+        responses = await gather_bounded(
+            list(enumerate(questions)),
+            run_question,
+            max_concurrency,
+            rate_limit_rpm,
+            progress_desc="Testing agent" if verbose else None,
+        )
+        self.agent_responses = responses
+
+        if verbose:
+            print("\n" + "=" * 80)
+            print(f"✅ Agent testing complete: {len(responses)} responses collected")
+
+        return responses
+
+    @staticmethod
+    def _agent_record(
+        test_q: Dict[str, Any],
+        response: str,
+        elapsed_time: float,
+        timestamp: str,
+        error: Optional[Exception] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the result record for one question.
+
+        Answered and failed questions share one schema, so consumers can index
+        every field directly.
+
+        Args:
+            test_q: Test question
+            response: Agent's response ("" if the agent failed)
+            elapsed_time: Seconds until the agent answered or failed
+            timestamp: Run timestamp
+            error: Exception the agent raised, if any
+
+        Returns:
+            Response record (error is None for answered questions)
+        """
+        return {
+            "question_id": test_q["id"],
+            "question": test_q["question"],
+            "category": test_q["category"],
+            "agent_response": response,
+            "error": str(error) if error is not None else None,
+            "ground_truth": test_q["ground_truth"],
+            "source_documents": test_q.get("source_documents", []),
+            "source_pages": test_q.get("source_pages", []),
+            "response_time_seconds": elapsed_time,
+            "timestamp": timestamp,
+        }
+
     def evaluate_with_llm_judge(self, verbose: bool = True) -> Dict[str, Any]:
         """
         Evaluate agent responses using LLM-as-judge.
@@ -135,7 +257,7 @@ class TestRunner:
             print(f"\n⚖️  Evaluating with LLM-as-judge...")
             print("=" * 80)
 
-        judge = LLMJudge()
+        judge = LLMJudge(use_cache=self.use_judge_cache)
 
         # Evaluate each response
         results = judge.evaluate_test_set(
@@ -144,38 +266,110 @@ class TestRunner:
         )
 
         # Merge agent metadata with evaluation results
-        for i, eval_result in enumerate(results["evaluations"]):
-            eval_result["response_time"] = self.agent_responses[i].get("response_time_seconds")
-            if "error" in self.agent_responses[i]:
-                eval_result["agent_error"] = self.agent_responses[i]["error"]
+        self._merge_agent_metadata(results, self.agent_responses)
 
         if verbose:
-            print("\n" + "=" * 80)
-            print("📊 Evaluation Summary:")
-            print(f"   Overall Average: {results['summary']['overall_average']:.2f}/5.0")
-            print(f"   Pass Rate: {results['summary']['pass_rate']*100:.1f}%")
-            print(f"   Total Evaluated: {results['summary']['total_evaluated']}")
-            print("\n   By Category:")
-            for cat, stats in results["summary"]["category_breakdown"].items():
-                print(f"     {cat}: {stats['avg_score']:.2f}/5.0 ({stats['passed']}/{stats['count']} passed)")
+            self._print_judge_summary(results)
 
         return results
 
+    @staticmethod
+    def _print_judge_summary(results: Dict[str, Any]):
+        """Print the headline numbers of LLM judge results."""
+        print("\n" + "=" * 80)
+        print("📊 Evaluation Summary:")
+        print(f"   Overall Average: {results['summary']['overall_average']:.2f}/5.0")
+        print(f"   Pass Rate: {results['summary']['pass_rate']*100:.1f}%")
+        print(f"   Total Evaluated: {results['summary']['total_evaluated']}")
+        print("\n   By Category:")
+        for cat, stats in results["summary"]["category_breakdown"].items():
+            print(f"     {cat}: {stats['avg_score']:.2f}/5.0 ({stats['passed']}/{stats['count']} passed)")
+
+    @staticmethod
+    def _merge_agent_metadata(results: Dict[str, Any], agent_responses: List[Dict[str, Any]]):
+        """Copy response times and agent errors onto the matching evaluations."""
+        for eval_result, record in zip(results["evaluations"], agent_responses):
+            eval_result["response_time"] = record["response_time_seconds"]
+            if record["error"] is not None:
+                eval_result["agent_error"] = record["error"]
+
+    async def submit_batch_evaluation_async(
+        self,
+        output_path: Optional[str] = "data/eval_results/llm_judge_results.json",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit_rpm: int = DEFAULT_RATE_LIMIT_RPM,
+        verbose: bool = True,
+    ) -> str:
+        """
+        Run the agent on all test questions, then submit the judging as a Batch API job.
+
+        The agent turns involve tool calls and must run live; only the single-shot
+        judge requests go through the (cheaper, slower) Batch API.
+
+        Args:
+            output_path: Path to save results once the batch completes (None to skip)
+            max_concurrency: Maximum questions in flight (default: 10)
+            rate_limit_rpm: Maximum questions started per minute (default: 60)
+            verbose: If True, print progress
+
+        Returns:
+            Batch ID to pass to collect_batch_evaluation()
+        """
+        await self.run_agent_on_tests_async(
+            max_concurrency=max_concurrency,
+            rate_limit_rpm=rate_limit_rpm,
+            verbose=verbose,
+        )
+
+        judge = LLMJudge()
+        batch_id = await asyncio.to_thread(
+            judge.submit_batch,
+            self.test_data["questions"],
+            [r["agent_response"] for r in self.agent_responses],
+        )
+
+        results_io.save_batch_state(batch_id, {
+            "test_questions": self.test_data["questions"],
+            "agent_responses": self.agent_responses,
+            "judge_model": judge.model,
+            "output_path": output_path,
+            "submitted_at": time.time(),
+        })
+
+        return batch_id
+
+    @staticmethod
+    def collect_batch_evaluation(batch_id: str) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Check a submitted batch evaluation and finalize it once complete.
+
+        Args:
+            batch_id: ID returned by submit_batch_evaluation_async()
+
+        Returns:
+            (batch status, evaluation results or None if not completed, saved batch state)
+        """
+        state = results_io.load_batch_state(batch_id)
+
+        judge = LLMJudge(model=state["judge_model"])
+        status, results = judge.collect_batch(batch_id, state["test_questions"])
+
+        if results is not None:
+            TestRunner._merge_agent_metadata(results, state["agent_responses"])
+            if state["output_path"]:
+                results_io.save_results(results, state["output_path"])
+
+        return status, results, state
+
     def save_results(self, results: Dict[str, Any], output_path: str):
         """
-        Save evaluation results to JSON file.
+        Save evaluation results to JSON file (plus a *.summary.json companion).
 
         Args:
             results: Results dictionary
             output_path: Path to save JSON file
         """
-        # Ensure directory exists
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
-
-        print(f"\n💾 Results saved to: {output_path}")
+        results_io.save_results(results, output_path)
 
     def run_full_evaluation(
         self,
@@ -203,6 +397,59 @@ class TestRunner:
 
         return results
 
+    async def run_evaluation_async(
+        self,
+        output_path: Optional[str] = "data/eval_results/llm_judge_results.json",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit_rpm: int = DEFAULT_RATE_LIMIT_RPM,
+        verbose: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Async evaluation pipeline: concurrent agent testing + LLM judge evaluation.
+
+        Judging overlaps agent testing: finished responses are queued for the
+        judge, which sends a batch as soon as enough responses are ready.
+
+        Args:
+            output_path: Path to save results (None to skip saving)
+            max_concurrency: Maximum questions in flight (default: 10)
+            rate_limit_rpm: Maximum questions started per minute (default: 60)
+            verbose: If True, print progress
+
+        Returns:
+            Complete evaluation results
+        """
+        questions = self.test_data["questions"]
+        judge = LLMJudge(use_cache=self.use_judge_cache)
+
+        queue: "asyncio.Queue[Tuple[int, Dict[str, Any]]]" = asyncio.Queue()
+        judging = asyncio.create_task(judge.evaluate_stream_async(queue, len(questions)))
+
+        def enqueue(i: int, record: Dict[str, Any]):
+            queue.put_nowait((i, {**questions[i], "agent_response": record["agent_response"]}))
+
+        try:
+            await self.run_agent_on_tests_async(
+                max_concurrency=max_concurrency,
+                rate_limit_rpm=rate_limit_rpm,
+                verbose=verbose,
+                on_response=enqueue,
+            )
+            results = await judging
+        finally:
+            judging.cancel()
+
+        # Merge agent metadata with evaluation results
+        self._merge_agent_metadata(results, self.agent_responses)
+
+        if verbose:
+            self._print_judge_summary(results)
+
+        if output_path:
+            self.save_results(results, output_path)
+
+        return results
+
 
 def main():
     """CLI entry point for test runner."""
@@ -224,6 +471,11 @@ def main():
         action="store_true",
         help="Suppress progress output",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-judge every response instead of reusing cached verdicts",
+    )
 
     args = parser.parse_args()
 
@@ -232,7 +484,7 @@ def main():
     print("=" * 80)
 
     # Run evaluation
-    runner = TestRunner(args.test_set)
+    runner = TestRunner(args.test_set, use_judge_cache=not args.no_cache)
     results = runner.run_full_evaluation(
         output_path=args.output,
         verbose=not args.quiet,
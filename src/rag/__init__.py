@@ -1,6 +1,16 @@
 # ABOUTME: RAG (Retrieval-Augmented Generation) module initialization
 # ABOUTME: Exports vector store and document processing functionality
 
-from .vector_store import VectorStore, DocumentProcessor, ingest_pdfs_to_vectorstore
+from .vector_store import (
+    VectorStore,
+    DocumentProcessor,
+    EmbeddingMismatchError,
+    ingest_pdfs_to_vectorstore,
+)
 
-__all__ = ["VectorStore", "DocumentProcessor", "ingest_pdfs_to_vectorstore"]
+__all__ = [
+    "VectorStore",
+    "DocumentProcessor",
+    "EmbeddingMismatchError",
+    "ingest_pdfs_to_vectorstore",
+]
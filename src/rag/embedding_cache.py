@@ -0,0 +1,126 @@
+# ABOUTME: Persistent cache of text embeddings keyed by embedding model and text
+# ABOUTME: Lets re-ingestion of unchanged chunks and repeated queries skip the embeddings API
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_CACHE_PATH = "data/embedding_cache.db"
+
+# SQLite caps the number of bound parameters per statement
+LOOKUP_CHUNK = 500
+
+
+def embedding_cache_key(text: str, model: str) -> bytes:
+    """
+    Build the cache key for one embedding.
+
+    Args:
+        text: Embedded text
+        model: Embedding model
+
+    Returns:
+        SHA-256 digest of the model and text
+    """
+    return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache storing float32 vectors, safe to share across threads."""
+
+    def __init__(self, db_path: str = EMBEDDING_CACHE_PATH):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            db_path: SQLite file to store embeddings in
+        """
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key BLOB PRIMARY KEY,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def get_many(self, texts: Sequence[str], model: str) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+            model: Embedding model
+
+        Returns:
+            float32 embedding of each text, or None where it is not cached
+        """
+        keys = [embedding_cache_key(text, model) for text in texts]
+        found: Dict[bytes, bytes] = {}
+
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK):
+                chunk = keys[start:start + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                )
+            self.stats["hits"] += sum(key in found for key in keys)
+            self.stats["misses"] += sum(key not in found for key in keys)
+
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def get(self, text: str, model: str) -> Optional[np.ndarray]:
+        """
+        Look up one cached embedding.
+
+        Args:
+            text: Text to look up
+            model: Embedding model
+
+        Returns:
+            float32 embedding vector, or None on a miss
+        """
+        return self.get_many([text], model)[0]
+
+    def put_many(self, texts: Sequence[str], model: str, embeddings: Sequence[Sequence[float]]):
+        """
+        Store embeddings.
+
+        Args:
+            texts: Embedded texts
+            model: Embedding model
+            embeddings: Embedding of each text, parallel to texts
+        """
+        now = time.time()
+        rows = [
+            (embedding_cache_key(text, model), np.asarray(embedding, dtype=np.float32).tobytes(), now)
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def clear(self):
+        """Drop all cached embeddings."""
+        with self._lock:
+            self._db.execute("DELETE FROM embeddings")
+            self._db.commit()
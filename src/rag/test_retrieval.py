@@ -1,23 +1,19 @@
 # ABOUTME: Test script for RAG retrieval and source attribution
 # ABOUTME: Validates vector store queries and citation quality
 
-import sys
-from pathlib import Path
+from src.rag.vector_store import VectorStore
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rag.vector_store import VectorStore
-
-
-def format_results(results: dict, n_results: int = 5) -> None:
-    """Pretty print query results."""
-    print(f"📊 Results found: {len(results['documents'][0])}")
+def format_results(results: dict, n_results: int = 5, query_index: int = 0) -> None:
+    """Pretty print the results of one query (query_index picks it from a batch)."""
+    documents = results["documents"][query_index]
+    print(f"📊 Results found: {len(documents)}")
     print("-" * 80 + "\n")
 
-    for i in range(min(n_results, len(results["documents"][0]))):
-        doc = results["documents"][0][i]
-        distance = results["distances"][0][i]
-        metadata = results["metadatas"][0][i]
+    for i in range(min(n_results, len(documents))):
+        doc = documents[i]
+        distance = results["distances"][query_index][i]
+        metadata = results["metadatas"][query_index][i]
 
         print(f"Result #{i+1}")
         print(f"  📄 Source: {metadata['source']}")
@@ -69,15 +65,16 @@ def test_rag_retrieval():
         },
     ]
 
-    # Run test queries
-    for i, test in enumerate(test_queries, 1):
+    # Run test queries (one embeddings request and one search call for all)
+    results = vector_store.query_batch([test["query"] for test in test_queries], n_results=3)
+
+    for i, test in enumerate(test_queries):
         print("=" * 80)
-        print(f"Test Query {i}/{len(test_queries)}: {test['category']}")
+        print(f"Test Query {i + 1}/{len(test_queries)}: {test['category']}")
         print("=" * 80)
         print(f"Query: \"{test['query']}\"\n")
 
-        results = vector_store.query(test["query"], n_results=3)
-        format_results(results, n_results=3)
+        format_results(results, n_results=3, query_index=i)
 
     # Test source-specific queries
     print("\n" + "=" * 80)
@@ -88,24 +85,18 @@ def test_rag_retrieval():
     query = "What was the market outlook in June 2024?"
     print(f"Query: \"{query}\"\n")
 
-    # Get all results and filter by source
-    results = vector_store.query(query, n_results=5)
-
-    # Filter to show June 2024 results
+    # Filter to the June 2024 report inside the index search
     print("Filtering for June 2024 report...")
-    june_2024_results = [
-        (doc, dist, meta)
-        for doc, dist, meta in zip(
-            results["documents"][0],
-            results["distances"][0],
-            results["metadatas"][0],
-        )
-        if "June_2024" in meta["source"]
-    ]
-
-    if june_2024_results:
-        print(f"Found {len(june_2024_results)} results from June 2024:\n")
-        for i, (doc, dist, meta) in enumerate(june_2024_results[:3], 1):
+    results = vector_store.query(
+        query, n_results=3, where={"source": {"$eq": "UBS_House_View_June_2024"}}
+    )
+
+    documents = results["documents"][0]
+    if documents:
+        print(f"Found {len(documents)} results from June 2024:\n")
+        for i, (doc, dist, meta) in enumerate(
+            zip(documents, results["distances"][0], results["metadatas"][0]), 1
+        ):
             print(f"Result #{i}")
             print(f"  📄 Source: {meta['source']}")
             print(f"  📖 Page: {meta['page']}")
@@ -2,18 +2,288 @@
 # ABOUTME: Handles document embedding, storage, and retrieval for RAG pipeline
 
 import os
-from typing import List, Dict, Any, Optional
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyMuPDFLoader
 from dotenv import load_dotenv
 
+try:
+    from .embedding_cache import EmbeddingCache
+except ImportError:  # run as a script (python src/rag/vector_store.py)
+    from embedding_cache import EmbeddingCache
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Query embedding micro-batching: how long the first caller waits for
+# concurrent requests, and the most texts sent in one embeddings call
+BATCH_WINDOW_MS = 5
+MAX_BATCH = 64
+
+# Ingestion: texts per embeddings API call, and records per collection.add
+# call (keeps each Chroma write to a moderately sized SQLite transaction)
+EMBED_BATCH_SIZE = 200
+ADD_BATCH_SIZE = 250
+
+# Ingestion embeddings calls in flight at once (each is latency-bound)
+EMBED_CONCURRENCY = 8
+
+# Page cache hints are only available on Linux (and some other POSIX systems)
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+# MMR reranking: candidates fetched per requested result, and what to fetch
+MMR_FETCH_MULTIPLIER = 3
+MMR_INCLUDE = ["documents", "metadatas", "distances", "embeddings"]
+
+# Default MMR weight for the agent's RAG tool (mostly relevance, enough
+# diversity to skip near-duplicate chunks of the same page)
+MMR_LAMBDA = 0.7
+
+# Chroma's own SQLite database inside the persist directory
+CHROMA_SQLITE_FILE = "chroma.sqlite3"
+
+# Cap on the collection segments Chroma keeps loaded in memory; least recently
+# used segments are unloaded beyond it (only matters with many collections)
+CHROMA_MEMORY_LIMIT_BYTES = int(os.getenv("CHROMA_MEMORY_LIMIT_BYTES", 2 * 1024**3))
+
+# PDF chunking, in tokens of the embedding models' tokenizer (about the size of
+# the earlier 1000/200-character chunks)
+CHUNK_ENCODING = "cl100k_base"
+CHUNK_TOKENS = 256
+CHUNK_OVERLAP_TOKENS = 50
+
+# Report dates parsed from file names (e.g. UBS_House_View_June_2024,
+# FOMC_Minutes_2024_Jun) into integer metadata for range filters such as
+# where={"year_month": {"$gte": 202401, "$lte": 202406}}
+REPORT_YEAR_RE = re.compile(r"(?<![0-9])(20[0-9]{2})(?![0-9])")
+REPORT_MONTH_RE = re.compile(r"(?<![a-z])([a-z]{3,9})(?![a-z])")
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("january", "jan"), ("february", "feb"), ("march", "mar"),
+            ("april", "apr"), ("may",), ("june", "jun"),
+            ("july", "jul"), ("august", "aug"), ("september", "sep", "sept"),
+            ("october", "oct"), ("november", "nov"), ("december", "dec"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+# Default encoder, matching the shipped index (text-embedding-3-large at its
+# full 3072 dimensions). Override with OPENAI_EMBEDDING_MODEL /
+# OPENAI_EMBEDDING_DIMS (0 = the model's full size); e.g. text-embedding-3-small
+# at 768 dimensions is about a fifth of the cost with 4x smaller vectors, but
+# the collection then has to be rebuilt (ingest_reports.py --rebuild).
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-large"
+DEFAULT_EMBEDDING_DIMS = 0
+
+# HNSW index settings for new collections. Cosine space makes the tool's
+# "1 - distance" relevance score a cosine similarity; search_ef 64 is ample
+# for the RAG tool's top-5 queries. Chroma fixes space, M and construction_ef
+# when a collection is created, so changing them needs reset_and_reingest.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": int(os.getenv("CHROMA_HNSW_M", 32)),
+    "hnsw:construction_ef": int(os.getenv("CHROMA_HNSW_CONSTRUCTION_EF", 200)),
+    "hnsw:search_ef": int(os.getenv("CHROMA_HNSW_SEARCH_EF", 64)),
+    "hnsw:num_threads": os.cpu_count() or 1,
+}
+
+
+def mmr_select(
+    query_embedding: List[float],
+    candidate_embeddings: Any,
+    k: int,
+    lambda_mult: float,
+) -> List[int]:
+    """
+    Pick k diverse, relevant candidates by maximal marginal relevance.
+
+    All similarities are computed up front as float32 matrix products; the
+    selection loop runs k times and only updates a running max-similarity
+    vector, never looping over candidates in Python.
+
+    Args:
+        query_embedding: Query vector
+        candidate_embeddings: (n, D) candidate vectors
+        k: Number of candidates to select
+        lambda_mult: Weight of relevance vs. dissimilarity to already selected
+                     candidates (1.0 = plain relevance ranking)
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    embeddings = np.asarray(candidate_embeddings, dtype=np.float32)
+    query = np.asarray(query_embedding, dtype=np.float32)
+
+    # Cosine similarities regardless of the collection's distance space
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.where(norms > 0, norms, 1.0)
+    query = query / (np.linalg.norm(query) or 1.0)
+
+    relevance = embeddings @ query
+    pairwise = embeddings @ embeddings.T
+
+    k = min(k, len(embeddings))
+    if k <= 0:
+        return []
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    max_similarity = pairwise[first].copy()
+    available = np.ones(len(embeddings), dtype=bool)
+    available[first] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, pairwise[best], out=max_similarity)
+
+    return selected
+
+
+def _rerank_mmr(
+    candidates: Dict[str, Any],
+    query_embedding: List[float],
+    n_results: int,
+    lambda_mult: float,
+) -> Dict[str, Any]:
+    """Reduce a single-query Chroma result to its n_results MMR picks (embeddings dropped)."""
+    if not candidates["ids"] or not candidates["ids"][0]:
+        return candidates
+
+    order = mmr_select(query_embedding, candidates["embeddings"][0], n_results, lambda_mult)
+    return {
+        key: [[candidates[key][0][i] for i in order]]
+        for key in ("ids", "documents", "metadatas", "distances")
+    }
+
+
+def _enable_wal(db_path: Path) -> None:
+    """
+    Switch an existing Chroma SQLite database to write-ahead logging.
+
+    WAL lets readers run alongside the ingestion writer and turns each
+    commit into an append instead of a rollback-journal rewrite. The mode is
+    stored in the database file, so it also applies to Chroma's own
+    connections. Only the ingestion path calls this (via
+    VectorStore.enable_wal), so merely opening the store for queries never
+    rewrites the database file.
+
+    Args:
+        db_path: Path of chroma.sqlite3
+    """
+    if not db_path.exists():
+        return
+    try:
+        with sqlite3.connect(db_path) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+        db.close()
+    except sqlite3.Error as e:
+        logger.debug("Could not enable WAL on %s: %s", db_path, e)
+
+
+class EmbeddingMismatchError(RuntimeError):
+    """Raised when a collection is used with a different encoder than the one that built it."""
+
+
+class EmbeddingBatcher:
+    """
+    Thread-safe micro-batcher in front of a list-of-strings embedding function.
+
+    The first caller to arrive becomes the leader: it waits up to the batch
+    window (or until MAX_BATCH requests are queued), then embeds every queued
+    text and resolves each caller's future with its own vector.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch: int = MAX_BATCH,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            embed_fn: Function embedding a list of texts into plain lists of floats
+            window_ms: How long the leader waits for more requests (default: 5)
+            max_batch: Maximum texts per embedding request (default: 64)
+        """
+        self.embed_fn = embed_fn
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[str, Future]] = []
+        self._collecting = False
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed a single text, sharing the API call with concurrent callers.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        future: Future = Future()
+
+        with self._cond:
+            self._pending.append((text, future))
+            leader = not self._collecting
+            if leader:
+                self._collecting = True
+            elif len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+        if leader:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.max_batch,
+                    timeout=self.window_seconds,
+                )
+                batch, self._pending = self._pending, []
+                self._collecting = False
+
+            for start in range(0, len(batch), self.max_batch):
+                self._embed_batch(batch[start:start + self.max_batch])
+
+        return future.result()
+
+    def _embed_batch(self, batch: List[Tuple[str, Future]]):
+        """Embed one batch and resolve its futures."""
+        try:
+            embeddings = self.embed_fn([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            future.set_result(embedding)
+
 
 class VectorStore:
     """Manages the ChromaDB vector store for UBS House View reports and SEC filings."""
@@ -22,6 +292,8 @@ class VectorStore:
         self,
         persist_directory: Optional[str] = None,
         collection_name: str = "investment_research",
+        use_embedding_cache: bool = True,
+        warmup: bool = False,
     ):
         """
         Initialize the vector store.
@@ -29,6 +301,10 @@ class VectorStore:
         Args:
             persist_directory: Directory to persist ChromaDB data
             collection_name: Name of the ChromaDB collection
+            use_embedding_cache: If True, reuse stored embeddings of previously
+                                 embedded chunks and queries
+            warmup: If True, call start_warmup() once the collection is open
+                    (long-running servers only; it makes a paid embeddings call)
         """
         self.persist_directory = persist_directory or os.getenv(
             "CHROMA_PERSIST_DIR", "./data/chroma_db"
@@ -37,37 +313,148 @@ class VectorStore:
 
         self.collection_name = collection_name
 
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True,
-            ),
-        )
+        # Initialize ChromaDB client: a Chroma server when CHROMA_HOST is set
+        # (which also lets aquery use Chroma's async client), else local files
+        self.chroma_host = os.getenv("CHROMA_HOST")
+        self.chroma_port = int(os.getenv("CHROMA_PORT", 8000))
+        if self.chroma_host:
+            self.client = chromadb.HttpClient(
+                host=self.chroma_host,
+                port=self.chroma_port,
+                settings=Settings(anonymized_telemetry=False, allow_reset=True),
+            )
+        else:
+            self.client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True,
+                    chroma_segment_cache_policy="LRU",
+                    chroma_memory_limit_bytes=CHROMA_MEMORY_LIMIT_BYTES,
+                ),
+            )
+
+        # Async server collection for aquery, opened on first use
+        self._async_collection = None
 
         # Set up OpenAI embedding function
+        self.embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        self.embedding_dims = int(os.getenv("OPENAI_EMBEDDING_DIMS", DEFAULT_EMBEDDING_DIMS))
         self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(
             api_key=os.getenv("OPENAI_API_KEY"),
-            model_name=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-large"),
+            model_name=self.embedding_model,
+            dimensions=self.embedding_dims or None,
+        )
+        self.embedding_cache = EmbeddingCache() if use_embedding_cache else None
+
+        # Cached vectors are only reusable for the same model and size
+        self._cache_model = (
+            f"{self.embedding_model}@{self.embedding_dims}"
+            if self.embedding_dims
+            else self.embedding_model
         )
 
+        # Concurrent query embeddings share one embeddings API call
+        self.embedding_batcher = EmbeddingBatcher(self._embed_queries)
+
+        # Caches of query results (anything with a clear() method) emptied
+        # whenever the collection changes; held weakly so they die with their owner
+        self._result_caches: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
             embedding_function=self.embedding_function,
-            metadata={"description": "Investment research documents and reports"},
+            metadata=self._collection_metadata(),
         )
 
-        print(f"✅ ChromaDB initialized at: {self.persist_directory}")
-        print(f"✅ Collection '{self.collection_name}' ready")
-        print(f"   Documents in collection: {self.collection.count()}")
+        # A collection built with another encoder can't be queried with this
+        # one; it has to be rebuilt (see reset_and_reingest). Collections
+        # created before the encoder was recorded used text-embedding-3-large.
+        stored = self.collection.metadata or {}
+        stored_model = stored.get("embedding_model", "text-embedding-3-large")
+        stored_dims = stored.get("embedding_dims", 0)
+        self.embedding_mismatch = self.collection.count() > 0 and (
+            (stored_model, stored_dims) != (self.embedding_model, self.embedding_dims)
+        )
+        self._mismatch_message = (
+            f"Collection '{self.collection_name}' was embedded with {stored_model} "
+            f"({stored_dims or 'full'} dims), not {self.embedding_model} "
+            f"({self.embedding_dims or 'full'} dims); set OPENAI_EMBEDDING_MODEL / "
+            "OPENAI_EMBEDDING_DIMS to match it or rebuild it with "
+            "'python -m src.data.ingest_reports --rebuild'"
+        )
+        if self.embedding_mismatch:
+            logger.error("❌ %s", self._mismatch_message)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "✅ ChromaDB collection '%s' ready at %s (%d documents)",
+                self.collection_name,
+                self.persist_directory,
+                self.collection.count(),
+            )
+
+        if warmup:
+            self.start_warmup()
+
+    def start_warmup(self) -> bool:
+        """
+        Load the index and open the embeddings connection in the background.
+
+        Meant for server startup, so the first real query isn't slowed down.
+        Skipped when there is nothing to search, the encoder doesn't match the
+        collection, or no OpenAI API key is set (the warmup embeds a probe text).
+
+        Returns:
+            True if the warmup thread was started
+        """
+        if (
+            self.embedding_mismatch
+            or not os.getenv("OPENAI_API_KEY")
+            or self.collection.count() == 0
+        ):
+            return False
+        threading.Thread(target=self._warmup, name="vector-store-warmup", daemon=True).start()
+        return True
+
+    def _warmup(self) -> None:
+        """Pre-load the index files and open the embeddings API connection."""
+        try:
+            if HAS_FADVISE and not self.chroma_host:
+                # Ask the kernel to start reading the SQLite and HNSW files now
+                for path in Path(self.persist_directory).rglob("*"):
+                    if path.is_file():
+                        fd = os.open(path, os.O_RDONLY)
+                        try:
+                            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                        finally:
+                            os.close(fd)
+
+            # A real (uncached) embeddings call sets up the HTTPS connection, and
+            # a one-result search pulls the HNSW graph into memory
+            embedding = self.embedding_function(["warmup"])[0]
+            self.collection.query(query_embeddings=[list(embedding)], n_results=1)
+            logger.debug("🔥 Vector store warmed up")
+        except Exception as e:
+            logger.debug("Vector store warmup failed: %s", e)
+
+    def _check_encoder(self) -> None:
+        """
+        Refuse to search or extend a collection built with another encoder.
+
+        Raises:
+            EmbeddingMismatchError: If the collection's encoder differs from this one
+        """
+        if self.embedding_mismatch:
+            raise EmbeddingMismatchError(self._mismatch_message)
 
     def add_documents(
         self,
         documents: List[str],
         metadatas: List[Dict[str, Any]],
         ids: List[str],
+        embeddings: Optional[np.ndarray] = None,
     ) -> None:
         """
         Add documents to the vector store.
@@ -76,19 +463,139 @@ class VectorStore:
             documents: List of document texts
             metadatas: List of metadata dictionaries
             ids: List of unique document IDs
+            embeddings: Optional precomputed (N, D) embeddings of the documents
+                        (computed with embed_documents when omitted)
+
+        Raises:
+            EmbeddingMismatchError: If the collection was built with another encoder
         """
-        self.collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids,
-        )
-        print(f"✅ Added {len(documents)} documents to collection")
+        self._check_encoder()
+        if embeddings is None:
+            embeddings = self.embed_documents(documents)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        for start in range(0, len(documents), ADD_BATCH_SIZE):
+            end = start + ADD_BATCH_SIZE
+            self.collection.add(
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end],
+                # Chroma takes lists; only one slice is ever expanded at a time
+                embeddings=embeddings[start:end].tolist(),
+            )
+        self._invalidate_result_caches()
+        logger.info("✅ Added %d documents to collection", len(documents))
+
+    def embed_documents(
+        self,
+        documents: List[str],
+        batch_size: int = EMBED_BATCH_SIZE,
+        concurrency: int = EMBED_CONCURRENCY,
+    ) -> np.ndarray:
+        """
+        Embed document texts with the collection's embedding function.
+
+        Texts are sent in fixed-size batches, one embeddings API call each,
+        with up to `concurrency` calls in flight at once.
+
+        Args:
+            documents: List of document texts
+            batch_size: Texts per embeddings API call (default: 200)
+            concurrency: Maximum concurrent embeddings calls (default: 8)
+
+        Returns:
+            (N, D) float32 array with the embedding of each document, in order
+        """
+        if not documents:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if self.embedding_cache is None:
+            embeddings: List[Optional[np.ndarray]] = [None] * len(documents)
+        else:
+            embeddings = self.embedding_cache.get_many(documents, self._cache_model)
+
+        # Only texts without a cached embedding go to the API
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        batches = [
+            missing[start : start + batch_size] for start in range(0, len(missing), batch_size)
+        ]
+        if batches:
+            fresh_batches = asyncio.run(
+                self._embed_batches_async(
+                    [[documents[i] for i in batch] for batch in batches], concurrency
+                )
+            )
+            for batch, fresh in zip(batches, fresh_batches):
+                for i, embedding in zip(batch, fresh):
+                    embeddings[i] = embedding
+
+        if self.embedding_cache is not None and len(missing) < len(documents):
+            logger.info("♻️  Reused %d cached embeddings", len(documents) - len(missing))
+
+        # Packed float32 rather than lists of Python floats (~7x smaller)
+        return np.vstack(embeddings)
+
+    async def _embed_batches_async(
+        self, batches: List[List[str]], concurrency: int
+    ) -> List[np.ndarray]:
+        """
+        Embed several batches of texts concurrently.
+
+        Each batch is one call to the (blocking) embedding function on a worker
+        thread, so documents and queries keep going through the same encoder.
+
+        Args:
+            batches: Batches of texts, one embeddings API call each
+            concurrency: Maximum batches in flight
+
+        Returns:
+            (n, D) float32 embeddings of each batch, in the same order as batches
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def embed_batch(texts: List[str]) -> np.ndarray:
+            async with semaphore:
+                return await asyncio.to_thread(self._embed_and_cache, texts)
+
+        return await asyncio.gather(*(embed_batch(texts) for texts in batches))
+
+    def _embed_and_cache(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in one API call into an (n, D) float32 array and cache the vectors."""
+        embeddings = np.asarray(self.embedding_function(texts), dtype=np.float32)
+        if self.embedding_cache is not None:
+            self.embedding_cache.put_many(texts, self._cache_model, embeddings)
+        return embeddings
+
+    def _embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed a micro-batch of queries (the batcher hands out plain lists)."""
+        return self._embed_and_cache(texts).tolist()
+
+    def embed_query(self, query_text: str) -> List[float]:
+        """
+        Embed a single query with the collection's embedding function.
+
+        Previously embedded queries are served from the embedding cache;
+        concurrent callers are batched into a single embeddings request.
+
+        Args:
+            query_text: Query string
+
+        Returns:
+            Query embedding vector
+        """
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get(query_text, self._cache_model)
+            if cached is not None:
+                return cached.tolist()
+        return self.embedding_batcher.embed(query_text)
 
     def query(
         self,
         query_text: str,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        mmr_lambda: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Query the vector store.
@@ -97,16 +604,137 @@ class VectorStore:
             query_text: Query string
             n_results: Number of results to return
             where: Optional metadata filter
+            query_embedding: Optional precomputed embedding of query_text,
+                             skips re-embedding the query when provided
+            mmr_lambda: If set, rerank MMR_FETCH_MULTIPLIER x n_results candidates
+                        with maximal marginal relevance (1.0 = pure relevance,
+                        lower values favour diverse results)
 
         Returns:
             Query results with documents, distances, and metadata
+
+        Raises:
+            EmbeddingMismatchError: If the collection was built with another encoder
         """
-        results = self.collection.query(
-            query_texts=[query_text],
+        self._check_encoder()
+        if query_embedding is None:
+            query_embedding = self.embed_query(query_text)
+
+        if mmr_lambda is None:
+            return self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=where,
+            )
+
+        candidates = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results * MMR_FETCH_MULTIPLIER,
+            where=where,
+            include=MMR_INCLUDE,
+        )
+        return _rerank_mmr(candidates, query_embedding, n_results, mmr_lambda)
+
+    def query_batch(
+        self,
+        query_texts: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query the vector store with several queries at once.
+
+        Uncached queries are embedded in a single embeddings request and all
+        searches run in one collection.query call.
+
+        Args:
+            query_texts: Query strings
+            n_results: Number of results to return per query
+            where: Optional metadata filter applied to every query
+
+        Returns:
+            Query results with one list of documents, distances and metadata
+            per query, in the same order as query_texts
+
+        Raises:
+            EmbeddingMismatchError: If the collection was built with another encoder
+        """
+        self._check_encoder()
+        if self.embedding_cache is None:
+            embeddings: List[Optional[np.ndarray]] = [None] * len(query_texts)
+        else:
+            embeddings = self.embedding_cache.get_many(query_texts, self._cache_model)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = self._embed_and_cache([query_texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+
+        return self.collection.query(
+            query_embeddings=np.vstack(embeddings).tolist(),
             n_results=n_results,
             where=where,
         )
-        return results
+
+    async def aquery(
+        self,
+        query_text: str,
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        mmr_lambda: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query the vector store without blocking the event loop.
+
+        Against a Chroma server (CHROMA_HOST) the search goes through Chroma's
+        async HTTP client; the local persistent client is synchronous, so
+        query() runs on a worker thread instead. The async client is bound to
+        the event loop that first calls this.
+
+        Args:
+            query_text: Query string
+            n_results: Number of results to return
+            where: Optional metadata filter
+            query_embedding: Optional precomputed embedding of query_text
+            mmr_lambda: If set, rerank the results with maximal marginal relevance
+
+        Returns:
+            Query results with documents, distances, and metadata
+
+        Raises:
+            EmbeddingMismatchError: If the collection was built with another encoder
+        """
+        self._check_encoder()
+        if not self.chroma_host:
+            return await asyncio.to_thread(
+                self.query, query_text, n_results, where, query_embedding, mmr_lambda
+            )
+
+        if query_embedding is None:
+            query_embedding = await asyncio.to_thread(self.embed_query, query_text)
+
+        if self._async_collection is None:
+            client = await chromadb.AsyncHttpClient(host=self.chroma_host, port=self.chroma_port)
+            self._async_collection = await client.get_collection(
+                name=self.collection_name, embedding_function=self.embedding_function
+            )
+
+        if mmr_lambda is None:
+            return await self._async_collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=where,
+            )
+
+        candidates = await self._async_collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results * MMR_FETCH_MULTIPLIER,
+            where=where,
+            include=MMR_INCLUDE,
+        )
+        return _rerank_mmr(candidates, query_embedding, n_results, mmr_lambda)
 
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection."""
@@ -122,9 +750,40 @@ class VectorStore:
         self.collection = self.client.create_collection(
             name=self.collection_name,
             embedding_function=self.embedding_function,
-            metadata={"description": "Investment research documents and reports"},
+            metadata=self._collection_metadata(),
         )
-        print(f"✅ Collection '{self.collection_name}' reset")
+        self.embedding_mismatch = False
+        self._async_collection = None
+        self._invalidate_result_caches()
+        logger.info("✅ Collection '%s' reset", self.collection_name)
+
+    def _collection_metadata(self) -> Dict[str, Any]:
+        """Metadata for a new collection: its encoder and HNSW index settings."""
+        return {
+            "description": "Investment research documents and reports",
+            "embedding_model": self.embedding_model,
+            "embedding_dims": self.embedding_dims,
+            **HNSW_METADATA,
+        }
+
+    def enable_wal(self) -> None:
+        """Switch a local store to write-ahead logging before a bulk write (no-op for a server)."""
+        if not self.chroma_host:
+            _enable_wal(Path(self.persist_directory) / CHROMA_SQLITE_FILE)
+
+    def register_result_cache(self, cache: Any) -> None:
+        """
+        Have a cache of query results cleared whenever the collection changes.
+
+        Args:
+            cache: Object with a clear() method (e.g. a SemanticCache)
+        """
+        self._result_caches.add(cache)
+
+    def _invalidate_result_caches(self) -> None:
+        """Clear every registered query result cache."""
+        for cache in list(self._result_caches):
+            cache.clear()
 
 
 class DocumentProcessor:
@@ -132,34 +791,51 @@ class DocumentProcessor:
 
     def __init__(
         self,
-        chunk_size: int = 1000,
-        chunk_overlap: int = 200,
+        chunk_size: int = CHUNK_TOKENS,
+        chunk_overlap: int = CHUNK_OVERLAP_TOKENS,
     ):
         """
         Initialize the document processor.
 
+        Chunks are measured in tokens of the embedding models' tokenizer, so a
+        chunk's size is what the embeddings API actually bills and limits,
+        while splits still fall on paragraph, line and sentence boundaries.
+
         Args:
-            chunk_size: Size of text chunks
-            chunk_overlap: Overlap between chunks
+            chunk_size: Size of text chunks in tokens
+            chunk_overlap: Overlap between chunks in tokens
         """
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            encoding_name=CHUNK_ENCODING,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            length_function=len,
             separators=["\n\n", "\n", ". ", " ", ""],
         )
 
-    def load_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def __getstate__(self) -> Dict[str, int]:
+        """Pickle only the settings (the tiktoken length function can't be pickled)."""
+        return {"chunk_size": self.chunk_size, "chunk_overlap": self.chunk_overlap}
+
+    def __setstate__(self, state: Dict[str, int]):
+        """Rebuild the splitter in the unpickling (worker) process."""
+        self.__init__(**state)
+
+    def load_pdf(self, pdf_path: str) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
         """
         Load and process a PDF file.
 
+        Chunks come back as parallel lists, the shape add_documents takes,
+        rather than one dict per chunk.
+
         Args:
             pdf_path: Path to PDF file
 
         Returns:
-            List of document chunks with metadata
+            Tuple of (chunk IDs, chunk texts, chunk metadata dictionaries)
         """
-        print(f"📄 Loading PDF: {pdf_path}")
+        logger.info("📄 Loading PDF: %s", pdf_path)
 
         # Load PDF
         loader = PyMuPDFLoader(pdf_path)
@@ -168,32 +844,35 @@ class DocumentProcessor:
         # Extract metadata
         pdf_name = Path(pdf_path).stem
         source_type = self._infer_source_type(pdf_name)
+        report_date = self._parse_report_date(pdf_name)
 
         # Split into chunks
-        chunks = []
+        ids: List[str] = []
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
         for page_num, page in enumerate(pages):
             page_chunks = self.text_splitter.split_text(page.page_content)
 
             for chunk_num, chunk_text in enumerate(page_chunks):
-                chunk_id = f"{pdf_name}_page{page_num}_chunk{chunk_num}"
-                chunks.append(
+                ids.append(f"{pdf_name}_page{page_num}_chunk{chunk_num}")
+                texts.append(chunk_text)
+                metadatas.append(
                     {
-                        "id": chunk_id,
-                        "text": chunk_text,
-                        "metadata": {
-                            "source": pdf_name,
-                            "source_type": source_type,
-                            "page": page_num,
-                            "chunk": chunk_num,
-                            "file_path": pdf_path,
-                        },
+                        "source": pdf_name,
+                        "source_type": source_type,
+                        "page": page_num,
+                        "chunk": chunk_num,
+                        "file_path": pdf_path,
+                        **report_date,
                     }
                 )
 
-        print(f"✅ Processed {len(pages)} pages into {len(chunks)} chunks")
-        return chunks
+        logger.info("✅ Processed %d pages into %d chunks", len(pages), len(ids))
+        return ids, texts, metadatas
 
-    def _infer_source_type(self, filename: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _infer_source_type(filename: str) -> str:
         """Infer the type of document from filename."""
         filename_lower = filename.lower()
 
@@ -206,19 +885,69 @@ class DocumentProcessor:
         else:
             return "unknown"
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse_report_date(filename: str) -> Dict[str, int]:
+        """
+        Parse a report's publication date from its filename.
+
+        Args:
+            filename: PDF file name without extension
+
+        Returns:
+            year, month and year_month (YYYYMM) as integers; only year when the
+            name has no month, and nothing when it has no year (Chroma metadata
+            values can't be None)
+        """
+        filename_lower = filename.lower().replace("_", " ")
+        year_match = REPORT_YEAR_RE.search(filename_lower)
+        if year_match is None:
+            return {}
+
+        year = int(year_match.group(1))
+        for word in REPORT_MONTH_RE.findall(filename_lower):
+            month = MONTHS.get(word)
+            if month is not None:
+                return {"year": year, "month": month, "year_month": year * 100 + month}
+        return {"year": year}
+
+
+def _load_pdf_worker(
+    processor: DocumentProcessor, pdf_path: str
+) -> Tuple[Optional[Tuple[List[str], List[str], List[Dict[str, Any]]]], Optional[str]]:
+    """
+    Load and chunk one PDF in a worker process.
+
+    Args:
+        processor: DocumentProcessor instance (pickled into the worker)
+        pdf_path: Path to PDF file
+
+    Returns:
+        ((ids, texts, metadatas), None) on success, (None, error message) on failure
+    """
+    try:
+        return processor.load_pdf(pdf_path), None
+    except Exception as e:
+        return None, str(e)
+
 
 def ingest_pdfs_to_vectorstore(
     pdf_directory: str,
     vector_store: VectorStore,
     processor: DocumentProcessor,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Ingest all PDFs from a directory into the vector store.
 
+    PDFs are loaded and split in parallel worker processes; embedding and
+    writing to the collection stay in this process.
+
     Args:
         pdf_directory: Directory containing PDF files
         vector_store: VectorStore instance
         processor: DocumentProcessor instance
+        max_workers: Maximum worker processes (default: one per CPU)
 
     Returns:
         Ingestion statistics
@@ -227,30 +956,40 @@ def ingest_pdfs_to_vectorstore(
     pdf_files = list(pdf_dir.glob("*.pdf"))
 
     if not pdf_files:
-        print(f"⚠️  No PDF files found in {pdf_directory}")
+        logger.warning("⚠️  No PDF files found in %s", pdf_directory)
         return {"total_files": 0, "total_chunks": 0}
 
-    print(f"\n🚀 Starting ingestion of {len(pdf_files)} PDF files...")
+    logger.info("\n🚀 Starting ingestion of %d PDF files...", len(pdf_files))
+
+    # Ingestion writes the database anyway; WAL keeps its commits cheap
+    vector_store.enable_wal()
 
     all_documents = []
     all_metadatas = []
     all_ids = []
 
-    for pdf_file in pdf_files:
-        try:
-            chunks = processor.load_pdf(str(pdf_file))
+    workers = min(len(pdf_files), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            partial(_load_pdf_worker, processor), [str(pdf_file) for pdf_file in pdf_files]
+        )
 
-            for chunk in chunks:
-                all_documents.append(chunk["text"])
-                all_metadatas.append(chunk["metadata"])
-                all_ids.append(chunk["id"])
+        for pdf_file, (chunks, error) in zip(pdf_files, results):
+            if error is not None:
+                logger.error("❌ Error processing %s: %s", pdf_file.name, error)
+                continue
 
-        except Exception as e:
-            print(f"❌ Error processing {pdf_file.name}: {e}")
-            continue
+            ids, texts, metadatas = chunks
+            all_ids.extend(ids)
+            all_documents.extend(texts)
+            all_metadatas.extend(metadatas)
 
     if all_documents:
-        vector_store.add_documents(all_documents, all_metadatas, all_ids)
+        # Embed every chunk up front in explicit batches, so the collection
+        # writes below don't trigger Chroma's own per-add embedding calls
+        logger.info("\n🔢 Embedding %d chunks...", len(all_documents))
+        all_embeddings = vector_store.embed_documents(all_documents)
+        vector_store.add_documents(all_documents, all_metadatas, all_ids, embeddings=all_embeddings)
 
     stats = {
         "total_files": len(pdf_files),
@@ -258,15 +997,38 @@ def ingest_pdfs_to_vectorstore(
         "collection_stats": vector_store.get_collection_stats(),
     }
 
-    print(f"\n✅ Ingestion complete!")
-    print(f"   Files processed: {stats['total_files']}")
-    print(f"   Total chunks: {stats['total_chunks']}")
+    logger.info(
+        "\n✅ Ingestion complete!\n   Files processed: %d\n   Total chunks: %d",
+        stats["total_files"],
+        stats["total_chunks"],
+    )
 
     return stats
 
 
+def reset_and_reingest(
+    pdf_directory: str,
+    vector_store: VectorStore,
+    processor: DocumentProcessor,
+) -> Dict[str, Any]:
+    """
+    Rebuild the collection from scratch, e.g. after changing the embedding model.
+
+    Args:
+        pdf_directory: Directory containing PDF files
+        vector_store: VectorStore instance
+        processor: DocumentProcessor instance
+
+    Returns:
+        Ingestion statistics
+    """
+    vector_store.reset_collection()
+    return ingest_pdfs_to_vectorstore(pdf_directory, vector_store, processor)
+
+
 if __name__ == "__main__":
     # Test the vector store setup
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🧪 Testing ChromaDB setup...")
 
     vector_store = VectorStore()
@@ -1,14 +1,15 @@
 # ABOUTME: RAG retrieval tool for querying UBS House View reports and SEC filings
 # ABOUTME: Wraps VectorStore queries for AutoGen agent function calling
 
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
-import sys
-from pathlib import Path
+import logging
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.rag.vector_store import MMR_LAMBDA, VectorStore
 
-from src.rag.vector_store import VectorStore
+logger = logging.getLogger(__name__)
+
+SEARCH_ERROR_PREFIX = "Error searching research database"
 
 
 class RAGRetrieval:
@@ -32,6 +33,7 @@ class RAGRetrieval:
         query: str,
         n_results: int = 5,
         source_filter: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> str:
         """
         Search UBS House View reports and SEC filings for investment research insights.
@@ -53,6 +55,7 @@ class RAGRetrieval:
             n_results: Number of relevant document chunks to return (default: 5)
             source_filter: Optional filter to search only specific sources.
                           Examples: "ubs_house_view", "sec_10k"
+            query_embedding: Optional precomputed embedding of the query
 
         Returns:
             A formatted string containing relevant excerpts from research reports
@@ -69,25 +72,68 @@ class RAGRetrieval:
                 query_text=query,
                 n_results=n_results,
                 where=where_filter,
+                query_embedding=query_embedding,
+                mmr_lambda=MMR_LAMBDA,
             )
 
             # Format results
-            if not results or not results.get("documents") or not results["documents"][0]:
-                return (
-                    "No relevant information found in the research database. "
-                    "The query may be outside the scope of available reports."
-                )
+            return self._format_or_empty(results)
+
+        except Exception as e:
+            logger.error("❌ RAG Retrieval Error: %s", e)
+            return self._error_message(e)
+
+    async def asearch_investment_research(
+        self,
+        query: str,
+        n_results: int = 5,
+        source_filter: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
+    ) -> str:
+        """
+        Async version of search_investment_research for event-loop callers (e.g. the UI).
+
+        Args:
+            query: The investment research question or topic to search for
+            n_results: Number of relevant document chunks to return (default: 5)
+            source_filter: Optional filter to search only specific sources
+            query_embedding: Optional precomputed embedding of the query
+
+        Returns:
+            Formatted research findings with source citations
+        """
+        try:
+            where_filter = {"source_type": source_filter} if source_filter else None
 
-            formatted_output = self._format_results(results)
-            return formatted_output
+            results = await self.vector_store.aquery(
+                query_text=query,
+                n_results=n_results,
+                where=where_filter,
+                query_embedding=query_embedding,
+                mmr_lambda=MMR_LAMBDA,
+            )
+            return self._format_or_empty(results)
 
         except Exception as e:
-            error_msg = (
-                f"Error searching research database: {str(e)}\n"
-                "Please try rephrasing your question or contact support."
+            logger.error("❌ RAG Retrieval Error: %s", e)
+            return self._error_message(e)
+
+    def _format_or_empty(self, results: Dict[str, Any]) -> str:
+        """Format results, or explain that nothing relevant was found."""
+        if not results or not results.get("documents") or not results["documents"][0]:
+            return (
+                "No relevant information found in the research database. "
+                "The query may be outside the scope of available reports."
             )
-            print(f"❌ RAG Retrieval Error: {e}")
-            return error_msg
+        return self._format_results(results)
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        """Tool output for a failed search (starts with SEARCH_ERROR_PREFIX)."""
+        return (
+            f"{SEARCH_ERROR_PREFIX}: {str(error)}\n"
+            "Please try rephrasing your question or contact support."
+        )
 
     def _format_results(self, results: Dict[str, Any]) -> str:
         """
@@ -103,8 +149,10 @@ class RAGRetrieval:
         metadatas = results["metadatas"][0]
         distances = results["distances"][0]
 
-        formatted_text = "# Research Findings\n\n"
-        formatted_text += "Here are relevant excerpts from investment research reports:\n\n"
+        parts = [
+            "# Research Findings\n\n"
+            "Here are relevant excerpts from investment research reports:\n\n"
+        ]
 
         for i, (doc, metadata, distance) in enumerate(
             zip(documents, metadatas, distances), start=1
@@ -117,22 +165,26 @@ class RAGRetrieval:
             source_display = self._format_source_name(source, source_type)
 
             # Add excerpt with citation
-            formatted_text += f"## Excerpt {i}\n"
-            formatted_text += f"**Source:** {source_display} (Page {page})\n"
-            formatted_text += f"**Relevance Score:** {1 - distance:.2f}\n\n"
-            formatted_text += f"{doc}\n\n"
-            formatted_text += "---\n\n"
+            parts.append(
+                f"## Excerpt {i}\n"
+                f"**Source:** {source_display} (Page {page})\n"
+                f"**Relevance Score:** {1 - distance:.2f}\n\n"
+                f"{doc}\n\n"
+                "---\n\n"
+            )
 
         # Add guidance for citing sources
-        formatted_text += (
+        parts.append(
             "\n**Note:** When answering the user's question, cite specific sources "
             "by referencing the document name and page number from above. "
             "For example: 'According to UBS House View March 2025 (Page 5)...'\n"
         )
 
-        return formatted_text
+        return "".join(parts)
 
-    def _format_source_name(self, source: str, source_type: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _format_source_name(source: str, source_type: str) -> str:
         """
         Convert filename to readable source name.
 
@@ -185,7 +237,11 @@ def create_rag_tool_function(vector_store: Optional[VectorStore] = None):
     """
     rag = RAGRetrieval(vector_store)
 
-    def search_investment_research(query: str, n_results: int = 5) -> str:
+    def search_investment_research(
+        query: str,
+        n_results: int = 5,
+        query_embedding: Optional[List[float]] = None,
+    ) -> str:
         """
         Search UBS House View reports and SEC filings for investment research insights.
 
@@ -201,11 +257,14 @@ def create_rag_tool_function(vector_store: Optional[VectorStore] = None):
         Args:
             query: The investment research question or topic to search for
             n_results: Number of relevant excerpts to return (default: 5)
+            query_embedding: Optional precomputed embedding of the query
 
         Returns:
             Formatted research findings with source citations
         """
-        return rag.search_investment_research(query, n_results)
+        return rag.search_investment_research(
+            query, n_results, query_embedding=query_embedding
+        )
 
     return search_investment_research
 
@@ -0,0 +1,276 @@
+# ABOUTME: Semantic cache for RAG tool calls keyed on normalized query embeddings
+# ABOUTME: Serves near-duplicate research questions without re-searching the vector store
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.tools.rag_retrieval import SEARCH_ERROR_PREFIX
+
+
+class SemanticCache:
+    """
+    Cosine-similarity cache in front of the RAG search tool.
+
+    Query embeddings are L2-normalized and stored int8-quantized (with a per-vector
+    scale) in a fixed-size matrix, so a lookup is a single integer matrix-vector
+    product over a quarter of the float32 memory. Entries are evicted
+    least-recently-used once the cache is full, and expire after ``ttl_seconds``.
+
+    With ``db_path`` set, entries are written through to a SQLite table and
+    reloaded on startup, so a restarted process starts with a warm cache.
+    """
+
+    def __init__(
+        self,
+        tool: Callable[..., str],
+        embed_query: Callable[[str], List[float]],
+        threshold: float = 0.95,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            tool: RAG tool function accepting (query, n_results, query_embedding=...)
+            embed_query: Function returning the embedding for a single query string
+                         (must be the same encoder the vector store uses)
+            threshold: Minimum cosine similarity to serve a cached response
+            max_entries: Maximum number of cached queries
+            ttl_seconds: Time after which a cached response is considered stale
+            db_path: Optional SQLite file to persist entries in
+        """
+        self.tool = tool
+        self.embed_query = embed_query
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None  # (max_entries, dim) int8, allocated lazily
+        self._scales = np.ones(max_entries, dtype=np.float32)
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self._n_results = np.zeros(max_entries, dtype=np.int32)
+        self._created_at = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._queries: List[Optional[Tuple[str, int]]] = [None] * max_entries
+        self._exact: Dict[Tuple[str, int], int] = {}
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._open_db(db_path)
+
+    def __call__(self, query: str, n_results: int = 5) -> str:
+        """
+        Return a cached response for a semantically similar query, or run the tool.
+
+        Args:
+            query: The investment research question or topic to search for
+            n_results: Number of relevant excerpts to return
+
+        Returns:
+            Formatted research findings with source citations
+        """
+        cached = self.peek(query, n_results)
+        if cached is not None:
+            return cached
+
+        try:
+            raw_embedding = self.embed_query(query)
+        except Exception:
+            # Embedding failures should never break the tool path
+            return self.tool(query, n_results)
+
+        embedding = np.asarray(raw_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(embedding))
+        if norm > 0:
+            embedding = embedding / norm
+
+        cached = self._lookup(embedding, n_results)
+        if cached is not None:
+            return cached
+
+        response = self.tool(query, n_results, query_embedding=raw_embedding)
+        if not response.startswith(SEARCH_ERROR_PREFIX):
+            self._insert(query, embedding, n_results, response)
+        return response
+
+    def peek(self, query: str, n_results: int = 5) -> Optional[str]:
+        """
+        Return the cached response for an exact repeat of a query, without embedding it.
+
+        Args:
+            query: The investment research question or topic
+            n_results: Number of relevant excerpts requested
+
+        Returns:
+            Cached response, or None if this exact query is not cached
+        """
+        key = (query.strip().lower(), n_results)
+        with self._lock:
+            slot = self._exact.get(key)
+            if slot is None or not self._valid[slot]:
+                return None
+
+            now = time.time()
+            if now - self._created_at[slot] >= self.ttl_seconds:
+                self._valid[slot] = False
+                del self._exact[key]
+                return None
+
+            self._last_used[slot] = now
+            self.stats["hits"] += 1
+            return self._responses[slot]
+
+    def _lookup(self, embedding: np.ndarray, n_results: int) -> Optional[str]:
+        """Find the most similar live entry for the same n_results."""
+        with self._lock:
+            if self._embeddings is None or not self._valid.any():
+                self.stats["misses"] += 1
+                return None
+
+            if self._embeddings.shape[1] != embedding.shape[0]:
+                # Encoder changed since these entries were stored (e.g. loaded
+                # from disk); they are not comparable, so start over
+                self._embeddings = None
+                self._valid[:] = False
+                self._exact.clear()
+                if self._db is not None:
+                    self._db.execute("DELETE FROM query_cache")
+                    self._db.commit()
+                self.stats["misses"] += 1
+                return None
+
+            now = time.time()
+            self._valid &= (now - self._created_at) < self.ttl_seconds
+
+            query_q, query_scale = _quantize(embedding)
+            dots = np.matmul(self._embeddings, query_q, dtype=np.int32)
+            similarities = dots / (self._scales * query_scale)
+            similarities[~self._valid | (self._n_results != n_results)] = -1.0
+
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.stats["misses"] += 1
+                return None
+
+            self._last_used[best] = now
+            self.stats["hits"] += 1
+            return self._responses[best]
+
+    def _insert(
+        self,
+        query: str,
+        embedding: np.ndarray,
+        n_results: int,
+        response: str,
+        created_at: Optional[float] = None,
+        persist: bool = True,
+    ) -> None:
+        """Store a response, evicting the least-recently-used entry if full."""
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.int8)
+
+            free_slots = np.flatnonzero(~self._valid)
+            if free_slots.size:
+                slot = int(free_slots[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.stats["evictions"] += 1
+
+            stale_key = self._queries[slot]
+            if stale_key is not None and self._exact.get(stale_key) == slot:
+                del self._exact[stale_key]
+
+            now = time.time()
+            created_at = now if created_at is None else created_at
+            self._embeddings[slot], self._scales[slot] = _quantize(embedding)
+            self._valid[slot] = True
+            self._n_results[slot] = n_results
+            self._created_at[slot] = created_at
+            self._last_used[slot] = created_at
+            self._responses[slot] = response
+
+            key = (query.strip().lower(), n_results)
+            self._queries[slot] = key
+            self._exact[key] = slot
+
+            if persist and self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?, ?, ?)",
+                    (key[0], n_results, embedding.astype(np.float32).tobytes(), response, created_at),
+                )
+                self._db.commit()
+
+    def _open_db(self, db_path: str) -> None:
+        """Open the persistence table and load its live entries."""
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_cache (
+                query TEXT NOT NULL,
+                n_results INTEGER NOT NULL,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (query, n_results)
+            )
+            """
+        )
+        cutoff = time.time() - self.ttl_seconds
+        self._db.execute("DELETE FROM query_cache WHERE created_at < ?", (cutoff,))
+        self._db.commit()
+
+        rows = self._db.execute(
+            "SELECT query, n_results, embedding, response, created_at FROM query_cache "
+            "ORDER BY created_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+
+        # Oldest first so the most recent entries end up most recently used
+        for query, n_results, blob, response, created_at in reversed(rows):
+            embedding = np.frombuffer(blob, dtype=np.float32)
+            self._insert(query, embedding, n_results, response, created_at=created_at, persist=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._valid[:] = False
+            self._responses = [None] * self.max_entries
+            self._queries = [None] * self.max_entries
+            self._exact.clear()
+
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_cache")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics."""
+        with self._lock:
+            return {**self.stats, "size": int(self._valid.sum()), "max_entries": self.max_entries}
+
+
+def _quantize(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Symmetric int8 quantization of a vector.
+
+    Args:
+        embedding: float32 vector
+
+    Returns:
+        (int8 vector, scale) such that embedding ~= quantized / scale
+    """
+    peak = float(np.max(np.abs(embedding)))
+    scale = 127.0 / peak if peak > 0 else 1.0
+    return np.round(embedding * scale).astype(np.int8), scale
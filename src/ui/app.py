@@ -1,11 +1,7 @@
 # ABOUTME: Entry point for launching the Gradio web interface
 # ABOUTME: Simple launcher that initializes and runs the chat interface
 
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
 
 from src.ui.chat_interface import create_interface
 
@@ -19,6 +15,8 @@ def main():
     print("Once launched, open the URL shown below in your browser.")
     print("\n" + "=" * 80 + "\n")
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Create and launch interface
     interface = create_interface()
     interface.launch(
@@ -1,160 +1,419 @@
 # ABOUTME: Gradio web interface for the investment research agent
 # ABOUTME: Features chat, source citations, tool call visibility, and conversation management
 
+import asyncio
+import hashlib
 import os
-import sys
-from pathlib import Path
-from typing import List, Tuple, Dict, Any
-import json
-
-# Add src to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, List, Optional, Tuple
 
 import gradio as gr
 from dotenv import load_dotenv
 
-from src.agent.research_agent import ResearchAgent
+from src.agent.research_agent import CHAT_ERROR_PREFIX, ResearchAgent
 
 load_dotenv()
 
+# Source and score lines at the head of each excerpt written by
+# RAGRetrieval._format_results; the groups capture the values without the
+# markers or surrounding spaces, so no per-line stripping is needed
+EXCERPT_CITATION_RE = re.compile(
+    r"^## Excerpt \d+\n"
+    r"\*\*Source:\*\*[ \t]*([^\n]*?)[ \t]*\n"
+    r"(?:\*\*Relevance Score:\*\*[ \t]*([^\n]*?)[ \t]*$)?",
+    re.MULTILINE,
+)
+
+# Canned replies for small talk, answered without calling the agent
+GREETING_REPLY = (
+    "👋 Hello! Ask me about market outlook, asset allocation, sectors, risks "
+    "or Fed policy and I'll answer from the research reports."
+)
+THANKS_REPLY = "You're welcome! Let me know if you have another research question."
+CANNED_REPLIES = {
+    "hi": GREETING_REPLY,
+    "hello": GREETING_REPLY,
+    "hey": GREETING_REPLY,
+    "thanks": THANKS_REPLY,
+    "thank you": THANKS_REPLY,
+    "ok": "👍 Let me know if you have another research question.",
+    "bye": "👋 Goodbye!",
+}
+TRIVIAL_MESSAGE_RE = re.compile(
+    rf"^\s*({'|'.join(CANNED_REPLIES)})[\s!.?]*$", re.IGNORECASE
+)
+
+# Longer messages are truncated before they reach the agent's context
+MAX_MESSAGE_CHARS = 4000
+
+# Recent answers kept for repeated questions (least recently used evicted first)
+RESPONSE_CACHE_SIZE = 128
+
+# Longest streamed tail held back waiting for a Markdown construct to close;
+# beyond it the text is shown as is (e.g. a literal "[" or "*")
+MAX_MARKDOWN_HOLD_CHARS = 120
+
+# Tool calls kept in each session's debug log (oldest dropped first)
+TOOL_LOG_MAXLEN = 200
+
+# Gradio queue settings. Chat events share one lane with a single slot: every
+# session talks to the same agent, and overlapping turns would interleave its
+# message history. Clear, export and log refreshes use the default limit.
+QUEUE_CONCURRENCY_LIMIT = 8
+QUEUE_MAX_SIZE = 64
+CHAT_CONCURRENCY_ID = "chat"
+CHAT_CONCURRENCY_LIMIT = 1
+
+# One research agent per server process, shared by every session
+_agent: Optional[ResearchAgent] = None
+_agent_lock = threading.Lock()
+
+
+def get_agent() -> ResearchAgent:
+    """
+    Get the shared research agent, building it on first use.
+
+    Double-checked under a lock so concurrent first requests build it once.
+
+    Returns:
+        The process-wide ResearchAgent
+    """
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = ResearchAgent()
+    return _agent
+
+
+class MarkdownStreamBuffer:
+    """
+    Holds back streamed text that ends inside an unfinished Markdown construct.
+
+    The chat widget re-renders the partial reply as Markdown on every update,
+    so an opening "**", "`" or "[" shows as a literal character until its
+    closer arrives and then snaps into formatting. Text from the start of
+    such an opener on the current line is kept pending until the construct
+    closes, the line ends, or MAX_MARKDOWN_HOLD_CHARS is exceeded.
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self.pending = ""
+
+    def feed(self, delta: str) -> str:
+        """
+        Add streamed text and return the part that is safe to render.
+
+        Args:
+            delta: Next chunk of the streamed reply
+
+        Returns:
+            Text to append to the rendered reply (may be empty)
+        """
+        self.pending += delta
+        cut = self._hold_start(self.pending)
+        ready, self.pending = self.pending[:cut], self.pending[cut:]
+        return ready
+
+    def flush(self) -> str:
+        """Return whatever is still held back (call when the stream ends)."""
+        ready, self.pending = self.pending, ""
+        return ready
+
+    @staticmethod
+    def _hold_start(text: str) -> int:
+        """Index from which text must be held back (len(text) if none)."""
+        line_start = text.rfind("\n") + 1
+        hold = len(text)
+
+        # A run of marker characters at the very end may be half an opener
+        trailing = len(text)
+        while trailing > line_start and text[trailing - 1] in "*_`~":
+            trailing -= 1
+        hold = min(hold, trailing)
+
+        # An odd number of bold or code markers means one is still open
+        line = text[line_start:]
+        for marker in ("**", "`"):
+            if line.count(marker) % 2:
+                hold = min(hold, line_start + line.rfind(marker))
+
+        # A link whose text or target hasn't closed yet
+        bracket = line.rfind("[")
+        if bracket != -1:
+            close = line.find("]", bracket)
+            if close == -1 or (line.startswith("](", close) and ")" not in line[close:]):
+                hold = min(hold, line_start + bracket)
+
+        return hold if len(text) - hold <= MAX_MARKDOWN_HOLD_CHARS else len(text)
+
 
 class ChatInterface:
     """Gradio chat interface for the investment research agent."""
 
     def __init__(self):
         """Initialize the chat interface."""
-        self.agent = None
-        self.tool_calls_log: List[str] = []
+        # (response, citations) by _response_cache_key, oldest first
+        self._response_cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+
+    @property
+    def agent(self) -> ResearchAgent:
+        """The shared research agent (built on first access)."""
+        return get_agent()
 
     def initialize_agent(self) -> str:
-        """Initialize the research agent and return status message."""
+        """Build the shared research agent at startup and return status message."""
         try:
-            self.agent = ResearchAgent()
+            get_agent()
             return "✅ Agent initialized successfully!"
         except Exception as e:
             return f"❌ Error initializing agent: {str(e)}"
 
-    def chat(
+    async def chat(
         self,
         message: str,
         history: List[List[str]],
-    ) -> Tuple[List[List[str]], str]:
+        tool_log: Deque[str],
+    ) -> AsyncIterator[Tuple[List[List[str]], str]]:
         """
-        Handle chat messages and return updated history and citations.
+        Handle a chat message, streaming the updated history as the answer arrives.
+
+        The agent's reply is streamed token by token, so the answer starts
+        rendering as soon as the model starts writing instead of after the
+        whole response (and any tool calls) completes. Citations appear as
+        soon as the answer resumes after the research tool returns.
 
         Args:
             message: User's message
             history: Chat history as list of [user_msg, agent_msg] pairs
+            tool_log: This session's tool call log, appended to in place
 
-        Returns:
+        Yields:
             Tuple of (updated_history, citations_text)
         """
-        if not self.agent:
-            self.initialize_agent()
+        # Empty messages and small talk never reach the agent
+        if not message.strip():
+            yield history, ""
+            return
 
-        try:
-            # Track tool calls
-            original_messages_count = len(self.agent.messages)
+        trivial = TRIVIAL_MESSAGE_RE.match(message)
+        if trivial:
+            history.append([message, CANNED_REPLIES[trivial.group(1).lower()]])
+            yield history, ""
+            return
 
-            # Get response from agent
-            response = self.agent.chat(message)
+        previous_turn = history[-1] if history else None
+        history.append([message, ""])
+        message = message[:MAX_MESSAGE_CHARS]
 
-            # Extract tool calls from new messages
-            new_messages = self.agent.messages[original_messages_count:]
-            citations = self._extract_citations(new_messages)
+        try:
+            # Normally built by the startup load event; otherwise build it off
+            # the event loop
+            agent = _agent or await asyncio.to_thread(get_agent)
+
+            # A question already answered after the same previous turn is
+            # replayed without the RAG search and model calls
+            cache_key = self._response_cache_key(agent, message, previous_turn)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                response, citations = cached
+                agent.record_exchange(message, response)
+                history[-1][1] = response
+                yield history, citations
+                return
+
+            # Only tool activity the agent adds after these counts is new
+            citations_parts: List[str] = []
+            citations = ""
+            calls_seen = messages_seen = 0
+
+            # Stream response from agent, holding back half-written Markdown
+            response = ""
+            markdown_buffer = MarkdownStreamBuffer()
+            async for delta in agent.chat_stream(message):
+                ready = markdown_buffer.feed(delta)
+                changed = bool(ready)
+                if ready:
+                    response += ready
+                    history[-1][1] = response
+
+                # Citations are re-rendered only when a tool round added some
+                if len(agent.last_tool_messages) > messages_seen:
+                    parts_seen = len(citations_parts)
+                    calls_seen, messages_seen = self._collect_tool_activity(
+                        agent, calls_seen, messages_seen, citations_parts, tool_log
+                    )
+                    if len(citations_parts) > parts_seen:
+                        citations = "\n".join(citations_parts)
+                        changed = True
+
+                if changed:
+                    yield history, citations
+
+            response += markdown_buffer.flush()
+            history[-1][1] = response
+
+            # A tool round that ended the stream (e.g. on an error) comes in here
+            if (
+                len(agent.last_tool_calls) > calls_seen
+                or len(agent.last_tool_messages) > messages_seen
+            ):
+                self._collect_tool_activity(
+                    agent, calls_seen, messages_seen, citations_parts, tool_log
+                )
+                citations = "\n".join(citations_parts)
 
-            # Add to history
-            history.append([message, response])
+            citations = citations or "No sources cited in this response."
+            if response and not response.startswith(CHAT_ERROR_PREFIX):
+                self._response_cache[cache_key] = (response, citations)
+                if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
 
-            return history, citations
+            yield history, citations
 
         except Exception as e:
-            error_msg = f"❌ Error: {str(e)}"
-            history.append([message, error_msg])
-            return history, ""
+            history[-1][1] = f"❌ Error: {str(e)}"
+            yield history, ""
 
-    def _extract_citations(self, messages: List[Dict[str, Any]]) -> str:
+    @staticmethod
+    def _response_cache_key(
+        agent: ResearchAgent, message: str, previous_turn: Optional[List[str]]
+    ) -> str:
         """
-        Extract citations and tool calls from messages.
+        Build the response cache key for a message.
+
+        Covers the model, the message with case and whitespace normalized, and
+        the previous exchange, so follow-ups like "why?" are only reused in the
+        same context.
 
         Args:
-            messages: List of message dictionaries
+            agent: Agent that would answer the message
+            message: User's message
+            previous_turn: Preceding [user_msg, agent_msg] pair, if any
 
         Returns:
-            Formatted citations text
+            BLAKE2b hex digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (agent.model, " ".join(message.lower().split()), *(previous_turn or ())):
+            digest.update(str(part or "").encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _collect_tool_activity(
+        self,
+        agent: ResearchAgent,
+        calls_seen: int,
+        messages_seen: int,
+        citations_parts: List[str],
+        tool_log: Deque[str],
+    ) -> Tuple[int, int]:
         """
-        citations_parts = []
-
-        for msg in messages:
-            # Check for tool responses
-            if msg.get("role") == "tool" and msg.get("name") == "search_investment_research":
-                content = msg.get("content", "")
-
-                # Extract sources from the RAG response
-                if "## Excerpt" in content:
-                    # Parse the excerpts
-                    excerpts = content.split("## Excerpt")[1:]  # Skip header
-                    citations_parts.append("### 📚 Research Sources\n")
-
-                    for excerpt in excerpts:
-                        # Extract source info
-                        if "**Source:**" in excerpt:
-                            lines = excerpt.split("\n")
-                            for line in lines:
-                                if "**Source:**" in line:
-                                    source = line.replace("**Source:**", "").strip()
-                                    citations_parts.append(f"- {source}")
-                                elif "**Relevance Score:**" in line:
-                                    score = line.replace("**Relevance Score:**", "").strip()
-                                    citations_parts.append(f"  Relevance: {score}")
-                                    break
+        Record the tool calls and citations the agent produced since the last check.
 
+        Args:
+            agent: Agent whose current turn is being streamed
+            calls_seen: Entries of agent.last_tool_calls already recorded
+            messages_seen: Entries of agent.last_tool_messages already recorded
+            citations_parts: Citation lines of this turn, appended to in place
+            tool_log: Session tool call log, appended to in place
+
+        Returns:
+            Updated (calls_seen, messages_seen)
+        """
+        # Walk only the new entries by index rather than copying slices
+        tool_calls = agent.last_tool_calls
+        for i in range(calls_seen, len(tool_calls)):
             # Track tool calls for debugging
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tool_call in msg.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = tool_call.function.arguments
-                    self.tool_calls_log.append(f"🔧 {tool_name}({tool_args})")
-
-        if citations_parts:
-            return "\n".join(citations_parts)
-        else:
-            return "No sources cited in this response."
-
-    def clear_conversation(self) -> Tuple[List, str, str]:
+            tool_name, tool_args = tool_calls[i]
+            tool_log.append(f"🔧 {tool_name}({tool_args})")
+
+        tool_messages = agent.last_tool_messages
+        for i in range(messages_seen, len(tool_messages)):
+            msg = tool_messages[i]
+            if msg.get("name") == "search_investment_research":
+                self._extract_citations(msg.get("content", ""), citations_parts)
+
+        return len(tool_calls), len(tool_messages)
+
+    @staticmethod
+    def _extract_citations(content: str, citations_parts: List[str]):
+        """
+        Extract citations from one research tool response.
+
+        Args:
+            content: Tool response text from RAGRetrieval
+            citations_parts: Citation lines to append to
+        """
+        # Extract sources from the RAG response in one pass over it (the
+        # heading is added with the first excerpt, no separate marker scan)
+        heading = "### 📚 Research Sources\n"
+        for match in EXCERPT_CITATION_RE.finditer(content):
+            if heading:
+                citations_parts.append(heading)
+                heading = ""
+
+            source, score = match.groups()
+            citations_parts.append(f"- {source}")
+            if score is not None:
+                citations_parts.append(f"  Relevance: {score}")
+
+    def clear_conversation(self, tool_log: Deque[str]) -> Tuple[List, str, str, Deque[str]]:
         """
         Clear the conversation history.
 
+        Args:
+            tool_log: This session's tool call log
+
         Returns:
-            Tuple of (empty_history, empty_citations, status_message)
+            Tuple of (empty_history, empty_citations, status_message, emptied_tool_log)
         """
-        if self.agent:
-            self.agent.clear_history()
-        self.tool_calls_log = []
-        return [], "", "🗑️ Conversation cleared"
+        if _agent is not None:
+            _agent.clear_history()
+        tool_log.clear()
+        self._response_cache.clear()
+        return [], "", "🗑️ Conversation cleared", tool_log
 
-    def export_conversation(self) -> str:
+    async def export_conversation(self) -> str:
         """
         Export conversation to JSON file.
 
+        The file is written on a worker thread, so a long conversation doesn't
+        hold up the event loop; the status is returned once the write finishes
+        so failures are still reported.
+
         Returns:
             Status message with filepath
         """
-        if not self.agent:
+        if _agent is None:
             return "❌ No conversation to export"
 
         try:
-            filepath = f"conversation_export_{len(self.agent.messages)}.json"
-            self.agent.export_conversation(filepath)
+            # Unique per export, even for two exports at the same message count
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            filepath = f"conversation_export_{stamp}_{uuid.uuid4().hex[:6]}.json"
+            await asyncio.to_thread(_agent.export_conversation, filepath)
             return f"💾 Conversation exported to: {filepath}"
         except Exception as e:
             return f"❌ Export failed: {str(e)}"
 
-    def get_tool_calls_log(self) -> str:
-        """Get the tool calls log for debugging."""
-        if not self.tool_calls_log:
+    @staticmethod
+    def new_tool_log() -> Deque[str]:
+        """Create an empty tool call log for a new session."""
+        return deque(maxlen=TOOL_LOG_MAXLEN)
+
+    @staticmethod
+    def get_tool_calls_log(tool_log: Deque[str]) -> str:
+        """Get a session's tool calls log for debugging."""
+        if not tool_log:
             return "No tool calls yet."
-        return "\n".join(self.tool_calls_log)
+        return "\n".join(tool_log)
 
 
 def create_interface() -> gr.Blocks:
@@ -229,6 +488,9 @@ def create_interface() -> gr.Blocks:
                 # Status messages
                 status_output = gr.Textbox(label="Status", interactive=False, visible=False)
 
+                # Per-session tool call log (a fresh bounded deque for each visitor)
+                tool_log_state = gr.State(chat_interface.new_tool_log)
+
             with gr.Column(scale=1):
                 # Citations panel
                 gr.Markdown("### 📚 Sources & Citations")
@@ -257,29 +519,34 @@ def create_interface() -> gr.Blocks:
         )
 
         # Wire up chat functionality
-        def submit_message(message, history):
-            """Submit message and update both chat and citations."""
-            new_history, citations = chat_interface.chat(message, history)
-            return new_history, citations, ""
+        async def submit_message(message, history, tool_log):
+            """Submit message and stream updates to both chat and citations."""
+            async for new_history, citations in chat_interface.chat(message, history, tool_log):
+                yield new_history, citations, "", tool_log
 
         # Submit on button click
         submit_btn.click(
             submit_message,
-            inputs=[msg_input, chatbot],
-            outputs=[chatbot, citations_output, msg_input],
+            inputs=[msg_input, chatbot, tool_log_state],
+            outputs=[chatbot, citations_output, msg_input, tool_log_state],
+            concurrency_limit=CHAT_CONCURRENCY_LIMIT,
+            concurrency_id=CHAT_CONCURRENCY_ID,
         )
 
         # Submit on Enter key
         msg_input.submit(
             submit_message,
-            inputs=[msg_input, chatbot],
-            outputs=[chatbot, citations_output, msg_input],
+            inputs=[msg_input, chatbot, tool_log_state],
+            outputs=[chatbot, citations_output, msg_input, tool_log_state],
+            concurrency_limit=CHAT_CONCURRENCY_LIMIT,
+            concurrency_id=CHAT_CONCURRENCY_ID,
         )
 
         # Clear conversation
         clear_btn.click(
             chat_interface.clear_conversation,
-            outputs=[chatbot, citations_output, status_output],
+            inputs=[tool_log_state],
+            outputs=[chatbot, citations_output, status_output, tool_log_state],
         )
 
         # Export conversation
@@ -294,6 +561,7 @@ def create_interface() -> gr.Blocks:
         # Refresh tool calls log
         refresh_tools_btn.click(
             chat_interface.get_tool_calls_log,
+            inputs=[tool_log_state],
             outputs=[tool_calls_output],
         )
 
@@ -308,6 +576,14 @@ def create_interface() -> gr.Blocks:
             """
         )
 
+    # Streamed replies reach the browser as server-sent events; a reverse proxy
+    # in front of the app must not buffer them (e.g. nginx "proxy_buffering off")
+    interface.queue(
+        default_concurrency_limit=QUEUE_CONCURRENCY_LIMIT,
+        max_size=QUEUE_MAX_SIZE,
+        api_open=False,
+    )
+
     return interface
 
 
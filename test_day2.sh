@@ -106,7 +106,7 @@ agent = ResearchAgent()
 # Test single query
 query = "What are the key risks to the market according to UBS?"
 print(f"\nQuery: {query}")
-response = agent.chat(query)
+response = agent.chat_sync(query)
 
 if response and len(response) > 100:
     print("✅ Agent response generated")
@@ -151,19 +151,19 @@ agent = ResearchAgent()
 # Turn 1
 query1 = "What is UBS's view on US equities?"
 print(f"\n📝 Turn 1: {query1}")
-response1 = agent.chat(query1)
+response1 = agent.chat_sync(query1)
 print(f"✅ Response 1: {len(response1)} characters")
 
 # Turn 2 - follow-up question
 query2 = "What are the risks to that view?"
 print(f"\n📝 Turn 2 (follow-up): {query2}")
-response2 = agent.chat(query2)
+response2 = agent.chat_sync(query2)
 print(f"✅ Response 2: {len(response2)} characters")
 
 # Turn 3 - another follow-up
 query3 = "Which sectors do they recommend?"
 print(f"\n📝 Turn 3 (follow-up): {query3}")
-response3 = agent.chat(query3)
+response3 = agent.chat_sync(query3)
 print(f"✅ Response 3: {len(response3)} characters")
 
 # Check conversation history
@@ -200,7 +200,7 @@ try:
     print("✅ CLI agent can be initialized")
 
     # Test one query
-    response = agent.chat("What is UBS's outlook for 2025?")
+    response = agent.chat_sync("What is UBS's outlook for 2025?")
     if response:
         print("✅ CLI agent can process queries")
     else:
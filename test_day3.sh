@@ -301,7 +301,7 @@ overall = comparison.compare_overall_scores()
 print(f"✅ Overall comparison: {overall['winner']}")
 
 recommendations = comparison.generate_recommendations()
-print(f"✅ Generated {len(recommendations)//2} recommendations")
+print(f"✅ Generated {len(recommendations)} recommendations")
 
 report = comparison.generate_report(output_format="markdown")
 print(f"✅ Report generated: {len(report)} characters")